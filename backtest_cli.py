@@ -0,0 +1,159 @@
+import argparse
+import sys
+import os
+
+# Add the project root to sys.path for direct script execution
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
+from simulation.cache import DEFAULT_CACHE_SIZE
+from simulation.runner import BEAM_OUTPUT, Manifest, job_grid, parse_values, run_backtest
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run a grid of beam search backtests (years x start weeks x "
+        "beam widths x models) on a process pool, skipping finished jobs."
+    )
+    parser.add_argument(
+        "--years", type=str, required=True, help="Years, e.g. 2013-2024 or 2022,2024"
+    )
+    parser.add_argument(
+        "--weeks", type=str, default="1", help="Start weeks, e.g. 1-18 (default: 1)"
+    )
+    parser.add_argument(
+        "--k", type=str, default="10000", help="Beam widths, e.g. 1000,10000 (default: 10000)"
+    )
+    parser.add_argument(
+        "--models",
+        type=str,
+        default="lr",
+        help="Comma-separated model names; NAME loads NAME_full.pkl and "
+        "NAME_no_spread.pkl from --model_dir (default: lr)",
+    )
+    parser.add_argument(
+        "--model_dir", type=str, default="./models", help="Directory of model pickles"
+    )
+    parser.add_argument(
+        "--db", type=str, default="./data/data.db", help="Path to DuckDB database"
+    )
+    parser.add_argument(
+        "--kind",
+        type=str,
+        default="beam",
+        choices=["beam", "greedy"],
+        help="Beam paths from every start week, or the greedy week-by-week "
+        "path of every season (default: beam)",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Output file pattern over {year}, {week}, {k} and {model} "
+        "(default: ./results/beam_{year}_wk-{week}_k{k}.csv, or "
+        "./results/greedy_path_{year}_k{k}.json for greedy jobs)",
+    )
+    parser.add_argument(
+        "--format",
+        type=str,
+        default="csv",
+        choices=["csv", "parquet", "arrow"],
+        help="Format of beam path outputs when --output is not given; parquet "
+        "and arrow need pyarrow (default: csv)",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        default="./results/manifest.json",
+        help="Job manifest with status and timings (default: ./results/manifest.json)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes, one job each at a time (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Re-run jobs whose output exists"
+    )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        default="table",
+        choices=["simulate", "table", "vectorized"],
+        help="Beam engine (default: table)",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="Merge future-equivalent paths (vectorized engine only)",
+    )
+    parser.add_argument(
+        "--prune",
+        type=str,
+        default=None,
+        choices=["exact"],
+        help="Branch-and-bound pruning of the beam",
+    )
+    parser.add_argument(
+        "--warm_start",
+        action="store_true",
+        help="Warm-start the greedy weeks, an approximation that may pick "
+        "differently than a full search (vectorized engine only)",
+    )
+    parser.add_argument(
+        "--end_week",
+        type=int,
+        default=None,
+        help="Last week to simulate (default: max week in schedule)",
+    )
+    parser.add_argument(
+        "--cache_size",
+        type=int,
+        default=DEFAULT_CACHE_SIZE,
+        help=f"Maximum number of cached game results per worker (default: "
+        f"{DEFAULT_CACHE_SIZE}; 0 means unbounded)",
+    )
+    parser.add_argument(
+        "--no_compile",
+        action="store_true",
+        help="Score games with the sklearn pipelines instead of compiled NumPy kernels",
+    )
+    args = parser.parse_args()
+    if args.warm_start and args.engine != "vectorized":
+        parser.error("--warm_start requires --engine vectorized")
+
+    output = args.output
+    if output is None and args.kind == "beam":
+        output = os.path.splitext(BEAM_OUTPUT)[0] + f".{args.format}"
+    try:
+        jobs = job_grid(
+            parse_values(args.years),
+            weeks=parse_values(args.weeks),
+            ks=parse_values(args.k),
+            models=args.models.split(","),
+            kind=args.kind,
+            output=output,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    options = {
+        "db": args.db,
+        "model_dir": args.model_dir,
+        "engine": args.engine,
+        "merge": args.merge,
+        "prune": args.prune,
+        "warm_start": args.warm_start,
+        "end_week": args.end_week,
+        "cache_size": args.cache_size,
+        "no_compile": args.no_compile,
+    }
+    counts = run_backtest(
+        jobs, Manifest(args.manifest), workers=args.workers, options=options, force=args.force
+    )
+    print(f"Backtest finished: {counts}")
+    if counts.get("failed"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
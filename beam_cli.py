@@ -1,88 +1,17 @@
 import argparse
-import duckdb
+import itertools
 import cloudpickle as pickle
-import pandas as pd
 import numpy as np
 import sys
 import os
 
 # Add the project root to sys.path for direct script execution
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
-from simulation.season import BeamExploreSeason
-
-
-def get_season_schedule(year, db):
-    return db.sql(
-        f"""
-        SELECT
-            Year, Week, Home_Team, Away_Team,
-            Is_Neutral, Home_days_Since_Last_Game, Away_days_Since_Last_Game
-        FROM game_features
-        WHERE Year = {year}
-        ORDER BY Week, Home_Team, Away_Team
-        """
-    ).df()
-
-
-def get_season_week_spreads(year, week, db):
-    return db.sql(
-        f"""
-        SELECT
-            Home_Team, Away_Team, Spread
-        FROM game_features
-        WHERE Year = {year} AND Week = {week}
-        ORDER BY Home_Team, Away_Team
-        """
-    ).df()
-
-
-def get_season_week_rankings(year, week, db):
-    return db.sql(
-        f"""
-        SELECT
-            Team,
-            ROW_NUMBER() OVER (PARTITION BY Year, Week ORDER BY Rating DESC) AS Rank
-        FROM nfl_rankings
-        WHERE Year = {year} AND Week = {week}
-        ORDER BY Team
-        """
-    ).df()
-
-
-def get_team_records_from_db(year, week, db):
-    """
-    Generate team_records dict for all teams up to (but not including) the given week.
-    """
-    query = f"""
-        SELECT Home_Team, Away_Team, Home_Won
-        FROM game_features
-        WHERE Year = {year} AND Week < {week}
-    """
-    df = db.sql(query).df()
-    team_records = {}
-
-    for _, row in df.iterrows():
-        home = row["Home_Team"]
-        away = row["Away_Team"]
-        home_won = row["Home_Won"]
-
-        for team in [home, away]:
-            if team not in team_records:
-                team_records[team] = {"wins": 0, "losses": 0, "games_played": 0}
-
-        # Update games played
-        team_records[home]["games_played"] += 1
-        team_records[away]["games_played"] += 1
-
-        # Update wins/losses
-        if home_won:
-            team_records[home]["wins"] += 1
-            team_records[away]["losses"] += 1
-        else:
-            team_records[away]["wins"] += 1
-            team_records[home]["losses"] += 1
-
-    return team_records
+from simulation.season import AssignmentSeason, BeamExploreSeason
+from simulation.compiled import compile_models
+from simulation.cache import DEFAULT_CACHE_SIZE, GameCache, PersistentGameCache
+from simulation.data import SeasonData
+from simulation.output import FORMATS, PathWriter, paths_frame
 
 
 def main():
@@ -141,32 +70,133 @@ def main():
         default=42,
         help="Random seed for reproducibility (default: 42)",
     )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        default="table",
+        choices=["simulate", "table", "vectorized", "assignment"],
+        help="Beam engine: per-step simulation, precomputed probability table, "
+        "the array-based engine over the table, or the exact k best paths with "
+        "records frozen at the start week (default: table)",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="Merge future-equivalent paths (vectorized engine only)",
+    )
+    parser.add_argument(
+        "--prune",
+        type=str,
+        default=None,
+        choices=["exact"],
+        help="Branch-and-bound pruning: 'exact' skips expansions that cannot "
+        "reach the top k (same paths, fewer candidates scored)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes expanding shards of the beam each week (not with "
+        "--merge; default: 1)",
+    )
+    parser.add_argument(
+        "--cache_size",
+        type=int,
+        default=DEFAULT_CACHE_SIZE,
+        help=f"Maximum number of cached game results (default: "
+        f"{DEFAULT_CACHE_SIZE}; 0 means unbounded)",
+    )
+    parser.add_argument(
+        "--cache_path",
+        "--cache-path",
+        type=str,
+        default=None,
+        help="SQLite file for a persistent game-probability cache (default: in-memory)",
+    )
+    parser.add_argument(
+        "--no_compile",
+        action="store_true",
+        help="Score games with the sklearn pipelines instead of compiled NumPy kernels",
+    )
+    parser.add_argument(
+        "--format",
+        type=str,
+        default=None,
+        choices=FORMATS,
+        help="Output format; parquet and arrow store teams dictionary-encoded "
+        "and the run metadata, and need pyarrow (default: from the --output "
+        "extension, else csv)",
+    )
+    parser.add_argument(
+        "--batch_size",
+        type=int,
+        default=10000,
+        help="Paths converted and written per batch (default: 10000)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default=None,
+        help="File the beam is saved to after every week (default: OUTPUT.ckpt; "
+        "removed once the output is written)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from the last week in its checkpoint",
+    )
     args = parser.parse_args()
+    if args.engine == "assignment":
+        # The assignment engine solves the frozen-record problem in one go:
+        # there is no beam to merge, prune, shard or checkpoint
+        unsupported = [
+            flag
+            for flag, used in [
+                ("--merge", args.merge),
+                ("--prune", args.prune),
+                ("--workers", args.workers != 1),
+                ("--checkpoint", args.checkpoint),
+                ("--resume", args.resume),
+            ]
+            if used
+        ]
+        if unsupported:
+            parser.error(
+                f"{', '.join(unsupported)} not supported with --engine assignment"
+            )
+    checkpoint = args.checkpoint or f"{args.output}.ckpt"
 
     np.random.seed(args.seed)
 
-    db = duckdb.connect(args.db)
-    schedule_df = get_season_schedule(args.year, db)
+    data = SeasonData(args.year, args.db)
+    schedule_df = data.schedule()
     feature_df = schedule_df.copy()
-    spread_df = get_season_week_spreads(args.year, args.week, db)
-    rank_df = get_season_week_rankings(args.year, args.week, db)
-    prior_weeks = get_team_records_from_db(args.year, args.week, db)
-    end_week = args.end_week if args.end_week is not None else schedule_df["Week"].max()
-    db.close()
+    spread_df, rank_df, prior_weeks = data.week(args.week)
+    end_week = args.end_week if args.end_week is not None else data.max_week
 
     with open(args.model_full, "rb") as f:
         full_model = pickle.load(f)
     with open(args.model_ns, "rb") as f:
         no_spread_model = pickle.load(f)
     models = {"full": full_model, "no_spread": no_spread_model}
+    if not args.no_compile:
+        models = compile_models(models)
+
+    if args.cache_path:
+        game_cache = PersistentGameCache(args.cache_path, models, maxsize=args.cache_size)
+    else:
+        game_cache = GameCache(maxsize=args.cache_size)
 
-    season = BeamExploreSeason(
+    season_cls = AssignmentSeason if args.engine == "assignment" else BeamExploreSeason
+    season = season_cls(
         args.year,
         models,
         schedule_df[["Year", "Week", "Home_Team", "Away_Team"]],
         feature_df,
+        game_cache=game_cache,
     )
-    best_paths = season.resolve(
+    # Paths are streamed to the output in batches, without their records
+    batches = season.resolve(
         week=args.week,
         spread=spread_df,
         rank=rank_df,
@@ -174,25 +204,45 @@ def main():
         end_week=end_week,
         k=args.k,
         n=args.n,
+        engine=args.engine,
+        merge=args.merge,
+        prune=args.prune,
+        workers=args.workers,
         survivor_picks=args.picks.split(",") if args.picks else None,
+        checkpoint=checkpoint,
+        resume=args.resume,
+        batch_size=args.batch_size,
     )
-
-    # Save all paths to CSV (one row per path, columns: week_1, week_2, ..., log_prob)
-    out_data = []
-    max_len = (end_week - args.week) + 1
-    for path in best_paths:
-        row = {f"week_{i+1}": t for i, t in enumerate(path["picks"])}
-        # Fill missing weeks with None to preserve order
-        for i in range(len(path["picks"]), max_len):
-            row[f"week_{i+1}"] = None
-        row["log_prob"] = path["p"]
-        out_data.append(row)
-    df = pd.DataFrame(out_data)
-    # Ensure columns are ordered: week_1, week_2, ..., log_prob
-    week_cols = [f"week_{args.week + i}" for i in range(max_len)]
-    df = df[week_cols + ["log_prob"]]
-    df.to_csv(args.output, index=False)
+    # The search is done once the first batch is out, search_stats included
+    first = next(batches, [])
+    metadata = {
+        "year": args.year,
+        "week": args.week,
+        "end_week": end_week,
+        "picks": args.picks,
+        "k": args.k,
+        "n": args.n,
+        "engine": args.engine,
+        "merge": args.merge,
+        "prune": args.prune,
+        "model_full": args.model_full,
+        "model_ns": args.model_ns,
+        "seed": args.seed,
+        "search_stats": getattr(season, "search_stats", None),
+    }
+    with PathWriter(
+        args.output, args.format, metadata, teams=season.registry.names
+    ) as writer:
+        for batch in itertools.chain([first], batches):
+            writer.write(paths_frame(batch, args.week, end_week, merge=args.merge))
     print(f"Beam search paths written to {args.output}")
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    print(f"Game cache: {game_cache.summary()}")
+    if args.prune:
+        print(f"Search: {season.search_stats}")
+    if args.cache_path:
+        game_cache.close()
 
 
 if __name__ == "__main__":
@@ -2,137 +2,17 @@
 # coding: utf-8
 
 import argparse
-import duckdb
 import cloudpickle as pickle
-import pandas as pd
-import numpy as np
 import sys
 import os
 import json
 
 # Add the project root to sys.path for direct script execution
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
-from simulation.season import BeamExploreSeason
-
-
-def get_season_schedule(db, year):
-    """
-    Fetch the season schedule for a given year from the database.
-    """
-    schedule_df = db.sql(
-        f"""
-        SELECT
-            Year, Week, Home_Team, Away_Team,
-            Is_Neutral, Home_days_Since_Last_Game, Away_days_Since_Last_Game
-        FROM game_features
-        WHERE Year = {year}
-        ORDER BY Week, Home_Team, Away_Team
-        """
-    ).df()
-    return schedule_df
-
-
-def get_season_week_speads(db, year, week):
-    """
-    Fetch the season spreads for a given year and week from the database.
-    """
-    spread_df = db.sql(
-        f"""
-        SELECT
-            Home_Team, Away_Team, Spread
-        FROM game_features
-        WHERE Year = {year} AND Week = {week}
-        ORDER BY Home_Team, Away_Team
-        """
-    ).df()
-    return spread_df
-
-
-def get_season_week_rankings(db, year, week):
-    """
-    Fetch the season rankings for a given year and week from the database.
-    """
-    rank_df = db.sql(
-        f"""
-        SELECT
-            Team,
-            ROW_NUMBER() OVER (PARTITION BY Year, Week ORDER BY Rating DESC) AS Rank
-        FROM nfl_rankings
-        WHERE Year = {year} AND Week = {week}
-        ORDER BY Team
-        """
-    ).df()
-    return rank_df
-
-
-def get_team_records_from_db(db, year, week):
-    """
-    Generate team_records dict for all teams up to (but not including) the given week.
-    """
-    query = f"""
-        SELECT Home_Team, Away_Team, Home_Won
-        FROM game_features
-        WHERE Year = {year} AND Week < {week}
-    """
-    df = db.sql(query).df()
-    team_records = {}
-
-    for _, row in df.iterrows():
-        home = row["Home_Team"]
-        away = row["Away_Team"]
-        home_won = row["Home_Won"]
-
-        for team in [home, away]:
-            if team not in team_records:
-                team_records[team] = {"wins": 0, "losses": 0, "games_played": 0}
-
-        # Update games played
-        team_records[home]["games_played"] += 1
-        team_records[away]["games_played"] += 1
-
-        # Update wins/losses
-        if home_won:
-            team_records[home]["wins"] += 1
-            team_records[away]["losses"] += 1
-        else:
-            team_records[away]["wins"] += 1
-            team_records[home]["losses"] += 1
-
-    return team_records
-
-
-def run_greedy_beam_path(year, models, schedule_df, k=10000):
-    survivor_picks = []
-    prior_weeks = {}
-    path = []
-    max_week = schedule_df["Week"].max()
-    for wk in range(1, max_week + 1):
-        with duckdb.connect("./data/data.db") as db:
-            spread_df = get_season_week_speads(db, year, wk)
-            rank_df = get_season_week_rankings(db, year, wk)
-            prior_weeks = get_team_records_from_db(db, year, wk)
-
-        beams = BeamExploreSeason(year, models, schedule_df, schedule_df.copy())
-        bp = beams.resolve(
-            week=wk,
-            end_week=max_week,
-            spread=spread_df,
-            rank=rank_df,
-            k=k,
-            n=1,
-            survivor_picks=survivor_picks,
-            prior_weeks=prior_weeks,
-        )
-
-        pick_scores = {}
-        for path_obj in bp:
-            pick = path_obj["picks"][wk - 1]
-            pick_scores.setdefault(pick, 0)
-            pick_scores[pick] += np.exp(path_obj["p"])
-        best_pick = max(pick_scores, key=pick_scores.get)
-        path.append(best_pick)
-        survivor_picks = path.copy()
-    return path
+from simulation.greedy import run_greedy_beam_path
+from simulation.compiled import compile_models
+from simulation.cache import DEFAULT_CACHE_SIZE, GameCache, PersistentGameCache
+from simulation.data import SeasonData
 
 
 def main():
@@ -177,28 +57,128 @@ def main():
         default="./models/lr_no_spread.pkl",
         help="Path to no-spread model pickle",
     )
+    parser.add_argument(
+        "--db", type=str, default="./data/data.db", help="Path to DuckDB database"
+    )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        default="table",
+        choices=["simulate", "table", "vectorized"],
+        help="Beam engine: per-step simulation, precomputed probability table, "
+        "or the array-based engine over the table (default: table)",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="Merge future-equivalent paths (vectorized engine only)",
+    )
+    parser.add_argument(
+        "--prune",
+        type=str,
+        default=None,
+        choices=["exact"],
+        help="Branch-and-bound pruning: 'exact' skips expansions that cannot "
+        "reach the top k (same paths, fewer candidates scored)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes expanding shards of the beam each week (not with "
+        "--merge; default: 1)",
+    )
+    parser.add_argument(
+        "--warm_start",
+        action="store_true",
+        help="Carry the beam forward between weeks and only top it up with a "
+        "narrower search: faster, but an approximation that may pick "
+        "differently than a full search (vectorized engine only)",
+    )
+    parser.add_argument(
+        "--warm_k",
+        type=int,
+        default=None,
+        help="Search width of the warm-started weeks (default: k // 10)",
+    )
+    parser.add_argument(
+        "--cache_size",
+        type=int,
+        default=DEFAULT_CACHE_SIZE,
+        help=f"Maximum number of cached game results (default: "
+        f"{DEFAULT_CACHE_SIZE}; 0 means unbounded)",
+    )
+    parser.add_argument(
+        "--cache_path",
+        "--cache-path",
+        type=str,
+        default=None,
+        help="SQLite file for a persistent game-probability cache (default: in-memory)",
+    )
+    parser.add_argument(
+        "--no_compile",
+        action="store_true",
+        help="Score games with the sklearn pipelines instead of compiled NumPy kernels",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip years whose output exists and continue an interrupted year "
+        "from the last week in its checkpoint (OUTPUT.ckpt)",
+    )
     args = parser.parse_args()
+    if args.warm_start and args.engine != "vectorized":
+        parser.error("--warm_start requires --engine vectorized")
 
     with open(args.model_full, "rb") as f:
         full_model = pickle.load(f)
     with open(args.model_ns, "rb") as f:
         no_spread_model = pickle.load(f)
     models = {"full": full_model, "no_spread": no_spread_model}
+    if not args.no_compile:
+        models = compile_models(models)
+
+    # One cache for every week of every year: game probabilities only depend on
+    # the model inputs, which are part of the cache key
+    if args.cache_path:
+        game_cache = PersistentGameCache(args.cache_path, models, maxsize=args.cache_size)
+    else:
+        game_cache = GameCache(maxsize=args.cache_size)
 
     for year in range(args.year_start, args.year_end + 1):
+        output_file = args.output.format(year=year, k=args.k)
+        if args.resume and os.path.exists(output_file):
+            print(f"Skipping {year}: {output_file} exists")
+            continue
         print(f"Running greedy path for year: {year}")
-        with duckdb.connect("./data/data.db") as db:
-            schedule_df = get_season_schedule(db, year)
-
-        greedy_path = run_greedy_beam_path(year, models, schedule_df, k=args.k)
+        greedy_path = run_greedy_beam_path(
+            year,
+            models,
+            SeasonData(year, args.db),
+            k=args.k,
+            game_cache=game_cache,
+            engine=args.engine,
+            merge=args.merge,
+            prune=args.prune,
+            workers=args.workers,
+            warm_start=args.warm_start,
+            warm_k=args.warm_k,
+            checkpoint=f"{output_file}.ckpt",
+            resume=args.resume,
+        )
         print("Best greedy path:", greedy_path)
+        print(f"Game cache: {game_cache.summary()}")
 
-        output_file = args.output.format(year=year, k=args.k)
         with open(output_file, "wb") as f:
             f.write(json.dumps(greedy_path).encode("utf-8"))
+        if os.path.exists(f"{output_file}.ckpt"):
+            os.remove(f"{output_file}.ckpt")
 
         print(f"Saved greedy path for {year} to {output_file}")
 
+    if args.cache_path:
+        game_cache.close()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,50 @@
+import argparse
+import tracemalloc
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
+from simulation.records import RecordState, TeamRegistry
+
+
+def make_dict_records(teams, week):
+    return {
+        team: {"wins": week // 2, "losses": week - week // 2, "games_played": week}
+        for team in teams
+    }
+
+
+def measure(build, n_paths):
+    """Average traced bytes per path for n_paths built with build()."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    paths = [build() for _ in range(n_paths)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del paths
+    return (after - before) / n_paths
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare per-path memory of dict team records vs RecordState."
+    )
+    parser.add_argument("--paths", type=int, default=10000, help="Paths to allocate")
+    parser.add_argument("--teams", type=int, default=32, help="Teams per season")
+    args = parser.parse_args()
+
+    teams = [f"Team {i:02d}" for i in range(args.teams)]
+    registry = TeamRegistry(teams)
+    template = RecordState.from_records(registry, make_dict_records(teams, 5))
+
+    dict_bytes = measure(lambda: make_dict_records(teams, 5), args.paths)
+    state_bytes = measure(template.copy, args.paths)
+
+    print(f"Per-path team records ({args.teams} teams, {args.paths} paths):")
+    print(f"  dict of dicts: {dict_bytes:,.0f} bytes")
+    print(f"  RecordState:   {state_bytes:,.0f} bytes")
+    print(f"  reduction:     {dict_bytes / state_bytes:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import argparse
+import sys
+import os
+
+import pandas as pd
+
+# Add the project root to sys.path for direct script execution
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
+from simulation.evaluate import evaluate
+from simulation.runner import BEAM_OUTPUT, GREEDY_OUTPUT, parse_values
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Evaluate beam and greedy backtest results against the "
+        "actual game winners of every season."
+    )
+    parser.add_argument(
+        "--years", type=str, default="2013-2024", help="Years, e.g. 2013-2024 (default)"
+    )
+    parser.add_argument("--week", type=int, default=1, help="Start week of the runs (default: 1)")
+    parser.add_argument("--k", type=int, default=10000, help="Beam width of the runs (default: 10000)")
+    parser.add_argument(
+        "--paths",
+        type=str,
+        default=BEAM_OUTPUT,
+        help=f"Beam paths file pattern over {{year}}, {{week}} and {{k}} (default: {BEAM_OUTPUT})",
+    )
+    parser.add_argument(
+        "--greedy",
+        type=str,
+        default=GREEDY_OUTPUT,
+        help=f"Greedy path file pattern over {{year}} and {{k}} (default: {GREEDY_OUTPUT})",
+    )
+    parser.add_argument(
+        "--cutoffs",
+        type=str,
+        default="1,3,10,50,100",
+        help="Top-n path cutoffs (default: 1,3,10,50,100)",
+    )
+    parser.add_argument(
+        "--db", type=str, default="./data/data.db", help="Path to DuckDB database"
+    )
+    parser.add_argument(
+        "--output", type=str, default=None, help="CSV file for the evaluation table"
+    )
+    args = parser.parse_args()
+
+    df = evaluate(
+        parse_values(args.years),
+        args.paths,
+        args.greedy,
+        cutoffs=parse_values(args.cutoffs),
+        db_path=args.db,
+        week=args.week,
+        k=args.k,
+    )
+    if df.empty:
+        print("No result files found")
+        return
+
+    errors = [c for c in df.columns if c != "year" and not c.endswith("_first_loss")]
+    first_loss = [c for c in df.columns if c.endswith("_first_loss")]
+    with pd.option_context("display.max_columns", None, "display.width", 200):
+        print("Errors (weeks whose pick lost; fewest among the paths):")
+        print(df[["year"] + errors].to_string(index=False))
+        print(f"Average: {df[errors].mean().round(2).to_dict()}\n")
+        print("First loss (week of the first losing pick, 0 = never; latest among the paths):")
+        print(df[["year"] + first_loss].to_string(index=False))
+    if args.output:
+        df.to_csv(args.output, index=False)
+        print(f"Evaluation written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,82 @@
-import pandas as pd
+import argparse
+
 import numpy as np
 
+from simulation.output import week_columns
+from simulation.report import load_paths, most_probable_paths, pick_shares
+
+
+def report_card(*paths, output=None):
+    """
+    Print the report of one or more paths files (CSV, Parquet or Arrow) and
+    return the per-source, per-week, per-team probability shares behind it
+    (also written to output as CSV if given).
+    """
+    df = load_paths(paths)
+    shares = pick_shares(df)
+    best = most_probable_paths(df)
 
-def report_card(csv_path):
-    df = pd.read_csv(csv_path)
-    week_cols = [col for col in df.columns if col.startswith("week_")]
-
-    # 1. Most probable path
-    most_probable = df.loc[df["log_prob"].idxmax()]
-    print("Most Probable Path (highest log_prob):")
-    for week in week_cols:
-        print(f"{week}: {most_probable[week]}")
-    print(f"log_prob: {most_probable['log_prob']}\n")
-
-    # 2. For the lowest week, top 5 teams by cumulative probability
-    week1 = week_cols[0]
-    top_week1 = df.groupby(week1)["log_prob"].agg(lambda x: np.exp(x).sum())
-    total_prob = np.exp(df["log_prob"]).sum()
-    top_week1 = top_week1.sort_values(ascending=False).head(5)
-    print(f"Top 5 teams for {week1} by cumulative probability (% of total):")
-    for team, prob in top_week1.items():
-        pct = 100 * prob / total_prob
-        print(f"{team}: {prob:.4f} ({pct:.2f}%)")
-    print()
-
-    # 3. For each team, top 3 weeks to pick the team and % for those weeks
-    print("Top 3 weeks to pick each team (by cumulative probability):")
-    teams = set(df[week_cols].values.flatten())
-    total_prob = np.exp(df["log_prob"]).sum()
-    for team in sorted(teams):
-        week_probs = {}
+    for source in best["source"]:
+        if len(paths) > 1:
+            print(f"=== {source} ===")
+        source_paths = df[df["source"] == source]
+        week_cols = [c for c in week_columns(df) if source_paths[c].notna().any()]
+        source_shares = shares[shares["source"] == source]
+
+        # 1. Most probable path
+        most_probable = best[best["source"] == source].iloc[0]
+        print("Most Probable Path (highest log_prob):")
         for week in week_cols:
-            mask = df[week] == team
-            week_probs[week] = np.exp(df.loc[mask, "log_prob"]).sum()
-        top_weeks = sorted(week_probs.items(), key=lambda x: x[1], reverse=True)[:3]
-        print(f"{team}:")
-        for week, prob in top_weeks:
-            pct = 100 * prob / total_prob
-            print(f"  {week}: {pct:.2f}%")
-    print()
+            print(f"{week}: {most_probable[week]}")
+        print(f"log_prob: {most_probable['log_prob']}\n")
+
+        # 2. For the lowest week, top 5 teams by cumulative probability
+        week1 = week_cols[0]
+        top_week1 = source_shares[source_shares["week"] == int(week1.split("_")[1])]
+        print(f"Top 5 teams for {week1} by cumulative probability (% of total):")
+        for row in top_week1.head(5).itertuples():
+            print(f"{row.team}: {np.exp(row.log_prob):.4f} ({100 * row.share:.2f}%)")
+        print()
+
+        # 3. For each team, top 3 weeks to pick the team and % for those weeks
+        print("Top 3 weeks to pick each team (by cumulative probability):")
+        by_team = source_shares.sort_values(
+            ["team", "share", "week"], ascending=[True, False, True]
+        )
+        for team, weeks in by_team.groupby("team", sort=True):
+            print(f"{team}:")
+            top = [(f"week_{row.week}", row.share) for row in weeks.head(3).itertuples()]
+            # Teams picked in fewer than 3 weeks list the first unpicked weeks
+            # at 0.00%, as when every week was summed
+            top += [(w, 0.0) for w in week_cols if w not in dict(top)][: 3 - len(top)]
+            for week, share in top:
+                print(f"  {week}: {100 * share:.2f}%")
+        print()
+
+    if output:
+        shares.to_csv(output, index=False)
+    return shares
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report pick probabilities of beam search result files."
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=["results/beam_2025_wk-5_k10000.csv"],
+        help="Result files, e.g. results/beam_*_wk-1_k10000.csv",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="CSV file for the table of per-week, per-team probability shares",
+    )
+    args = parser.parse_args()
+    report_card(*args.paths, output=args.output)
 
 
 if __name__ == "__main__":
-    report_card("results/beam_2025_wk-5_k10000.csv")
+    main()
@@ -1,10 +1,12 @@
 #!/bin/bash
 
-# This script runs the beam_cli.py simulation for a user-defined range of years.
-# It requires a start and end year to be passed as command-line arguments.
-
-# Exit immediately if any command fails, preventing partial runs.
-set -e
+# This script runs the week-1 beam search backtest for a user-defined range of
+# years. It requires a start and end year to be passed as command-line arguments.
+#
+# The years run in parallel through backtest_cli.py: jobs whose output already
+# exists are skipped and a failed year does not stop the others, so re-running
+# the same command resumes an interrupted batch. Progress is kept in
+# ./results/manifest.json.
 
 # --- Argument Validation ---
 # Check if exactly two arguments were provided.
@@ -21,24 +23,8 @@ END_YEAR=$2
 
 echo "Starting batch simulation run for Week 1 from $START_YEAR to $END_YEAR..."
 
-# Loop through the sequence of years from START_YEAR to END_YEAR.
-# We use `seq` because it reliably handles variables in loops.
-for year in $(seq "$START_YEAR" "$END_YEAR")
-do
-  # Define the output filename using the current year from the loop
-  output_file="./results/beam_${year}_wk-1_k10000.csv"
-
-  # Print a message to show the current progress
-  echo "==> Running simulation for Year: $year | Output: $output_file"
-
-  # Execute the python script with the current year and dynamic output filename.
-  python simulation/beam_cli.py \
-    --year "$year" \
-    --week 1 \
-    --k 10000 \
-    --n 1 \
-    --output "$output_file"
-
-done
-
-echo "Batch simulation run completed successfully for years $START_YEAR-$END_YEAR."
\ No newline at end of file
+python backtest_cli.py \
+  --years "$START_YEAR-$END_YEAR" \
+  --weeks 1 \
+  --k 10000 \
+  --output "./results/beam_{year}_wk-{week}_k{k}.csv"
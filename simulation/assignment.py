@@ -0,0 +1,66 @@
+import heapq
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+# Stand-in weight for forbidden (week, team) cells; far below any real
+# log-probability sum so the solver only picks one when nothing else fits
+_FORBIDDEN = -1e9
+
+
+def solve_assignment(weights, allowed=None):
+    """
+    Best assignment of one distinct column to every row of weights (rows =
+    weeks, columns = teams), maximizing the summed weight. Cells that are
+    -inf or not allowed are never used. Returns (score, columns) or None if
+    no complete assignment exists.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    if allowed is None:
+        allowed = np.isfinite(weights)
+    else:
+        allowed = allowed & np.isfinite(weights)
+    rows, cols = linear_sum_assignment(
+        np.where(allowed, weights, _FORBIDDEN), maximize=True
+    )
+    if len(rows) < weights.shape[0] or not allowed[rows, cols].all():
+        return None
+    return weights[rows, cols].sum(), cols
+
+
+def ranked_assignments(weights, n):
+    """
+    Up to n best assignments of weights, best first, with Murty's algorithm:
+    each solution's space is partitioned by fixing its first i rows and
+    forbidding its (i+1)-th cell, and the best solution of every part is
+    kept in a priority queue. Yields (score, columns).
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    allowed = np.isfinite(weights)
+    best = solve_assignment(weights, allowed)
+    if best is None or n <= 0:
+        return
+
+    counter = 0  # insertion order breaks score ties deterministically
+    queue = [(-best[0], counter, best[1], allowed, 0)]
+    found = 0
+    while queue and found < n:
+        neg_score, _, cols, allowed, fixed = heapq.heappop(queue)
+        yield -neg_score, cols
+        found += 1
+
+        part = allowed.copy()
+        for i in range(fixed, weights.shape[0]):
+            child = part.copy()
+            child[i, cols[i]] = False
+            solution = solve_assignment(weights, child)
+            if solution is not None:
+                counter += 1
+                heapq.heappush(
+                    queue, (-solution[0], counter, solution[1], child, i)
+                )
+            # Later parts keep row i fixed to this solution's choice
+            part[i, :] = False
+            part[:, cols[i]] = False
+            part[i, cols[i]] = True
+
@@ -0,0 +1,444 @@
+import numpy as np
+
+from .records import RecordState, WINS, LOSSES, GAMES_PLAYED
+
+
+def top_k_indices(logp, k):
+    """
+    Indices of the k largest values of logp, best first. Finds the k-th
+    value with a linear-time partition and only sorts the survivors; ties
+    (including at the k-th place) are broken by position, so the result
+    equals a stable full sort truncated to k.
+    """
+    logp = np.asarray(logp, dtype=np.float64)
+    n = len(logp)
+    if k >= n:
+        return np.argsort(-logp, kind="stable")
+    if k <= 0:
+        return np.zeros(0, dtype=np.intp)
+    kth = -np.partition(-logp, k - 1)[k - 1]
+    above = np.nonzero(logp > kth)[0]
+    at = np.nonzero(logp == kth)[0][: k - len(above)]
+    idx = np.concatenate([above, at])
+    return idx[np.lexsort((idx, -logp[idx]))]
+
+
+def group_logsumexp(values, groups, n_groups):
+    """log(sum(exp(values))) per group id, computed without underflow."""
+    peak = np.full(n_groups, -np.inf)
+    np.maximum.at(peak, groups, values)
+    safe_peak = np.where(np.isfinite(peak), peak, 0.0)
+    total = np.zeros(n_groups)
+    np.add.at(total, groups, np.exp(values - safe_peak[groups]))
+    with np.errstate(divide="ignore"):
+        return safe_peak + np.log(total)
+
+
+class PathBounds(object):
+    """
+    Bounds for exact branch-and-bound pruning. best holds each eligible
+    team's highest win log-probability of every week over all reachable
+    record states of a ProbabilityTable (-inf where the team cannot be
+    picked), and week_best the best of them: no child of a parent gains
+    more than week_best in that week.
+    """
+
+    def __init__(self, season, table, rank_dict=None):
+        self.registry = season.registry
+        self.start_week = table.start_week
+        n_weeks = table.end_week - table.start_week + 1
+        self.best = np.full((n_weeks, len(self.registry)), -np.inf)
+        for wi, wk in enumerate(range(table.start_week, table.end_week + 1)):
+            eligible = season._filter_teams_by_rank(
+                season.index.week_teams(wk), wk, rank_dict
+            )
+            for team in eligible:
+                g, _, is_home = season.index.game_of(wk, team)
+                probs = table.probs[wi, g]
+                probs = probs if is_home else 1 - probs
+                with np.errstate(divide="ignore"):
+                    self.best[wi, self.registry.id(team)] = np.log(np.nanmax(probs))
+        self.week_best = self.best.max(axis=1)
+
+
+class BeamState(object):
+    """
+    A beam held as arrays, one row per path: a uint64 bitmask of used teams,
+    the pick history as team ids, the path log-probability and the wins each
+    team has gained since the start week along that path. mass is the
+    log-sum-exp probability of all paths merged into a row (equal to logp
+    when nothing was merged).
+    """
+
+    FIELDS = ("used", "picks", "logp", "wins", "mass")
+
+    def __init__(self, used, picks, logp, wins, mass=None):
+        self.used = used  # (n,) uint64
+        self.picks = picks  # (n, weeks so far) int16
+        self.logp = logp  # (n,) float64
+        self.wins = wins  # (n, n_teams) int16
+        self.mass = logp if mass is None else mass  # (n,) float64
+
+    def __len__(self):
+        return len(self.logp)
+
+    @staticmethod
+    def concat(first, second):
+        return BeamState(
+            np.concatenate([first.used, second.used]),
+            np.vstack([first.picks, second.picks]),
+            np.concatenate([first.logp, second.logp]),
+            np.vstack([first.wins, second.wins]),
+            np.concatenate([first.mass, second.mass]),
+        )
+
+    def take(self, idx):
+        return BeamState(
+            self.used[idx],
+            self.picks[idx],
+            self.logp[idx],
+            self.wins[idx],
+            self.mass[idx],
+        )
+
+
+class VectorizedBeam(object):
+    """
+    Beam search over a ProbabilityTable with every (path, pick) candidate of
+    a week expanded at once with array operations. Produces the same paths
+    and ordering as BeamExploreSeason's dict engine: exact ties are broken by
+    parent path order, then team id.
+    """
+
+    def __init__(
+        self,
+        season,
+        table,
+        rank_dict=None,
+        survivor_picks=None,
+        prior_weeks=None,
+        merge=False,
+        bounds=None,
+        prune=None,
+    ):
+        self.season = season
+        self.table = table
+        self.merge = merge
+        self.bounds = bounds  # PathBounds for branch-and-bound
+        self.prune = prune if bounds is not None else None
+        self.stats = {"candidates": 0, "merged": 0, "skipped": 0}
+        self.registry = season.registry
+        if len(self.registry) > 64:
+            raise ValueError("The vectorized beam supports at most 64 teams")
+        self.survivor_picks = list(survivor_picks or [])
+        self.base = RecordState.from_records(self.registry, prior_weeks)
+
+        n_teams = len(self.registry)
+        self.weeks = {}
+        played = np.zeros(n_teams, dtype=np.int16)
+        for wk in range(table.start_week, table.end_week + 1):
+            games = table.games[wk]
+            home = np.array([self.registry.id(h) for h, _ in games], dtype=np.intp)
+            away = np.array([self.registry.id(a) for _, a in games], dtype=np.intp)
+            eligible = sorted(
+                self.registry.id(t)
+                for t in season._filter_teams_by_rank(
+                    season.index.week_teams(wk), wk, rank_dict
+                )
+            )
+            game_of = np.array(
+                [season.index.game_of(wk, self.registry.name(t))[0] for t in eligible],
+                dtype=np.intp,
+            )
+            self.weeks[wk] = {
+                "home": home,
+                "away": away,
+                "eligible": np.array(eligible, dtype=np.intp),
+                "game": game_of,
+                "is_home": home[game_of] == np.array(eligible, dtype=np.intp),
+                "opponent": np.where(
+                    home[game_of] == np.array(eligible, dtype=np.intp),
+                    away[game_of],
+                    home[game_of],
+                ),
+            }
+            np.add.at(played, home, 1)
+            np.add.at(played, away, 1)
+        self.played = played  # games from start_week to end_week per team
+
+    def initial_state(self):
+        used = np.uint64(0)
+        for team in self.survivor_picks:
+            if team in self.registry:
+                used |= np.uint64(1) << np.uint64(self.registry.id(team))
+        n_teams = len(self.registry)
+        return BeamState(
+            np.array([used], dtype=np.uint64),
+            np.zeros((1, 0), dtype=np.int16),
+            np.zeros(1, dtype=np.float64),
+            np.zeros((1, n_teams), dtype=np.int16),
+        )
+
+    def state_of(self, paths):
+        """
+        BeamState of path dicts as the dict engines hold them (picks after
+        survivor_picks, log-probability and RecordState prior_weeks). The
+        paths must all have the same number of picks.
+        """
+        start = len(self.survivor_picks)
+        n_picks = len(paths[0]["picks"]) - start if paths else 0
+        picks = np.array(
+            [[self.registry.id(t) for t in p["picks"][start:]] for p in paths],
+            dtype=np.int16,
+        ).reshape(len(paths), n_picks)
+        wins = np.array(
+            [p["prior_weeks"].data[:, WINS] for p in paths], dtype=np.int16
+        ).reshape(len(paths), len(self.registry))
+        bits = np.uint64(1) << picks.astype(np.uint64)
+        return BeamState(
+            np.bitwise_or.reduce(bits, axis=1) | self.initial_state().used[0],
+            picks,
+            np.array([p["p"] for p in paths], dtype=np.float64),
+            wins - self.base.data[:, WINS],
+        )
+
+    def week_probs(self, state, wk):
+        """(n_paths, n_games) home-win probabilities for every path."""
+        w = self.weeks[wk]
+        games = np.arange(len(w["home"]))
+        return self.table.probs[
+            wk - self.table.start_week,
+            games[None, :],
+            state.wins[:, w["home"]],
+            state.wins[:, w["away"]],
+        ]
+
+    def expand(self, state, wk):
+        """
+        Score every (path, eligible team) candidate of week wk. Returns the
+        home-win probabilities and (parent idx, team idx into eligible,
+        pick log-prob) of the candidates whose team is still available, in
+        path-major, team-id order.
+        """
+        w = self.weeks[wk]
+        probs = self.week_probs(state, wk)
+        pick_probs = np.where(w["is_home"], probs[:, w["game"]], 1 - probs[:, w["game"]])
+        bits = np.uint64(1) << w["eligible"].astype(np.uint64)
+        available = (state.used[:, None] & bits[None, :]) == 0
+        parent, team_idx = np.nonzero(available)
+        with np.errstate(divide="ignore"):
+            step = np.log(pick_probs[parent, team_idx])
+        return probs, parent, team_idx, step
+
+    def select(self, logp, k):
+        """Indices of the k best candidates, best first, ties in input order."""
+        return top_k_indices(logp, k)
+
+    def advance(self, state, wk, probs, parent, team_idx, step):
+        """Build the next beam from the selected candidates."""
+        w = self.weeks[wk]
+        n_teams = len(self.registry)
+
+        # Records after the natural (favourite wins) outcome of every game
+        home_wins = probs >= 0.5
+        rows = np.arange(len(state))[:, None]
+        winners = rows * n_teams + np.where(home_wins, w["home"], w["away"])
+        gained = np.bincount(winners.ravel(), minlength=len(state) * n_teams)
+        gained = gained.astype(np.int16).reshape(len(state), n_teams)
+
+        wins = state.wins[parent] + gained[parent]
+        team = w["eligible"][team_idx]
+        opponent = w["opponent"][team_idx]
+        game = w["game"][team_idx]
+        favourite = home_wins[parent, game] == w["is_home"][team_idx]
+        flip = np.nonzero(~favourite)[0]
+        wins[flip, team[flip]] += 1
+        wins[flip, opponent[flip]] -= 1
+
+        used = state.used[parent] | (np.uint64(1) << team.astype(np.uint64))
+        picks = np.hstack([state.picks[parent], team.astype(np.int16)[:, None]])
+        return BeamState(
+            used,
+            picks,
+            state.logp[parent] + step,
+            wins,
+            state.mass[parent] + step,
+        )
+
+    def merge_states(self, state):
+        """
+        Collapse paths that are future-equivalent: same first pick of this
+        search, same used teams and same records. The highest-probability
+        path represents the group (its picks and logp are kept) and mass
+        becomes the log-sum-exp of the group's mass. Keeping the first pick
+        in the key leaves the per-first-pick probability totals exact.
+        """
+        first = state.picks[:, :1].astype(np.int64)
+        key = np.hstack(
+            [first, state.used.view(np.int64)[:, None], state.wins.astype(np.int64)]
+        )
+        key = np.ascontiguousarray(key).view(
+            np.dtype((np.void, key.dtype.itemsize * key.shape[1]))
+        ).ravel()
+        _, groups = np.unique(key, return_inverse=True)
+        groups = groups.ravel()
+        n_groups = groups.max() + 1 if len(groups) else 0
+
+        # Representative: best logp, earliest candidate among exact ties
+        order = np.lexsort((np.arange(len(state)), -state.logp, groups))
+        first_in_group = np.ones(len(order), dtype=bool)
+        first_in_group[1:] = groups[order][1:] != groups[order][:-1]
+        representatives = np.sort(order[first_in_group])
+
+        mass = group_logsumexp(state.mass, groups, n_groups)
+        merged = state.take(representatives)
+        merged.mass = mass[groups[representatives]]
+        self.stats["merged"] += len(state) - len(merged)
+        return merged
+
+    def skip_parents(self, state, wk, k):
+        """
+        The parents of state whose best possible child of week wk can still
+        reach the top k (see BeamExploreSeason's exact pruning). The k-th
+        best child of the fewest leading parents with k children is the
+        threshold; skipping only drops children below it, so the selected
+        paths are unchanged.
+        """
+        w = self.weeks[wk]
+        bits = np.uint64(1) << w["eligible"].astype(np.uint64)
+        counts = ((state.used[:, None] & bits[None, :]) == 0).sum(axis=1)
+        lead = int(np.searchsorted(np.cumsum(counts), k)) + 1
+        if k <= 0 or lead >= len(state):
+            return state
+        head = state.take(np.arange(lead))
+        _, parent, team_idx, step = self.expand(head, wk)
+        logp = head.logp[parent] + step
+        if len(logp) < k:
+            return state
+        threshold = -np.partition(-logp, k - 1)[k - 1]
+        week_best = self.bounds.week_best[wk - self.bounds.start_week]
+        skip = state.logp + week_best < threshold
+        skip[:lead] = False
+        self.stats["skipped"] += int(counts[skip].sum())
+        return state.take(np.nonzero(~skip)[0])
+
+    def next_state(self, state, wk, k):
+        """Expand, prune, merge and select the beam of week wk."""
+        probs, parent, team_idx, step = self.expand(state, wk)
+        self.stats["candidates"] += len(step)
+        if self.merge:
+            children = self.merge_states(
+                self.advance(state, wk, probs, parent, team_idx, step)
+            )
+            return children.take(self.select(children.logp, k))
+        keep = self.select(state.logp[parent] + step, k)
+        return self.advance(state, wk, probs, parent[keep], team_idx[keep], step[keep])
+
+    def run(
+        self, k, week=None, end_week=None, state=None, progress=None, on_week=None, pool=None
+    ):
+        """
+        Search weeks week..end_week from state (default: the start of the
+        table). on_week(wk, state) is called after every completed week.
+
+        With exact pruning, parents whose children cannot reach the top k are
+        not expanded (not in merge mode, where they would still add mass).
+        With pool (a ParallelExpander, not in merge mode), shards of the beam
+        are expanded and reduced to their k best candidates on worker
+        processes.
+        """
+        week = self.table.start_week if week is None else week
+        end_week = self.table.end_week if end_week is None else end_week
+        state = self.initial_state() if state is None else state
+        weeks = range(week, end_week + 1)
+        for wk in progress(weeks) if progress else weeks:
+            if self.prune == "exact" and not self.merge:
+                state = self.skip_parents(state, wk, k)
+            if pool is not None and not self.merge:
+                parent, team_idx, step, stats = pool.best_candidates(state, wk, k)
+                for key, value in stats.items():
+                    self.stats[key] += value
+                state = self.advance(
+                    state, wk, self.week_probs(state, wk), parent, team_idx, step
+                )
+            else:
+                state = self.next_state(state, wk, k)
+            if on_week is not None:
+                on_week(wk, state)
+        return state
+
+    def score_paths(self, sequences, week=None):
+        """
+        BeamState of fixed pick sequences (team ids, one column per week
+        from week on) scored on this table, in input order. Sequences with a
+        pick that is ineligible or already used are dropped.
+        """
+        week = self.table.start_week if week is None else week
+        sequences = np.asarray(sequences, dtype=np.intp).reshape(len(sequences), -1)
+        state = self.initial_state().take(np.zeros(len(sequences), dtype=np.intp))
+        for wi in range(sequences.shape[1]):
+            wk = week + wi
+            w = self.weeks[wk]
+            position = np.full(len(self.registry), -1, dtype=np.intp)
+            position[w["eligible"]] = np.arange(len(w["eligible"]))
+            team = sequences[:, wi]
+            team_idx = position[team]
+            bits = np.uint64(1) << team.astype(np.uint64)
+            valid = np.nonzero((team_idx >= 0) & ((state.used & bits) == 0))[0]
+            state, sequences, team_idx = state.take(valid), sequences[valid], team_idx[valid]
+
+            probs = self.week_probs(state, wk)
+            game = w["game"][team_idx]
+            p = probs[np.arange(len(state)), game]
+            with np.errstate(divide="ignore"):
+                step = np.log(np.where(w["is_home"][team_idx], p, 1 - p))
+            state = self.advance(
+                state, wk, probs, np.arange(len(state)), team_idx, step
+            )
+        return state
+
+    def combine(self, state, seeded, k):
+        """
+        The k best of a searched beam and scored seed paths, best first.
+        Seeds the search already found are dropped, so ties keep the
+        search's order ahead of the seeds.
+        """
+        both = BeamState.concat(state, seeded)
+        rows = np.ascontiguousarray(both.picks).view(
+            np.dtype((np.void, both.picks.dtype.itemsize * both.picks.shape[1]))
+        ).ravel()
+        _, first = np.unique(rows, return_index=True)
+        unique = both.take(np.sort(first))
+        return unique.take(self.select(unique.logp, k))
+
+    def records(self, state, i):
+        """RecordState of path i at the end of the search."""
+        data = self.base.data.copy()
+        gained = state.wins[i]
+        data[:, WINS] += gained
+        data[:, LOSSES] += self.played - gained
+        data[:, GAMES_PLAYED] += self.played
+        return RecordState(self.registry, data)
+
+    def paths(self, state, records=True):
+        """
+        The beam as BeamExploreSeason.resolve's path dicts, one at a time. In
+        merge mode each path also carries log_mass, the log-probability of
+        all the paths it represents; without records the prior_weeks
+        RecordState is not built.
+        """
+        names = self.registry.names
+        for i in range(len(state)):
+            path = {
+                "picks": self.survivor_picks + [names[t] for t in state.picks[i]],
+                "p": state.logp[i],
+            }
+            if records:
+                path["prior_weeks"] = self.records(state, i)
+            if self.merge:
+                path["log_mass"] = state.mass[i]
+            yield path
+
+    def to_paths(self, state):
+        """The beam as a list of path dicts (see paths)."""
+        return list(self.paths(state))
@@ -0,0 +1,213 @@
+import hashlib
+import json
+import sqlite3
+import types
+from collections import OrderedDict
+
+import numpy as np
+
+# Default bound of the caches the CLIs and the backtest runner share across
+# weeks and years
+DEFAULT_CACHE_SIZE = 100_000
+
+
+class GameCache(object):
+    """
+    Bounded LRU cache for game results with hit/miss/eviction counters.
+    Drop-in replacement for the plain dict used as external_game_cache.
+    """
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize or None  # None (or 0) means unbounded
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if self.maxsize is not None:
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def summary(self):
+        s = self.stats()
+        return (
+            f"hits={s['hits']} misses={s['misses']} evictions={s['evictions']} "
+            f"size={s['size']}/{s['maxsize'] or 'inf'} hit_rate={100 * s['hit_rate']:.1f}%"
+        )
+
+
+def _digest(obj, h, depth=0):
+    """Feed a deterministic description of obj into the hash h."""
+    if depth > 50:
+        raise ValueError("Object graph too deep to fingerprint")
+    if obj is None or isinstance(obj, (bool, int, float, str, bytes)):
+        h.update(f"{type(obj).__name__}:{obj!r};".encode())
+    elif isinstance(obj, type):
+        h.update(f"type:{obj.__module__}.{obj.__qualname__};".encode())
+    elif isinstance(obj, np.ndarray):
+        h.update(f"ndarray:{obj.dtype}:{obj.shape};".encode())
+        h.update(obj.tobytes() if obj.dtype != object else repr(obj.tolist()).encode())
+    elif isinstance(obj, np.generic):
+        _digest(obj.item(), h, depth + 1)
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}[{len(obj)}];".encode())
+        for item in obj:
+            _digest(item, h, depth + 1)
+    elif isinstance(obj, dict):
+        h.update(f"dict[{len(obj)}];".encode())
+        for key in sorted(obj, key=repr):
+            _digest(key, h, depth + 1)
+            _digest(obj[key], h, depth + 1)
+    elif isinstance(obj, types.CodeType):
+        h.update(obj.co_code)
+        _digest(obj.co_names, h, depth + 1)
+        _digest(obj.co_consts, h, depth + 1)
+    elif isinstance(obj, types.FunctionType):
+        _digest(obj.__code__, h, depth + 1)
+        _digest([c.cell_contents for c in (obj.__closure__ or [])], h, depth + 1)
+        _digest(obj.__defaults__, h, depth + 1)
+        for name in obj.__code__.co_names:
+            helper = obj.__globals__.get(name)
+            if isinstance(helper, types.FunctionType) and helper is not obj:
+                _digest(helper, h, depth + 1)
+    elif hasattr(obj, "__dict__"):
+        h.update(f"{type(obj).__module__}.{type(obj).__qualname__};".encode())
+        _digest(vars(obj), h, depth + 1)
+    else:
+        h.update(f"{type(obj).__name__}:{obj!r};".encode())
+
+
+def model_fingerprint(model):
+    """
+    Short, process-independent hash of a fitted model (parameters, fitted
+    attributes and transform functions). Compiled models are fingerprinted
+    by the pipeline they were compiled from.
+    """
+    h = hashlib.sha1()
+    _digest(getattr(model, "source", None) or model, h)
+    return h.hexdigest()[:16]
+
+
+def _plain(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class PersistentGameCache(GameCache):
+    """
+    GameCache backed by a local SQLite file so game probabilities survive
+    across resolve calls and CLI runs. Rows are keyed by the model fingerprint
+    plus the canonical (home, away, *feature row) key; entries for the current
+    models are warm-loaded at startup and new entries are appended in batches.
+    """
+
+    def __init__(self, path, models, maxsize=None, flush_every=10000):
+        super().__init__(maxsize=maxsize)
+        self.path = path
+        self.flush_every = flush_every
+        self.fingerprints = {name: model_fingerprint(m) for name, m in models.items()}
+        self._model_names = {fp: name for name, fp in self.fingerprints.items()}
+        self._pending = []
+        self.loaded = 0
+
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS game_probs (
+                fingerprint TEXT NOT NULL,
+                key TEXT NOT NULL,
+                winner TEXT NOT NULL,
+                prob REAL NOT NULL,
+                PRIMARY KEY (fingerprint, key)
+            )
+            """
+        )
+        self._db.commit()
+        self._warm_load()
+
+    def _warm_load(self):
+        fingerprints = list(self._model_names)
+        placeholders = ",".join("?" * len(fingerprints))
+        rows = self._db.execute(
+            f"SELECT fingerprint, key, winner, prob FROM game_probs "
+            f"WHERE fingerprint IN ({placeholders})",
+            fingerprints,
+        )
+        for fingerprint, key, winner, prob in rows:
+            if self.maxsize is not None and len(self._data) >= self.maxsize:
+                break
+            key = (self._model_names[fingerprint], *json.loads(key))
+            self._data[key] = (winner, prob)
+            self.loaded += 1
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        fingerprint = self.fingerprints.get(key[0])
+        if fingerprint is None:
+            return
+        stored_key = json.dumps([_plain(v) for v in key[1:]])
+        winner, prob = value
+        self._pending.append((fingerprint, stored_key, winner, float(prob)))
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        self._db.executemany(
+            "INSERT OR IGNORE INTO game_probs VALUES (?, ?, ?, ?)", self._pending
+        )
+        self._db.commit()
+        self._pending = []
+
+    def close(self):
+        self.flush()
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def summary(self):
+        return f"{super().summary()} loaded={self.loaded} path={self.path}"
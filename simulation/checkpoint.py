@@ -0,0 +1,76 @@
+import io
+import json
+import os
+
+import numpy as np
+
+CACHE_COUNTERS = ("hits", "misses", "evictions")
+
+
+class Checkpoint(object):
+    """
+    The latest state of a long search as one uncompressed .npz file: the
+    number of completed steps (weeks), named arrays and a small JSON dict of
+    metadata. Every save replaces the file atomically, so a killed run
+    leaves the last completed step behind. config identifies the search; a
+    checkpoint written with another config is refused on load.
+    """
+
+    def __init__(self, path, config):
+        self.path = path
+        self.key = json.dumps(config, sort_keys=True, default=str)
+
+    def save(self, step, arrays, meta=None):
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            _key=np.array(self.key),
+            _step=np.array(step),
+            _meta=np.array(json.dumps(meta or {})),
+            **arrays,
+        )
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(buffer.getbuffer())
+        os.replace(tmp, self.path)
+
+    def load(self):
+        """(step, arrays, meta) of the saved state, or None if there is none."""
+        if not os.path.exists(self.path):
+            return None
+        with np.load(self.path) as npz:
+            if str(npz["_key"]) != self.key:
+                raise ValueError(
+                    f"Checkpoint {self.path} was written by a different search"
+                )
+            arrays = {
+                name: npz[name] for name in npz.files if not name.startswith("_")
+            }
+            return int(npz["_step"]), arrays, json.loads(str(npz["_meta"]))
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def cache_counters(cache, since=None):
+    """
+    Hit/miss/eviction counters of a GameCache ({} for a plain dict), counted
+    from the counters since if given (a cache shared by many runs).
+    """
+    since = since or {}
+    return {
+        name: getattr(cache, name) - since.get(name, 0)
+        for name in CACHE_COUNTERS
+        if hasattr(cache, name)
+    }
+
+
+def restore_cache_counters(cache, counters):
+    """
+    Add the counters a run saved before it was interrupted, leaving what
+    other runs sharing the cache counted in place.
+    """
+    for name, value in counters.items():
+        if hasattr(cache, name):
+            setattr(cache, name, getattr(cache, name) + value)
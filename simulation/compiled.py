@@ -0,0 +1,219 @@
+import numpy as np
+import pandas as pd
+
+from . import features
+
+
+def _passthrough(X):
+    return X
+
+
+def _diff_days_rest(X):
+    return (X[:, 0] - X[:, 1]).reshape(-1, 1)
+
+
+def _season_stage(X):
+    week = X[:, 0]
+    return np.where(week <= 6, 0, np.where(week <= 12, 1, 2)).reshape(-1, 1)
+
+
+def _make_win_rate_diff(C=4, max_rank=32):
+    """
+    NumPy port of features.weighted_win_rate_diff. Inputs are ordered as
+    Home_Wins, Home_Games_Played, Away_Wins, Away_Games_Played, Home_Rank,
+    Away_Rank.
+    """
+
+    def win_rate_diff(X):
+        hw, hgp, aw, agp, hr, ar = X.T
+        with np.errstate(divide="ignore", invalid="ignore"):
+            h_raw = np.where(hgp > 0, hw / np.where(hgp > 0, hgp, 1), 0.5)
+            a_raw = np.where(agp > 0, aw / np.where(agp > 0, agp, 1), 0.5)
+        hps = 1 - (hr - 1) / (max_rank - 1)
+        aps = 1 - (ar - 1) / (max_rank - 1)
+        hcw = hgp / (hgp + C)
+        acw = agp / (agp + C)
+        hwr = hcw * h_raw + (1 - hcw) * hps
+        awr = acw * a_raw + (1 - acw) * aps
+        return (hwr - awr).reshape(-1, 1)
+
+    return win_rate_diff
+
+
+def _one_hot(categories):
+    categories = np.asarray(categories, dtype=float)
+
+    def encode(X):
+        return (X[:, :1] == categories.reshape(1, -1)).astype(float)
+
+    return encode
+
+
+# NumPy kernel factories of the feature transforms in features.py, keyed by
+# the function itself and called with the FunctionTransformer's kw_args
+_KERNELS = {
+    features.diff_days_rest: lambda: _diff_days_rest,
+    features.season_stage: lambda: _season_stage,
+    features.weighted_win_rate_diff: _make_win_rate_diff,
+}
+
+
+def _compile_transformer(transformer):
+    """
+    Return a list of NumPy callables equivalent to one ColumnTransformer
+    transformer, or None when the transformer is not recognised. A
+    FunctionTransformer is recognised only when its func is one of the
+    functions in features.py (by identity, whatever the entry is named) with
+    its parameters in kw_args; lambdas and closures are not inspected.
+    """
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import FunctionTransformer, OneHotEncoder
+
+    if isinstance(transformer, str):
+        return [_passthrough] if transformer == "passthrough" else None
+
+    if isinstance(transformer, Pipeline):
+        funcs = []
+        for _, step in transformer.steps:
+            compiled = _compile_transformer(step)
+            if compiled is None:
+                return None
+            funcs.extend(compiled)
+        return funcs
+
+    if isinstance(transformer, OneHotEncoder):
+        if len(transformer.categories_) != 1 or transformer.drop_idx_ is not None:
+            return None
+        return [_one_hot(transformer.categories_[0])]
+
+    if isinstance(transformer, FunctionTransformer):
+        if transformer.func is None:
+            return [_passthrough]
+        factory = _KERNELS.get(transformer.func)
+        return [factory(**(transformer.kw_args or {}))] if factory else None
+
+    return None
+
+
+class CompiledModel(object):
+    """
+    A fitted preprocessor -> LogisticRegression pipeline flattened into NumPy:
+    per-block feature transforms followed by a dot product and a sigmoid.
+    Exposes feature_names_in_ and predict_proba so it can stand in for the
+    sklearn pipeline anywhere in the simulation.
+    """
+
+    def __init__(self, feature_names, blocks, coef, intercept, source=None):
+        self.feature_names_in_ = np.asarray(feature_names, dtype=object)
+        self.blocks = blocks  # [(input column indices, [numpy callables])]
+        self.coef = np.asarray(coef, dtype=float)
+        self.intercept = float(intercept)
+        self.source = source
+
+    def transform(self, X):
+        X = np.asarray(X, dtype=float)
+        out = []
+        for cols, funcs in self.blocks:
+            Z = X[:, cols]
+            for func in funcs:
+                Z = func(Z)
+            out.append(Z)
+        return np.hstack(out)
+
+    def predict_home(self, X):
+        logit = self.transform(X) @ self.coef + self.intercept
+        return 1.0 / (1.0 + np.exp(-logit))
+
+    def predict_proba(self, X):
+        if isinstance(X, pd.DataFrame):
+            X = X[list(self.feature_names_in_)].to_numpy(dtype=float)
+        p = self.predict_home(X)
+        return np.column_stack([1 - p, p])
+
+
+def _probe_rows(feature_names, n=512, seed=0):
+    """Random but plausible feature rows used to verify a compiled kernel."""
+    rng = np.random.default_rng(seed)
+    games_played = rng.integers(0, 17, n)
+    wins = rng.integers(0, games_played + 1)
+    away_games_played = rng.integers(0, 17, n)
+    away_wins = rng.integers(0, away_games_played + 1)
+    values = {
+        "Week": rng.integers(1, 19, n),
+        "Is_Neutral": rng.integers(0, 2, n),
+        "Spread": rng.normal(0, 7, n).round(1),
+        "Rank_Age": rng.integers(0, 18, n),
+        "Home_Rank": rng.integers(1, 33, n),
+        "Away_Rank": rng.integers(1, 33, n),
+        "Home_Days_Since_Last_Game": rng.integers(4, 15, n),
+        "Away_Days_Since_Last_Game": rng.integers(4, 15, n),
+        "Home_Games_Played": games_played,
+        "Away_Games_Played": away_games_played,
+        "Home_Wins": wins,
+        "Away_Wins": away_wins,
+        "Home_Losses": games_played - wins,
+        "Away_Losses": away_games_played - away_wins,
+    }
+    return pd.DataFrame(
+        {f: values.get(f, rng.integers(0, 10, n)) for f in feature_names}
+    )
+
+
+def compile_model(model, atol=1e-9):
+    """
+    Compile a sklearn Pipeline(preprocessor -> LogisticRegression) into a
+    CompiledModel. Returns None if any step is not recognised or the compiled
+    kernel does not reproduce predict_proba on probe rows.
+    """
+    try:
+        from sklearn.compose import ColumnTransformer
+        from sklearn.linear_model import LogisticRegression
+    except ImportError:
+        return None
+
+    steps = getattr(model, "steps", None)
+    if not steps or len(steps) != 2:
+        return None
+    preprocessor, clf = steps[0][1], steps[1][1]
+    if not isinstance(preprocessor, ColumnTransformer) or not isinstance(
+        clf, LogisticRegression
+    ):
+        return None
+    if clf.coef_.shape[0] != 1 or list(clf.classes_) != [0, 1]:
+        return None
+
+    feature_names = list(model.feature_names_in_)
+    blocks = []
+    for _, transformer, cols in preprocessor.transformers_:
+        if isinstance(transformer, str) and transformer == "drop":
+            continue
+        funcs = _compile_transformer(transformer)
+        if funcs is None:
+            return None
+        blocks.append(([feature_names.index(c) for c in cols], funcs))
+
+    compiled = CompiledModel(
+        feature_names, blocks, clf.coef_[0], clf.intercept_[0], source=model
+    )
+
+    probe = _probe_rows(feature_names)
+    try:
+        expected = model.predict_proba(probe)[:, 1]
+        actual = compiled.predict_home(probe.to_numpy(dtype=float))
+    except Exception:
+        return None
+    if not np.allclose(expected, actual, rtol=0, atol=atol):
+        return None
+    return compiled
+
+
+def compile_models(models):
+    """
+    Return a copy of the models dict with every compilable model replaced by
+    its CompiledModel; models that cannot be compiled are kept as is.
+    """
+    compiled = {}
+    for name, model in models.items():
+        kernel = compile_model(model) if not isinstance(model, CompiledModel) else model
+        compiled[name] = kernel if kernel is not None else model
+    return compiled
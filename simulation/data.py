@@ -0,0 +1,109 @@
+import duckdb
+import pandas as pd
+
+SCHEDULE_COLUMNS = [
+    "Year",
+    "Week",
+    "Home_Team",
+    "Away_Team",
+    "Is_Neutral",
+    "Home_Days_Since_Last_Game",
+    "Away_Days_Since_Last_Game",
+]
+
+
+class SeasonData(object):
+    """
+    Everything the simulations read from the database for one season,
+    fetched in one query per table over a single read-only connection.
+    Spreads, rankings and team records of any week are then served from
+    memory.
+    """
+
+    def __init__(self, year, db_path="./data/data.db"):
+        self.year = year
+        with duckdb.connect(db_path, read_only=True) as db:
+            self.games = db.execute(
+                f"""
+                SELECT {", ".join(SCHEDULE_COLUMNS)}, Spread, Home_Won
+                FROM game_features
+                WHERE Year = ?
+                ORDER BY Week, Home_Team, Away_Team
+                """,
+                [year],
+            ).df()
+            self.rankings = db.execute(
+                """
+                SELECT
+                    Week,
+                    Team,
+                    ROW_NUMBER() OVER (PARTITION BY Week ORDER BY Rating DESC, Team) AS Rank
+                FROM nfl_rankings
+                WHERE Year = ?
+                ORDER BY Week, Team
+                """,
+                [year],
+            ).df()
+        self._build_records()
+
+    def _build_records(self):
+        # Cumulative wins and games played per team after every week, from
+        # the games with a result
+        played = self.games[self.games["Home_Won"].notna()]
+        home_won = played["Home_Won"].astype(bool)
+        results = pd.DataFrame(
+            {
+                "Week": pd.concat([played["Week"], played["Week"]]),
+                "Team": pd.concat([played["Home_Team"], played["Away_Team"]]),
+                "Won": pd.concat([home_won, ~home_won]).astype(int),
+            }
+        )
+        weeks = sorted(self.games["Week"].unique())
+        per_week = results.groupby(["Team", "Week"])["Won"].agg(["sum", "count"])
+        self._wins = per_week["sum"].unstack(fill_value=0).reindex(
+            columns=weeks, fill_value=0
+        ).cumsum(axis=1)
+        self._games_played = per_week["count"].unstack(fill_value=0).reindex(
+            columns=weeks, fill_value=0
+        ).cumsum(axis=1)
+
+    @property
+    def max_week(self):
+        return int(self.games["Week"].max())
+
+    def schedule(self):
+        return self.games[SCHEDULE_COLUMNS].reset_index(drop=True)
+
+    def spreads(self, week):
+        """Home_Team, Away_Team, Spread of the week's games."""
+        games = self.games[self.games["Week"] == week]
+        return games[["Home_Team", "Away_Team", "Spread"]].reset_index(drop=True)
+
+    def ranks(self, week):
+        """Team, Rank (1 = highest rating) as of the week."""
+        ranks = self.rankings[self.rankings["Week"] == week]
+        return ranks[["Team", "Rank"]].reset_index(drop=True)
+
+    def records(self, week):
+        """
+        {team: {"wins", "losses", "games_played"}} over the games before
+        week, for every team that has played.
+        """
+        before = [wk for wk in self._wins.columns if wk < week]
+        if not before:
+            return {}
+        wins = self._wins[before[-1]]
+        games_played = self._games_played[before[-1]]
+        return {
+            team: {
+                "wins": int(wins[team]),
+                "losses": int(games_played[team] - wins[team]),
+                "games_played": int(games_played[team]),
+            }
+            for team in wins.index
+            if games_played[team] > 0
+        }
+
+    def week(self, week):
+        """(spreads, ranks, records) as of the week."""
+        return self.spreads(week), self.ranks(week), self.records(week)
@@ -0,0 +1,157 @@
+import json
+import os
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+from .output import read_paths, week_columns
+from .records import TeamRegistry
+from .report import pick_codes
+
+
+class SeasonWinners(object):
+    """
+    Game winners of one season as a (week, team id) boolean matrix, row w
+    being week w. Home_Won == 1 makes the home team the winner, any other
+    result the away team (as the evaluation notebook did); games without a
+    result have no winner. played marks the weeks with at least one result.
+    """
+
+    def __init__(self, games):
+        teams = pd.concat([games["Home_Team"], games["Away_Team"]])
+        self.registry = TeamRegistry(teams.unique())
+        n_weeks = int(games["Week"].max()) + 1 if len(games) else 1
+        self.won = np.zeros((n_weeks, len(self.registry)), dtype=bool)
+        self.played = np.zeros(n_weeks, dtype=bool)
+
+        done = games[games["Home_Won"].notna()]
+        weeks = done["Week"].to_numpy(dtype=np.intp)
+        home_won = done["Home_Won"].to_numpy() == 1
+        winner = np.where(home_won, done["Home_Team"], done["Away_Team"])
+        ids = np.array([self.registry.id(t) for t in winner], dtype=np.intp)
+        self.won[weeks, ids] = True
+        self.played[weeks] = True
+
+    def team_ids(self, teams):
+        """Registry id of every team name, -1 for teams not in the season."""
+        return np.array(
+            [self.registry.id(t) if t in self.registry else -1 for t in teams],
+            dtype=np.intp,
+        )
+
+
+def load_winners(years, db_path="./data/data.db"):
+    """{year: SeasonWinners} of many seasons from one query."""
+    years = [int(y) for y in years]
+    with duckdb.connect(db_path, read_only=True) as db:
+        games = db.execute(
+            f"""
+            SELECT Year, Week, Home_Team, Away_Team, Home_Won
+            FROM game_features
+            WHERE Year IN ({", ".join("?" * len(years))})
+            ORDER BY Year, Week, Home_Team, Away_Team
+            """,
+            years,
+        ).df()
+    return {year: SeasonWinners(games[games["Year"] == year]) for year in years}
+
+
+def score_paths(df, winners):
+    """
+    Per path of a paths frame: errors (weeks whose pick did not win) and
+    first_loss (first such week, 0 if none), over the week columns whose
+    week has results. A missing pick counts as a loss. Every path is scored
+    with one lookup into the winners matrix.
+    """
+    week_cols, weeks = [], []
+    for c in week_columns(df):
+        wk = int(c.split("_", 1)[1])
+        if wk < len(winners.played) and winners.played[wk]:
+            week_cols.append(c)
+            weeks.append(wk)
+    weeks = np.array(weeks, dtype=np.intp)
+    if not week_cols:
+        lost = np.zeros((len(df), 0), dtype=bool)
+    else:
+        codes, teams = pick_codes(df, week_cols)
+        ids = np.append(winners.team_ids(teams), -1)[codes]  # code -1 -> id -1
+        lost = (ids < 0) | ~winners.won[weeks[None, :], np.maximum(ids, 0)]
+
+    first_loss = np.zeros(len(df), dtype=np.intp)
+    if len(weeks):
+        first_loss = np.where(lost.any(axis=1), weeks[np.argmax(lost, axis=1)], 0)
+    return pd.DataFrame(
+        {"errors": lost.sum(axis=1), "first_loss": first_loss}, index=df.index
+    )
+
+
+def cutoff_scores(df, winners, cutoffs=(1, 3, 10, 50, 100)):
+    """
+    Best score among the top n paths (by log_prob) for every cutoff n: the
+    fewest errors and the latest first loss (0 when some path never
+    loses), from running minima/maxima over the ranked paths.
+    """
+    ranked = df.sort_values("log_prob", ascending=False, kind="stable")
+    scores = score_paths(ranked, winners)
+    errors = np.minimum.accumulate(scores["errors"].to_numpy())
+    # A path without a loss outlasts any path with one
+    survival = np.where(scores["first_loss"] == 0, np.inf, scores["first_loss"])
+    survival = np.maximum.accumulate(survival)
+
+    result = {}
+    for n in cutoffs:
+        i = min(n, len(ranked)) - 1
+        if i < 0:
+            result[n] = (np.nan, np.nan)
+            continue
+        result[n] = (int(errors[i]), 0 if np.isinf(survival[i]) else int(survival[i]))
+    return result
+
+
+def greedy_frame(picks):
+    """A greedy path (picks from week 1 on) as a one-row paths frame."""
+    row = {f"week_{i + 1}": t for i, t in enumerate(picks)}
+    row["log_prob"] = 0.0
+    return pd.DataFrame([row])
+
+
+def cutoff_label(n):
+    return "best_path" if n == 1 else f"best_{n}_paths"
+
+
+def evaluate(
+    years,
+    paths_pattern,
+    greedy_pattern=None,
+    cutoffs=(1, 3, 10, 50, 100),
+    db_path="./data/data.db",
+    **fields,
+):
+    """
+    One row per year: the fewest errors (and latest first loss) among the
+    top n beam paths for every cutoff, and of the greedy path. File
+    patterns are formatted with year and fields (e.g. week, k); years
+    without a paths file are left out, a missing greedy file gives NaN.
+    """
+    winners = load_winners(years, db_path)
+    rows = []
+    for year in years:
+        path = paths_pattern.format(year=year, **fields)
+        if not os.path.exists(path):
+            continue
+        row = {"year": year}
+        scores = cutoff_scores(read_paths(path), winners[year], cutoffs)
+        for n, (errors, first_loss) in scores.items():
+            row[cutoff_label(n)] = errors
+            row[f"{cutoff_label(n)}_first_loss"] = first_loss
+        greedy = greedy_pattern.format(year=year, **fields) if greedy_pattern else None
+        if greedy and os.path.exists(greedy):
+            with open(greedy) as f:
+                errors, first_loss = cutoff_scores(
+                    greedy_frame(json.load(f)), winners[year], [1]
+                )[1]
+            row["greedy_path"] = errors
+            row["greedy_path_first_loss"] = first_loss
+        rows.append(row)
+    return pd.DataFrame(rows)
@@ -0,0 +1,28 @@
+# Feature transforms of the model notebooks' preprocessors. Models wrap
+# these functions (not lambdas) in FunctionTransformer, passing parameters
+# through kw_args, so compiled.py can recognise them by identity
+
+
+def diff_days_rest(X):
+    return (X["Home_Days_Since_Last_Game"] - X["Away_Days_Since_Last_Game"]).values.reshape(-1, 1)
+
+
+def season_stage(X):
+    return X["Week"].map(lambda x: 0 if x <= 6 else 1 if x <= 12 else 2).values.reshape(-1, 1)
+
+
+def weighted_win_rate_diff(X, C=4, max_rank=32):
+    X_ = X.copy()
+    X_["Home_Raw_Win_Pct"] = (X_["Home_Wins"] / X_["Home_Games_Played"]).fillna(0.5)
+    X_["Away_Raw_Win_Pct"] = (X_["Away_Wins"] / X_["Away_Games_Played"]).fillna(0.5)
+
+    hps = 1 - (X_["Home_Rank"] - 1) / (max_rank - 1)
+    aps = 1 - (X_["Away_Rank"] - 1) / (max_rank - 1)
+
+    hcw = X_["Home_Games_Played"] / (X_["Home_Games_Played"] + C)
+    acw = X_["Away_Games_Played"] / (X_["Away_Games_Played"] + C)
+
+    hwr = (hcw * X_["Home_Raw_Win_Pct"]) + ((1 - hcw) * hps)
+    awr = (acw * X_["Away_Raw_Win_Pct"]) + ((1 - acw) * aps)
+
+    return (hwr - awr).values.reshape(-1, 1)
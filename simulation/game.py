@@ -1,5 +1,33 @@
 import numpy as np
 import pandas as pd
+import sys
+
+
+def predict_home_probs(model, rows):
+    """
+    Score a list of feature rows (ordered as model.feature_names_in_) with a
+    single predict_proba call and return the home-win probability per row.
+    Compiled models are scored directly on a float array.
+    """
+    if hasattr(model, "predict_home"):
+        return model.predict_home(np.asarray(rows, dtype=float))
+    proba = model.predict_proba(pd.DataFrame(rows, columns=model.feature_names_in_))
+    proba = np.asarray(proba, dtype=float)
+    # A flat array is indexed per call, as Game.simulate always did: its
+    # first element is the probability of every row
+    if proba.ndim == 1:
+        return np.full(len(rows), proba[0])
+    if proba.shape[1] > 1:
+        return proba[:, 1]
+    return proba[:, 0]
+
+
+def cache_key(model_name, home_team, away_team, row):
+    """
+    Game cache key: the result only depends on the chosen model's inputs, so
+    the key is that feature row in the model's fixed column order.
+    """
+    return (model_name, sys.intern(home_team), sys.intern(away_team), *row)
 
 
 class Game(object):
@@ -9,45 +37,63 @@ class Game(object):
         self.away_team = away_team
         self.models = models  # dict: {'full': model, 'no_spread': model}
 
-    def simulate(self):
+    def model_name(self):
         # Use full model if Spread is available, else no_spread model
         if "Spread" in self.features and self.features["Spread"] is not None:
-            model = self.models["full"]
-            X = [self.features[f] for f in self.models["full"].feature_names_in_]
-        else:
-            model = self.models["no_spread"]
-            X = [self.features[f] for f in self.models["no_spread"].feature_names_in_]
-        # If predict returns a probability array, take [0][1], else just [0]
-        prob = model.predict_proba(pd.DataFrame([X], columns=model.feature_names_in_))[
-            0
-        ]
-        if isinstance(prob, (list, np.ndarray)) and len(prob) > 1:
-            prob = prob[1]  # If model returns [prob_lose, prob_win]
+            return "full"
+        return "no_spread"
+
+    def feature_row(self, model_name=None):
+        model = self.models[model_name or self.model_name()]
+        return [self.features[f] for f in model.feature_names_in_]
+
+    def outcome(self, prob):
         # winner = self.home_team if np.random.rand() < prob else self.away_team
         winner = self.home_team if prob >= 0.5 else self.away_team
         return winner, prob
 
+    def simulate(self):
+        model_name = self.model_name()
+        prob = predict_home_probs(
+            self.models[model_name], [self.feature_row(model_name)]
+        )[0]
+        return self.outcome(prob)
+
 
 class CacheEnabledGame(Game):
 
     def __init__(
-        self, features, home_team, away_team, models, external_game_cache: dict = None
+        self, features, home_team, away_team, models, external_game_cache=None
     ):
         super().__init__(features, home_team, away_team, models)
         self.external_game_cache = external_game_cache
-        if external_game_cache is not None and isinstance(external_game_cache, dict):
-            cache_key = [
-                f"{k}:{v}" for k, v in sorted(features.items(), key=lambda x: x[0])
-            ] + [home_team, away_team]
-            self.ckey = "-".join(cache_key)
+        if external_game_cache is not None:
+            self._model_name = self.model_name()
+            self._row = Game.feature_row(self, self._model_name)
+            self.ckey = cache_key(self._model_name, home_team, away_team, self._row)
 
-    def simulate(self):
+    def feature_row(self, model_name=None):
+        if self.external_game_cache is not None and model_name in (
+            None,
+            self._model_name,
+        ):
+            return self._row
+        return super().feature_row(model_name)
+
+    def cached_result(self):
         if self.external_game_cache is None:
-            return super().simulate()
+            return None
+        return self.external_game_cache.get(self.ckey)
+
+    def store_result(self, result):
+        if self.external_game_cache is not None:
+            self.external_game_cache[self.ckey] = result
 
-        if self.ckey in self.external_game_cache:
-            return self.external_game_cache[self.ckey]
+    def simulate(self):
+        r = self.cached_result()
+        if r is not None:
+            return r
 
         r = super().simulate()
-        self.external_game_cache[self.ckey] = r
+        self.store_result(r)
         return r
@@ -0,0 +1,166 @@
+import numpy as np
+
+from .checkpoint import Checkpoint, cache_counters, restore_cache_counters
+from .season import BeamExploreSeason
+from .table import EMPTY_RECORD
+
+
+def changed_teams(table, pick, records):
+    """
+    Teams whose record after table's start week (records, as realized)
+    differs from the one the search assumed: the favourites win every game
+    but pick's, which pick wins.
+    """
+    assumed = {}
+    for g, (home, away) in enumerate(table.games[table.start_week]):
+        winner = home if table.probs[0, g, 0, 0] >= 0.5 else away
+        if pick in (home, away):
+            winner = pick
+        loser = away if winner == home else home
+        assumed[winner] = (1, 0, 1)
+        assumed[loser] = (0, 1, 1)
+    changed = set()
+    for team in set(records) | set(table.base_records) | set(assumed):
+        new = records.get(team, EMPTY_RECORD)
+        old = table.base_records.get(team, EMPTY_RECORD)
+        gained = tuple(new[f] - old[f] for f in ("wins", "losses", "games_played"))
+        if gained != assumed.get(team, (0, 0, 0)):
+            changed.add(team)
+    return changed
+
+
+def consistent_paths(paths, table, changed):
+    """
+    The pick sequences of paths whose pick of the week after table's start
+    week was chosen on records that held: neither that pick nor its
+    opponent is a changed team. Later weeks are searched again (and every
+    carried path is re-scored) on the realized records.
+    """
+    wk = table.start_week + 1
+    if not changed or wk not in table.games:
+        return paths
+    opponents = {
+        **dict(table.games[wk]),
+        **{away: home for home, away in table.games[wk]},
+    }
+    return [
+        p
+        for p in paths
+        if p[wk - 1] not in changed and opponents.get(p[wk - 1]) not in changed
+    ]
+
+
+def run_greedy_beam_path(
+    year,
+    models,
+    data,
+    k=10000,
+    game_cache=None,
+    engine="table",
+    merge=False,
+    prune=None,
+    workers=1,
+    warm_start=False,
+    warm_k=None,
+    checkpoint=None,
+    resume=False,
+):
+    """
+    Greedy week-by-week backtest: each week, run the beam from that week on
+    and pick the team whose paths carry the most probability. data is the
+    year's SeasonData. Every week's probability table reuses the rows of
+    the previous week's table that still apply. With warm_start (vectorized
+    engine), the paths of the previous week's beam that agree with the
+    chosen pick and whose next pick does not rest on a result that went
+    differently than the search assumed (see consistent_paths), are carried
+    forward and re-scored with the new week's spreads, rankings and records.
+    Then only a narrower search of width warm_k (default k // 10) tops the
+    beam back up to k; a week with nothing to carry runs the full search.
+    This is an approximation, off by default: a path the narrow search
+    misses is lost, so the picks may differ from a full search's.
+    With a checkpoint path, the picks so far (and the carried paths) are
+    saved after every week; resume continues after the last saved week.
+    """
+    survivor_picks = []
+    prior_weeks = {}
+    path = []
+    carried = None
+    table = None
+    schedule_df = data.schedule()
+    max_week = data.max_week
+    start = 1
+    # The cache may be shared with other years: checkpoints hold this run's
+    # own counters only
+    cache_start = cache_counters(game_cache)
+    if checkpoint is not None:
+        checkpoint = Checkpoint(
+            checkpoint,
+            {
+                "year": year,
+                "k": k,
+                "engine": engine,
+                "merge": merge,
+                "prune": prune,
+                "warm_start": warm_start,
+                "warm_k": warm_k,
+            },
+        )
+        saved = checkpoint.load() if resume else None
+        if saved is not None:
+            done, arrays, meta = saved
+            path = [str(t) for t in arrays["path"]]
+            survivor_picks = path.copy()
+            if meta["carried"]:
+                carried = [[str(t) for t in p] for p in arrays["carried"]]
+            restore_cache_counters(game_cache, meta["cache"])
+            start = done + 1
+    for wk in range(start, max_week + 1):
+        spread_df, rank_df, prior_weeks = data.week(wk)
+
+        beams = BeamExploreSeason(
+            year, models, schedule_df, schedule_df.copy(), game_cache=game_cache
+        )
+        warm = warm_start and bool(carried)
+        bp = beams.resolve(
+            week=wk,
+            end_week=max_week,
+            spread=spread_df,
+            rank=rank_df,
+            k=(warm_k or max(1, k // 10)) if warm else k,
+            beam_size=k,
+            seed_paths=carried if warm else None,
+            n=1,
+            engine=engine,
+            merge=merge,
+            prune=prune,
+            workers=workers,
+            survivor_picks=survivor_picks,
+            prior_weeks=prior_weeks,
+            previous_table=table,
+        )
+        table = beams.table
+
+        pick_scores = {}
+        for path_obj in bp:
+            pick = path_obj["picks"][wk - 1]
+            pick_scores.setdefault(pick, 0)
+            # Merged paths carry the probability of every path they represent
+            pick_scores[pick] += np.exp(path_obj.get("log_mass", path_obj["p"]))
+        best_pick = max(pick_scores, key=pick_scores.get)
+        path.append(best_pick)
+        survivor_picks = path.copy()
+        if warm_start:
+            carried = [p["picks"] for p in bp if p["picks"][wk - 1] == best_pick]
+            if table is not None and wk < max_week:
+                changed = changed_teams(table, best_pick, data.records(wk + 1))
+                carried = consistent_paths(carried, table, changed)
+        if checkpoint is not None:
+            checkpoint.save(
+                wk,
+                {
+                    "path": np.array(path, dtype=str),
+                    "carried": np.array(carried or [], dtype=str),
+                },
+                {"carried": carried is not None, "cache": cache_counters(game_cache, cache_start)},
+            )
+    return path
@@ -0,0 +1,46 @@
+class SeasonIndex(object):
+    """
+    Schedule and static game features of one season, indexed once so the
+    simulation never filters DataFrames inside its loops.
+    """
+
+    def __init__(self, year, schedule_df, feature_df):
+        self.year = year
+        self.games = {}  # {wk: [(home, away), ...]} in schedule order
+        self.team_games = {}  # {(wk, team): (game idx, opponent, is_home)}
+        for wk, home, away in zip(
+            schedule_df["Week"], schedule_df["Home_Team"], schedule_df["Away_Team"]
+        ):
+            wk = int(wk)
+            week_games = self.games.setdefault(wk, [])
+            game_idx = len(week_games)
+            week_games.append((home, away))
+            self.team_games.setdefault((wk, home), (game_idx, away, True))
+            self.team_games.setdefault((wk, away), (game_idx, home, False))
+
+        self.teams = frozenset(schedule_df["Home_Team"]).union(
+            schedule_df["Away_Team"]
+        )
+        self.weeks = sorted(self.games)
+
+        # First feature row per (week, home, away) of this season
+        self.features = {}
+        if len(feature_df):
+            season_features = feature_df[feature_df["Year"] == year]
+            for row in season_features.to_dict("records"):
+                key = (int(row["Week"]), row["Home_Team"], row["Away_Team"])
+                self.features.setdefault(key, row)
+
+    def week_games(self, wk):
+        return self.games.get(wk, [])
+
+    def week_teams(self, wk):
+        return {team for game in self.week_games(wk) for team in game}
+
+    def game_of(self, wk, team):
+        """(game idx, opponent, is_home) of team in week wk, or None on a bye."""
+        return self.team_games.get((wk, team))
+
+    def static_features(self, wk, home, away):
+        """Copy of the feature row of a game ({} if it has none)."""
+        return dict(self.features.get((wk, home, away), {}))
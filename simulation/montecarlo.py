@@ -0,0 +1,260 @@
+import numpy as np
+from scipy.stats import norm
+
+from .records import RecordState
+from .week import Week
+
+
+class BatchMonteCarlo(object):
+    """
+    MonteCarloSeason's random-pick simulation for many seasons at once.
+
+    Game outcomes only depend on the records and MonteCarloSeason never
+    forces a pick's game, so every simulated season sees the same results:
+    they are scored once, one batched model call per model and week. The
+    seasons then only differ in their picks, which are held as arrays (a
+    uint64 bitmask of used teams, the last pick and an alive flag) and drawn
+    for all alive seasons of a week at once.
+    """
+
+    def __init__(
+        self, season, week=1, spread=None, rank=None, prior_weeks=None, end_week=18
+    ):
+        self.season = season
+        self.registry = season.registry
+        if len(self.registry) > 64:
+            raise ValueError("The batch Monte Carlo engine supports at most 64 teams")
+        self.weeks = list(range(week, end_week + 1))
+
+        # winners[week idx, team id]: the team won its game that week
+        self.winners = np.zeros((len(self.weeks), len(self.registry)), dtype=bool)
+        records = RecordState.from_records(self.registry, prior_weeks)
+        for wi, wk in enumerate(self.weeks):
+            results = Week(season.week_games(wk, week, spread, rank, records)).simulate()
+            Week.record_results(results, records)
+            for result in results:
+                self.winners[wi, self.registry.id(result["winner"])] = True
+
+    def _start(self, survivor_picks):
+        """Used-team bitmask, first and last pick ids (-1 for none) of the prior picks."""
+        picks = list(survivor_picks or [])
+        used = np.uint64(0)
+        for team in picks:
+            if team in self.registry:
+                used |= np.uint64(1) << np.uint64(self.registry.id(team))
+        first = self.registry.id(picks[0]) if picks and picks[0] in self.registry else -1
+        last = self.registry.id(picks[-1]) if picks and picks[-1] in self.registry else -1
+        return used, first, last
+
+    def _keys(self, m, rng, antithetic=False):
+        """
+        (m, n_teams) uniform priority keys; antithetic keys come as adjacent
+        (u, 1-u) row pairs.
+        """
+        if not antithetic:
+            return rng.random((m, len(self.registry)))
+        half = rng.random(((m + 1) // 2, len(self.registry)))
+        keys = np.empty((2 * len(half), len(self.registry)))
+        keys[0::2] = half
+        keys[1::2] = 1 - half
+        return keys[:m]
+
+    def run(self, n, survivor_picks=None, rng=None, antithetic=False, chunk_size=1 << 17):
+        """
+        Simulate n seasons. Returns the first pick (team id, -1 for none) and
+        the path length (prior picks included) of every season.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        start = self._start(survivor_picks)
+        first = np.empty(n, dtype=np.int16)
+        lengths = np.empty(n, dtype=np.int16)
+        for lo in range(0, n, chunk_size):
+            hi = min(lo + chunk_size, n)
+            first[lo:hi], lengths[lo:hi] = self._run_chunk(
+                start, hi - lo, rng, antithetic=antithetic
+            )
+        return first, lengths + len(survivor_picks or [])
+
+    def strata(self, survivor_picks=None):
+        """Team ids that can be the first new pick."""
+        used = set(survivor_picks or [])
+        return np.array(
+            [self.registry.id(t) for t in self.registry if t not in used],
+            dtype=np.intp,
+        )
+
+    def race(
+        self,
+        budget,
+        batch_size=1000,
+        survivor_picks=None,
+        rng=None,
+        confidence=0.95,
+        target_se=None,
+        common=True,
+        antithetic=False,
+    ):
+        """
+        Sequential stratified sampling with successive elimination. Every
+        round simulates batch_size seasons for each first pick still in the
+        race; a pick is dropped once the confidence interval of its gap to
+        the leader excludes zero. Stops when one pick is left, when every
+        remaining pick's standard error is at most target_se, or when the
+        budget of simulations is spent. Returns {team id: (mean, standard
+        error, simulations)} and the number of simulations used.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        z = norm.ppf(0.5 + confidence / 2)
+        active = self.strata(survivor_picks)
+        samples = {t: [] for t in active}
+        used = 0
+
+        while len(active):
+            size = min(batch_size, (budget - used) // len(active))
+            if antithetic:
+                size -= size % 2  # whole pairs only
+            if size < 2:
+                break
+            strata, lengths = self.run_stratified(
+                size,
+                survivor_picks,
+                rng,
+                common=common,
+                antithetic=antithetic,
+                strata=active,
+            )
+            used += lengths.size
+            for t, row in zip(strata, lengths):
+                samples[t].append(row)
+
+            pooled = {t: np.concatenate(samples[t]) for t in active}
+            stats = {t: mean_and_se(pooled[t], antithetic) for t in active}
+            leader = max(active, key=lambda t: stats[t][0])
+
+            def separated(t):
+                # Every pick still racing has been sampled in the same rounds;
+                # with common random numbers its samples pair up with the
+                # leader's, and the paired difference is far less noisy
+                if common:
+                    gap, se = mean_and_se(pooled[leader] - pooled[t], antithetic)
+                else:
+                    gap = stats[leader][0] - stats[t][0]
+                    se = np.hypot(stats[leader][1], stats[t][1])
+                return gap - z * se > 0
+
+            active = np.array(
+                [t for t in active if t == leader or not separated(t)], dtype=np.intp
+            )
+            if len(active) == 1 or (
+                target_se is not None
+                and all(stats[t][1] <= target_se for t in active)
+            ):
+                break
+
+        summary = {}
+        for t, rows in samples.items():
+            if rows:
+                lengths = np.concatenate(rows)
+                summary[t] = (*mean_and_se(lengths, antithetic), len(lengths))
+        return summary, used
+
+    def run_stratified(
+        self,
+        n_per_team,
+        survivor_picks=None,
+        rng=None,
+        common=False,
+        antithetic=False,
+        strata=None,
+        chunk_size=1 << 17,
+    ):
+        """
+        Simulate n_per_team seasons for every possible first new pick (the
+        strata, or only the given team ids). With common, every stratum replays the same random keys, so
+        a season picks the same later teams whenever they are still available
+        and differences between first picks are not blurred by sampling
+        noise. Returns the stratum team ids and a (n_strata, n_per_team)
+        array of path lengths (prior picks included).
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        start = self._start(survivor_picks)
+        if strata is None:
+            strata = self.strata(survivor_picks)
+        lengths = np.empty((len(strata), n_per_team), dtype=np.int16)
+        # Even chunks keep antithetic pairs together
+        chunk_size -= chunk_size % 2
+        for lo in range(0, n_per_team, chunk_size):
+            hi = min(lo + chunk_size, n_per_team)
+            seed = rng.integers(2**63)
+            for i, team in enumerate(strata):
+                _, lengths[i, lo:hi] = self._run_chunk(
+                    start,
+                    hi - lo,
+                    np.random.default_rng(seed) if common else rng,
+                    np.full(hi - lo, team, dtype=np.intp),
+                    antithetic,
+                    aligned=common,
+                )
+        return strata, lengths + len(survivor_picks or [])
+
+    def _run_chunk(
+        self, start, m, rng, forced_first=None, antithetic=False, aligned=False
+    ):
+        start_used, start_first, start_last = start
+        aligned = aligned or antithetic
+        bits = np.uint64(1) << np.arange(len(self.registry), dtype=np.uint64)
+        used = np.full(m, start_used, dtype=np.uint64)
+        first = np.full(m, start_first, dtype=np.int16)
+        last = np.full(m, start_last, dtype=np.intp)
+        lengths = np.zeros(m, dtype=np.int16)
+        alive = np.arange(m)
+        for wi in range(len(self.weeks)):
+            if aligned:
+                # Drawn for every season, alive or not, so that antithetic
+                # pairs and replayed generators line up
+                keys = self._keys(m, rng, antithetic)
+            if not len(alive):
+                if aligned:
+                    continue
+                break
+            if not aligned:
+                keys = self._keys(len(alive), rng)
+            available = (used[alive, None] & bits[None, :]) == 0
+            if wi == 0 and forced_first is not None:
+                pick = forced_first[alive]
+            else:
+                # The available team with the lowest key is a uniform draw
+                row_keys = keys[alive] if aligned else keys
+                pick = np.argmin(np.where(available, row_keys, np.inf), axis=1)
+                # With every team used the last pick is repeated
+                pick = np.where(available.any(axis=1), pick, last[alive])
+
+            used[alive] |= bits[pick]
+            first[alive] = np.where(first[alive] < 0, pick, first[alive])
+            last[alive] = pick
+            lengths[alive] += 1
+            alive = alive[self.winners[wi, pick]]
+        return first, lengths
+
+    def summarize(self, first, lengths):
+        """
+        {team: (average path length, standard error)} over the seasons
+        starting with team.
+        """
+        summary = {}
+        for t in np.unique(first[first >= 0]):
+            summary[self.registry.name(t)] = mean_and_se(lengths[first == t])
+        return summary
+
+
+def mean_and_se(lengths, antithetic=False):
+    """
+    Mean and standard error of path lengths. Antithetic samples are taken as
+    adjacent pairs, whose means are the independent units.
+    """
+    lengths = np.asarray(lengths, dtype=np.float64)
+    if antithetic and len(lengths) % 2 == 0:
+        lengths = lengths.reshape(-1, 2).mean(axis=1)
+    if len(lengths) < 2:
+        return lengths.mean() if len(lengths) else np.nan, np.nan
+    return lengths.mean(), lengths.std(ddof=1) / np.sqrt(len(lengths))
@@ -0,0 +1,167 @@
+import json
+import os
+
+import pandas as pd
+
+FORMATS = ("csv", "parquet", "arrow")
+EXTENSIONS = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet", ".arrow": "arrow", ".feather": "arrow"}
+# Schema metadata key of the run metadata in Parquet and Arrow files
+METADATA_KEY = b"beam_run"
+
+
+def paths_frame(paths, week, end_week, merge=False, first_week=1):
+    """
+    One row per beam path with columns week_{week}..week_{end_week} (the
+    picks, None past a path's last pick), log_prob and, for merged paths,
+    log_mass. Path picks start at first_week, prior picks included.
+    """
+    rows = []
+    for path in paths:
+        row = {f"week_{first_week + i}": t for i, t in enumerate(path["picks"])}
+        row["log_prob"] = path["p"]
+        if "log_mass" in path:
+            row["log_mass"] = path["log_mass"]
+        rows.append(row)
+    week_cols = [f"week_{wk}" for wk in range(week, end_week + 1)]
+    df = pd.DataFrame(rows).reindex(
+        columns=week_cols + ["log_prob"] + (["log_mass"] if merge else [])
+    )
+    # Weeks a path never reached are None rather than NaN
+    df[week_cols] = df[week_cols].astype(object).where(df[week_cols].notna(), None)
+    return df
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError(
+            "Parquet and Arrow output require pyarrow (pip install -r requirements.txt)"
+        )
+    return pyarrow
+
+
+def path_format(path):
+    """Output format implied by a file's extension (csv when unknown)."""
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower(), "csv")
+
+
+def week_columns(df):
+    return [c for c in df.columns if c.startswith("week_")]
+
+
+class PathWriter(object):
+    """
+    Writes paths_frame batches to one file as they come, so a run's paths
+    never have to be held at once. Parquet and Arrow (IPC file) outputs hold
+    every week_N column as a dictionary-encoded team column over one shared
+    team dictionary (teams, default: the teams of the first batch),
+    log-probs as float64, and metadata (JSON-serializable run details) in
+    the schema; every batch becomes a row group / record batch. CSV output
+    is the plain table without metadata.
+    """
+
+    def __init__(self, path, format=None, metadata=None, teams=None):
+        self.path = path
+        self.format = format or path_format(path)
+        if self.format not in FORMATS:
+            raise ValueError(f"Unknown output format: {self.format}")
+        self.metadata = metadata
+        self.teams = sorted(teams) if teams is not None else None
+        self.rows = 0
+        self._batches = 0
+        self._writer = None
+        self._sink = None
+        if self.format != "csv":
+            self._pa = _pyarrow()
+
+    def write(self, df):
+        if self.format == "csv":
+            first = self._batches == 0
+            df.to_csv(self.path, mode="w" if first else "a", header=first, index=False)
+        else:
+            table = self._table(df)
+            if self._writer is None:
+                self._open(table.schema)
+            self._writer.write_table(table)
+        self.rows += len(df)
+        self._batches += 1
+
+    def _table(self, df):
+        week_cols = week_columns(df)
+        if self.teams is None:
+            self.teams = sorted(pd.unique(df[week_cols].stack().dropna()))
+        columns = {}
+        for c in df.columns:
+            if c in week_cols:
+                unknown = df[c].notna() & ~df[c].isin(self.teams)
+                if unknown.any():
+                    raise ValueError(
+                        f"Team {df[c][unknown].iloc[0]!r} is not in the output's team dictionary"
+                    )
+                columns[c] = pd.Categorical(df[c], categories=self.teams)
+            else:
+                columns[c] = df[c].astype("float64")
+        table = self._pa.Table.from_pandas(pd.DataFrame(columns), preserve_index=False)
+        return table.replace_schema_metadata(
+            {
+                **(table.schema.metadata or {}),
+                METADATA_KEY: json.dumps(self.metadata or {}, default=str),
+            }
+        )
+
+    def _open(self, schema):
+        pa = self._pa
+        if self.format == "parquet":
+            self._writer = pa.parquet.ParquetWriter(self.path, schema)
+        else:
+            self._sink = pa.OSFile(self.path, "wb")
+            self._writer = pa.ipc.new_file(self._sink, schema)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_paths(df, path, format=None, metadata=None):
+    """Write a paths_frame in one go (see PathWriter)."""
+    with PathWriter(path, format, metadata) as writer:
+        writer.write(df)
+
+
+def read_paths(path, format=None):
+    """
+    A paths file as a DataFrame, with the run metadata (if any) in
+    df.attrs["metadata"]. Arrow files are memory-mapped and, like Parquet,
+    come back with team columns as categoricals and numeric columns without
+    copies where Arrow allows it.
+    """
+    format = format or path_format(path)
+    if format == "csv":
+        df = pd.read_csv(path)
+        df.attrs["metadata"] = {}
+        return df
+
+    pa = _pyarrow()
+    if format == "parquet":
+        table = pa.parquet.read_table(path, memory_map=True)
+    elif format == "arrow":
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+    else:
+        raise ValueError(f"Unknown output format: {format}")
+    metadata = (table.schema.metadata or {}).get(METADATA_KEY)
+    df = table.to_pandas(split_blocks=True)
+    df.attrs["metadata"] = json.loads(metadata) if metadata else {}
+    return df
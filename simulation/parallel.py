@@ -0,0 +1,345 @@
+import heapq
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from .beam import BeamState, top_k_indices
+from .cache import GameCache
+from .records import RecordState
+
+# Shards per worker: more shards than workers let exact pruning stop
+# submitting the tail of the beam once it cannot reach the top k
+SHARDS_PER_WORKER = 4
+
+# Per-process search context, inherited through fork so the models, the
+# schedule index and the probability table are never pickled per task
+_context = {}
+
+
+class _WorkerCache(GameCache):
+    """
+    A worker's game cache (the parent's may hold a database connection that
+    must not be shared across processes). It reads through to the parent's
+    entries inherited at fork, without copying them, and remembers the
+    entries it adds so they can be sent back and merged into the parent's.
+    """
+
+    def __init__(self, cache):
+        super().__init__(maxsize=getattr(cache, "maxsize", None))
+        self.inherited = getattr(cache, "_data", cache or {})
+        self.new = []
+
+    def get(self, key, default=None):
+        if key not in self._data and key in self.inherited:
+            self.hits += 1
+            return self.inherited[key]
+        return super().get(key, default)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.new.append((key, value))
+
+    def drain(self):
+        new, self.new = self.new, []
+        return new
+
+
+class _SharedArrays(object):
+    """
+    One week's beam arrays copied once into shared memory. Tasks carry only
+    spec (block names, shapes and dtypes) and the rows of their shard.
+    """
+
+    def __init__(self, **arrays):
+        self.blocks = []
+        self.spec = {}
+        for key, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+            self.blocks.append(block)
+            self.spec[key] = (block.name, array.shape, array.dtype.str)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+
+
+def _shared(spec):
+    """The arrays of a _SharedArrays spec, attached once per published beam."""
+    if _context.get("spec") != spec:
+        # The views must go before the blocks they map are closed
+        _context.pop("arrays", None)
+        for block in _context.pop("blocks", []):
+            block.close()
+        blocks = {
+            key: shared_memory.SharedMemory(name=name) for key, (name, _, _) in spec.items()
+        }
+        _context.update(
+            spec=spec,
+            blocks=list(blocks.values()),
+            arrays={
+                key: np.ndarray(shape, dtype, buffer=blocks[key].buf)
+                for key, (_, shape, dtype) in spec.items()
+            },
+        )
+    return _context["arrays"]
+
+
+def _init_worker(season, table, spread, rank, beam):
+    season.external_game_cache = _WorkerCache(season.external_game_cache)
+    _context.update(season=season, table=table, spread=spread, rank=rank, beam=beam)
+
+
+def _expand_shard(wk, week, spec, first, stop, eligible, k, threshold, week_best):
+    """
+    Expand the parents first..stop of the published beam (used team
+    bitmasks, log-probs and records) and keep the shard's k best children at
+    or above threshold (the k-th best child of the beam seen so far), best
+    first, as arrays of log-probs, parent indices and records plus a list of
+    teams. With week_best (exact pruning), the parents whose best child
+    misses the top k are not expanded. Also returns the shard's search stats
+    and the game cache entries it added.
+    """
+    season = _context["season"]
+    beam = _shared(spec)
+    spread = _context["spread"] if wk == week else None
+    eligible = sorted(eligible)
+    bits = [1 << season.registry.id(team) for team in eligible]
+
+    def open_teams(used):
+        return [team for team, bit in zip(eligible, bits) if not int(used) & bit]
+
+    stats = {"candidates": 0, "skipped": 0}
+    parents, teams, records, logps = [], [], [], []
+    top = []  # min-heap of the shard's k best child log-probs
+    for i in range(first, stop):
+        p = beam["logp"][i]
+        kth = max(threshold, top[0]) if len(top) == k > 0 else threshold
+        if week_best is not None and p + week_best < kth:
+            stats["skipped"] += sum(
+                len(open_teams(used)) for used in beam["used"][i:stop]
+            )
+            break
+        probs, winners, base = season.week_outcome(
+            wk,
+            RecordState(season.registry, beam["records"][i]),
+            spread,
+            _context["rank"],
+            _context["table"],
+        )
+        available = open_teams(beam["used"][i])
+        stats["candidates"] += len(available)
+        # Below the k-th best child seen so far: never selected, so the
+        # records of the child are not built
+        available = [
+            team
+            for team in available
+            if p + np.log(season.pick_prob(wk, team, probs)) >= kth
+        ]
+        for team, prob, child in season.pick_children(
+            wk, available, probs, winners, base
+        ):
+            logp = p + np.log(prob)
+            parents.append(i)
+            teams.append(team)
+            records.append(child.data)
+            logps.append(logp)
+            if k > 0:
+                if len(top) < k:
+                    heapq.heappush(top, logp)
+                else:
+                    heapq.heappushpop(top, logp)
+    best = top_k_indices(logps, k)
+    n_teams = len(season.registry)
+    return (
+        (
+            np.array(logps, dtype=np.float64)[best],
+            np.array(parents, dtype=np.intp)[best],
+            [teams[c] for c in best],
+            np.array(records, dtype=np.int16).reshape(len(logps), n_teams, 3)[best],
+        ),
+        stats,
+        season.external_game_cache.drain(),
+    )
+
+
+def _expand_state_shard(wk, spec, first, stop, k):
+    """
+    VectorizedBeam.expand of the rows first..stop of the published
+    BeamState, keeping its k best candidates as (parent idx, team idx, step)
+    arrays.
+    """
+    beam, state = _context["beam"], _shared(spec)
+    logp = state["logp"][first:stop]
+    shard = BeamState(state["used"][first:stop], None, logp, state["wins"][first:stop])
+    _, parent, team_idx, step = beam.expand(shard, wk)
+    keep = top_k_indices(logp[parent] + step, k)
+    stats = {"candidates": len(step), "skipped": 0}
+    return first + parent[keep], team_idx[keep], step[keep], stats
+
+
+class ParallelExpander(object):
+    """
+    Expands the beam across a fork-based process pool. Every week the beam's
+    arrays are published once in shared memory and each worker expands a
+    contiguous shard of the parents, returning only the shard's k best
+    children; the parent merges them in candidate order, so the beam (and
+    its tie-breaking) is exactly the serial engine's. Game results the
+    workers score are merged back into the parent's cache.
+    """
+
+    def __init__(self, season, table, spread, rank, workers, beam=None):
+        self.season = season
+        self.workers = workers
+        # Workers must share the parent's tracker, or each would unlink the
+        # shared blocks it attached to when it exits
+        resource_tracker.ensure_running()
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(season, table, spread, rank, beam),
+        )
+
+    def shard_size(self, n):
+        return max(1, -(-n // (self.workers * SHARDS_PER_WORKER)))
+
+    def merge_cache(self, entries):
+        cache = self.season.external_game_cache
+        if cache is not None:
+            for key, value in entries:
+                cache[key] = value
+
+    def best_children(self, wk, week, beam_paths, eligible, k, week_best=None):
+        """
+        The k best children of week wk of the beam's path dicts, best first,
+        as (logp, parent path, team, records), and the search stats of the
+        week. Shards are submitted lazily, at most one in flight per worker:
+        with week_best (exact pruning) the rest of the beam is skipped once
+        its first parent's best child cannot reach the k best so far.
+        """
+        stats = {"candidates": 0, "skipped": 0}
+        results = []
+        threshold = -np.inf  # k-th best child log-prob returned so far
+        pending = deque()
+        registry = self.season.registry
+
+        def collect():
+            nonlocal threshold
+            best, shard_stats, entries = pending.popleft().result()
+            results.append(best)
+            for key, value in shard_stats.items():
+                stats[key] += value
+            self.merge_cache(entries)
+            logps = np.concatenate([r[0] for r in results])
+            if k > 0 and len(logps) >= k:
+                threshold = -np.partition(-logps, k - 1)[k - 1]
+
+        arrays = {
+            "used": np.array(
+                [
+                    sum(1 << registry.id(t) for t in set(path["picks"]) if t in registry)
+                    for path in beam_paths
+                ],
+                dtype=np.uint64,
+            ),
+            "logp": np.array([path["p"] for path in beam_paths], dtype=np.float64),
+            "records": np.array(
+                [path["prior_weeks"].data for path in beam_paths], dtype=np.int16
+            ).reshape(len(beam_paths), len(registry), 3),
+        }
+        size = self.shard_size(len(beam_paths))
+        with _SharedArrays(**arrays) as shared:
+            for first in range(0, len(beam_paths), size):
+                while len(pending) >= self.workers:
+                    collect()
+                if week_best is not None and beam_paths[first]["p"] + week_best < threshold:
+                    stats["skipped"] += sum(
+                        len(eligible - set(p["picks"])) for p in beam_paths[first:]
+                    )
+                    break
+                pending.append(
+                    self.executor.submit(
+                        _expand_shard,
+                        wk,
+                        week,
+                        shared.spec,
+                        first,
+                        min(first + size, len(beam_paths)),
+                        eligible,
+                        k,
+                        threshold,
+                        week_best,
+                    )
+                )
+            while pending:
+                collect()
+
+        if not results:
+            return [], stats
+        logps, parents, teams, records = [
+            np.concatenate([r[0] for r in results]),
+            np.concatenate([r[1] for r in results]),
+            [team for r in results for team in r[2]],
+            np.concatenate([r[3] for r in results]),
+        ]
+        # Every shard is best first with ties in candidate order and shards
+        # hold increasing parents, so ties fall back to the serial order
+        position = np.concatenate([np.arange(len(r[0])) for r in results])
+        order = np.lexsort((position, parents, -logps))[:k]
+        return [
+            (logps[c], beam_paths[parents[c]], teams[c], RecordState(registry, records[c]))
+            for c in order
+        ], stats
+
+    def best_candidates(self, state, wk, k):
+        """
+        VectorizedBeam's k best candidates of week wk of a BeamState as
+        (parent idx, team idx, step) arrays in selection order, and the
+        search stats of the week.
+        """
+        size = -(-len(state) // self.workers)
+        with _SharedArrays(used=state.used, logp=state.logp, wins=state.wins) as shared:
+            futures = [
+                self.executor.submit(
+                    _expand_state_shard,
+                    wk,
+                    shared.spec,
+                    first,
+                    min(first + size, len(state)),
+                    k,
+                )
+                for first in range(0, len(state), size)
+            ]
+            results = [future.result() for future in futures]
+        stats = {"candidates": 0, "skipped": 0}
+        parents = [np.zeros(0, dtype=np.intp)]
+        team_idxs = [np.zeros(0, dtype=np.intp)]
+        steps = [np.zeros(0)]
+        for parent, team_idx, step, shard_stats in results:
+            parents.append(parent)
+            team_idxs.append(team_idx)
+            steps.append(step)
+            for key, value in shard_stats.items():
+                stats[key] += value
+        parent, team_idx, step = map(np.concatenate, (parents, team_idxs, steps))
+        # Ties in candidate order: by parent, then team
+        order = np.lexsort((team_idx, parent, -(state.logp[parent] + step)))[:k]
+        return parent[order], team_idx[order], step[order], stats
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,114 @@
+from collections.abc import Mapping
+import sys
+
+import numpy as np
+
+WINS, LOSSES, GAMES_PLAYED = 0, 1, 2
+
+
+class TeamRegistry(object):
+    """Maps (interned) team names to stable integer ids, sorted by name."""
+
+    def __init__(self, teams):
+        self.names = tuple(sorted(sys.intern(str(t)) for t in set(teams)))
+        self.ids = {name: i for i, name in enumerate(self.names)}
+
+    def id(self, team):
+        return self.ids[team]
+
+    def name(self, team_id):
+        return self.names[team_id]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __contains__(self, team):
+        return team in self.ids
+
+
+class RecordState(Mapping):
+    """
+    Wins/losses/games played of every registered team as one (n_teams, 3)
+    int16 array. Reads like the {team: {"wins", "losses", "games_played"}}
+    dicts it replaces, but copies and updates are array operations.
+    """
+
+    __slots__ = ("registry", "data")
+
+    def __init__(self, registry, data=None):
+        self.registry = registry
+        if data is None:
+            data = np.zeros((len(registry), 3), dtype=np.int16)
+        self.data = data
+
+    @classmethod
+    def from_records(cls, registry, records=None):
+        """Build from a RecordState or a {team: record dict} mapping (copied)."""
+        if isinstance(records, RecordState):
+            return records.copy()
+        state = cls(registry)
+        for team, rec in (records or {}).items():
+            state.data[registry.id(team)] = (
+                rec["wins"],
+                rec["losses"],
+                rec["games_played"],
+            )
+        return state
+
+    def copy(self):
+        return RecordState(self.registry, self.data.copy())
+
+    def record(self, team):
+        """(wins, losses, games_played) of a team as Python ints."""
+        return tuple(self.data[self.registry.id(team)].tolist())
+
+    def wins(self, team):
+        return int(self.data[self.registry.id(team), WINS])
+
+    def add_result(self, winner, loser):
+        w, l = self.registry.id(winner), self.registry.id(loser)
+        self.data[w, WINS] += 1
+        self.data[l, LOSSES] += 1
+        self.data[w, GAMES_PLAYED] += 1
+        self.data[l, GAMES_PLAYED] += 1
+
+    def reverse_result(self, winner, loser):
+        """Turn a recorded win of loser over winner into a win of winner."""
+        w, l = self.registry.id(winner), self.registry.id(loser)
+        self.data[w, WINS] += 1
+        self.data[w, LOSSES] -= 1
+        self.data[l, WINS] -= 1
+        self.data[l, LOSSES] += 1
+
+    def to_dict(self):
+        return {team: self[team] for team in self}
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def __getitem__(self, team):
+        wins, losses, games_played = self.record(team)
+        return {"wins": wins, "losses": losses, "games_played": games_played}
+
+    def __iter__(self):
+        return iter(self.registry)
+
+    def __len__(self):
+        return len(self.registry)
+
+    def __eq__(self, other):
+        if isinstance(other, RecordState):
+            return self.registry.names == other.registry.names and np.array_equal(
+                self.data, other.data
+            )
+        return Mapping.__eq__(self, other)
+
+    __hash__ = None
+
+    def key(self):
+        """Hashable snapshot of the records."""
+        return self.data.tobytes()
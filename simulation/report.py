@@ -0,0 +1,145 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from .beam import group_logsumexp
+from .output import read_paths, week_columns
+
+
+def source_names(files):
+    """
+    Source name of every file: its name without extension, prefixed with
+    its parent directory where names collide, and numbered where they still
+    do (the same file given twice).
+    """
+    names = [os.path.splitext(os.path.basename(path))[0] for path in files]
+    counts = pd.Series(names).value_counts()
+    names = [
+        os.path.join(os.path.basename(os.path.dirname(os.path.abspath(path))), name)
+        if counts[name] > 1
+        else name
+        for path, name in zip(files, names)
+    ]
+    counts, seen = pd.Series(names).value_counts(), {}
+    for i, name in enumerate(names):
+        if counts[name] > 1:
+            seen[name] = seen.get(name, 0) + 1
+            names[i] = f"{name}#{seen[name]}"
+    return names
+
+
+def load_paths(files):
+    """
+    The paths of many result files (any format read_paths knows) in one
+    frame, with each file's source name (see source_names) in a source
+    column.
+    """
+    frames = []
+    for path, source in zip(files, source_names(files)):
+        df = read_paths(path)
+        df.insert(0, "source", source)
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _sources(df):
+    return df["source"] if "source" in df else pd.Series("", index=df.index)
+
+
+def path_weights(df):
+    """
+    Log-probability each path row stands for: log_mass for merged paths
+    (the probability of every path merged into the row), else log_prob.
+    """
+    if "log_mass" in df:
+        return df["log_mass"].fillna(df["log_prob"]).to_numpy(dtype=np.float64)
+    return df["log_prob"].to_numpy(dtype=np.float64)
+
+
+def pick_codes(df, week_cols):
+    """
+    (n_paths, n_weeks) team codes of the picks in week_cols (-1 for no
+    pick) and the team names the codes index. Week columns sharing one
+    categorical dictionary (columnar outputs) are used as they are;
+    anything else is factorized once per column.
+    """
+    dtypes = [df[c].dtype for c in week_cols]
+    if week_cols and all(isinstance(d, pd.CategoricalDtype) for d in dtypes):
+        teams = dtypes[0].categories
+        if all(d.categories.equals(teams) for d in dtypes):
+            codes = np.column_stack([df[c].cat.codes.to_numpy() for c in week_cols])
+            return codes.astype(np.intp), np.asarray(teams, dtype=object)
+    columns = [pd.factorize(df[c]) for c in week_cols]
+    teams = pd.unique(np.concatenate([np.asarray(u, dtype=object) for _, u in columns]))
+    position = {team: i for i, team in enumerate(teams)}
+    codes = np.full((len(df), len(week_cols)), -1, dtype=np.intp)
+    for wi, (col_codes, uniques) in enumerate(columns):
+        # One lookup per distinct team of the column, not per path
+        lookup = np.array([position[t] for t in uniques] + [-1], dtype=np.intp)
+        codes[:, wi] = lookup[col_codes]
+    return codes, np.asarray(teams, dtype=object)
+
+
+def melt_paths(df):
+    """
+    The picks of every path as a long (path, week, team) table with the
+    path's source and log weight (see path_weights); weeks without a pick
+    are left out.
+    """
+    week_cols = week_columns(df)
+    codes, teams = pick_codes(df, week_cols)
+    path, wi = np.nonzero(codes >= 0)
+    source_codes, source_names = pd.factorize(_sources(df))
+    weeks = np.array([int(c.split("_", 1)[1]) for c in week_cols])
+    return pd.DataFrame(
+        {
+            "path": path,
+            "source": pd.Categorical.from_codes(source_codes[path], source_names),
+            "week": weeks[wi],
+            "team": pd.Categorical.from_codes(codes[path, wi], categories=teams),
+            "log_weight": path_weights(df)[path],
+        }
+    )
+
+
+def pick_shares(df):
+    """
+    Probability share of every (source, week, team) pick: the log-sum-exp
+    of the weights of the paths making that pick, against the log-sum-exp
+    of all paths of the source, in one grouped pass. Returns source, week,
+    team, log_prob (the pick's summed log-probability) and share.
+    """
+    long = melt_paths(df)
+    source_codes, source_names = pd.factorize(_sources(df))
+
+    # Totals over every path of a source, including paths with no pick
+    totals = group_logsumexp(path_weights(df), source_codes, len(source_names))
+
+    long_source = source_codes[long["path"].to_numpy()]
+    team_codes = long["team"].cat.codes.to_numpy()
+    n_teams = len(long["team"].cat.categories)
+    weeks = long["week"].to_numpy()
+    n_weeks = weeks.max() + 1 if len(weeks) else 1
+    key = (long_source * n_weeks + weeks) * n_teams + team_codes
+    groups, first, inverse = np.unique(key, return_index=True, return_inverse=True)
+    log_prob = group_logsumexp(long["log_weight"].to_numpy(), inverse.ravel(), len(groups))
+
+    group_source = long_source[first]
+    shares = pd.DataFrame(
+        {
+            "source": np.asarray(source_names, dtype=object)[group_source],
+            "week": weeks[first],
+            "team": long["team"].to_numpy()[first],
+            "log_prob": log_prob,
+            "share": np.exp(log_prob - totals[group_source]),
+        }
+    )
+    return shares.sort_values(
+        ["source", "week", "share"], ascending=[True, True, False], ignore_index=True
+    )
+
+
+def most_probable_paths(df):
+    """The highest log_prob path of every source."""
+    return df.loc[df.groupby(_sources(df).to_numpy(), sort=False)["log_prob"].idxmax()]
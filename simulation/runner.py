@@ -0,0 +1,271 @@
+import itertools
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import cloudpickle as pickle
+
+from .cache import DEFAULT_CACHE_SIZE, GameCache
+from .compiled import compile_models
+from .data import SeasonData
+from .greedy import run_greedy_beam_path
+from .output import PathWriter, path_format, paths_frame
+from .season import BeamExploreSeason
+
+BEAM_OUTPUT = "./results/beam_{year}_wk-{week}_k{k}.csv"
+GREEDY_OUTPUT = "./results/greedy_path_{year}_k{k}.json"
+
+# Per-process models, season data and game caches, loaded on a worker's
+# first job that needs them and reused by all its later jobs
+_loaded = {"models": {}, "data": {}, "caches": {}}
+
+
+def parse_values(text):
+    """Comma-separated integers and inclusive ranges, e.g. '2013-2016,2019'."""
+    values = []
+    for part in text.split(","):
+        lo, _, hi = part.partition("-")
+        values.extend(range(int(lo), int(hi or lo) + 1))
+    return values
+
+
+def job_grid(years, weeks=(1,), ks=(10000,), models=("lr",), kind="beam", output=None):
+    """
+    Every (year, start week, k, model) combination as a job dict. output is
+    a pattern over {year}, {week}, {k} and {model}; greedy jobs cover a
+    whole season and ignore weeks.
+    """
+    if kind not in ("beam", "greedy"):
+        raise ValueError(f"Unknown job kind: {kind}")
+    if output is None:
+        output = BEAM_OUTPUT if kind == "beam" else GREEDY_OUTPUT
+    if kind == "greedy":
+        weeks = (1,)
+    jobs = []
+    for model in models:
+        for year in years:
+            for week in weeks:
+                for k in ks:
+                    job = {"kind": kind, "year": year, "week": week, "k": k, "model": model}
+                    job["output"] = output.format(**job)
+                    jobs.append(job)
+    outputs = [job["output"] for job in jobs]
+    if len(set(outputs)) < len(outputs):
+        raise ValueError(
+            f"Output pattern {output!r} maps several jobs to the same file"
+        )
+    return jobs
+
+
+class Manifest(object):
+    """
+    JSON record of every job's status (pending, running, done or failed),
+    start and finish times, duration and error, keyed by output path. It is
+    rewritten atomically on every change, so an interrupted run leaves a
+    readable manifest behind.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.jobs = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.jobs = json.load(f)
+
+    def status(self, key):
+        return self.jobs.get(key, {}).get("status")
+
+    def update(self, key, **fields):
+        self.jobs.setdefault(key, {}).update(fields)
+        self.save()
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.jobs, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def counts(self, keys=None):
+        """Number of jobs (of keys, default all) per status."""
+        counts = {}
+        for key in self.jobs if keys is None else keys:
+            status = self.jobs[key]["status"]
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _models(name, options):
+    if name not in _loaded["models"]:
+        model_dir = options.get("model_dir", "./models")
+        models = {}
+        for key, suffix in [("full", "full"), ("no_spread", "no_spread")]:
+            with open(os.path.join(model_dir, f"{name}_{suffix}.pkl"), "rb") as f:
+                models[key] = pickle.load(f)
+        if not options.get("no_compile"):
+            models = compile_models(models)
+        _loaded["models"][name] = models
+        # Cached probabilities are only valid for the models that produced them
+        _loaded["caches"][name] = GameCache(
+            maxsize=options.get("cache_size", DEFAULT_CACHE_SIZE)
+        )
+    return _loaded["models"][name], _loaded["caches"][name]
+
+
+def _season_data(year, options):
+    key = (year, options.get("db", "./data/data.db"))
+    if key not in _loaded["data"]:
+        _loaded["data"][key] = SeasonData(year, key[1])
+    return _loaded["data"][key]
+
+
+def run_job(job, options):
+    """
+    Run one job and write its output, through a temporary file so that an
+    output only exists once it is complete.
+    """
+    models, game_cache = _models(job["model"], options)
+    data = _season_data(job["year"], options)
+    engine = options.get("engine", "table")
+
+    if job["kind"] == "greedy":
+        path = run_greedy_beam_path(
+            job["year"],
+            models,
+            data,
+            k=job["k"],
+            game_cache=game_cache,
+            engine=engine,
+            merge=options.get("merge", False),
+            prune=options.get("prune"),
+            warm_start=options.get("warm_start", False),
+        )
+
+        def write(tmp):
+            with open(tmp, "w") as f:
+                f.write(json.dumps(path))
+
+    else:
+        spread_df, rank_df, prior_weeks = data.week(job["week"])
+        end_week = options.get("end_week") or data.max_week
+        schedule_df = data.schedule()
+        season = BeamExploreSeason(
+            job["year"],
+            models,
+            schedule_df[["Year", "Week", "Home_Team", "Away_Team"]],
+            schedule_df.copy(),
+            game_cache=game_cache,
+        )
+        batches = season.resolve(
+            week=job["week"],
+            spread=spread_df,
+            rank=rank_df,
+            prior_weeks=prior_weeks,
+            end_week=end_week,
+            k=job["k"],
+            n=1,
+            engine=engine,
+            merge=options.get("merge", False),
+            prune=options.get("prune"),
+            batch_size=options.get("batch_size", 10000),
+        )
+        metadata = {**job, **options, "end_week": end_week}
+
+        def write(tmp):
+            with PathWriter(
+                tmp, path_format(job["output"]), metadata, teams=season.registry.names
+            ) as writer:
+                # An empty search still writes the header
+                for batch in itertools.chain([next(batches, [])], batches):
+                    # A backtest enters the pool at its start week, without
+                    # prior picks
+                    writer.write(
+                        paths_frame(
+                            batch,
+                            job["week"],
+                            end_week,
+                            merge=options.get("merge", False),
+                            first_week=job["week"],
+                        )
+                    )
+
+    directory = os.path.dirname(job["output"])
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = job["output"] + ".tmp"
+    write(tmp)
+    os.replace(tmp, job["output"])
+
+
+def _timed(execute, job, options):
+    started = _now()
+    start = time.perf_counter()
+    execute(job, options)
+    return started, time.perf_counter() - start
+
+
+def run_backtest(
+    jobs, manifest, workers=None, options=None, force=False, execute=run_job, log=print
+):
+    """
+    Run jobs on a pool of workers processes (default: one per CPU),
+    recording their progress in manifest. Jobs whose output already exists
+    are skipped unless force, so re-running an interrupted sweep only runs
+    what is missing; a failed job is recorded and does not stop the others.
+    Returns the status counts of jobs.
+    """
+    options = options or {}
+    workers = workers or os.cpu_count() or 1
+    todo = []
+    for job in jobs:
+        key = job["output"]
+        if not force and os.path.exists(key):
+            if manifest.status(key) != "done":
+                manifest.update(key, **job, status="done")
+            continue
+        manifest.update(key, **job, status="pending", error=None)
+        todo.append(job)
+    log(f"{len(jobs) - len(todo)} of {len(jobs)} jobs already done, running {len(todo)}")
+
+    def finish(job, result=None, error=None):
+        fields = {"status": "failed" if error else "done", "finished": _now(), "error": error}
+        if result is not None:
+            fields["started"], fields["seconds"] = result
+        manifest.update(job["output"], **fields)
+        log(
+            f"[{fields['status']}] {job['output']}"
+            + (f" ({fields['seconds']:.1f}s)" if result else "")
+        )
+
+    if workers == 1:
+        for job in todo:
+            manifest.update(job["output"], status="running")
+            try:
+                finish(job, _timed(execute, job, options))
+            except Exception:
+                finish(job, error=traceback.format_exc())
+        return manifest.counts([job["output"] for job in jobs])
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_timed, execute, job, options): job for job in todo}
+        # Only this process writes the manifest, so queued jobs are marked
+        # running up front; their start times come back with the results
+        for job in todo:
+            manifest.jobs[job["output"]]["status"] = "running"
+        manifest.save()
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                finish(job, future.result())
+            except Exception:
+                finish(job, error=traceback.format_exc())
+    return manifest.counts([job["output"] for job in jobs])
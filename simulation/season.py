@@ -1,9 +1,18 @@
 from .week import Week
 from .game import Game, CacheEnabledGame
+from .cache import GameCache
+from .table import ProbabilityTable
+from .index import SeasonIndex
+from .records import RecordState, TeamRegistry
+from .beam import BeamState, PathBounds, VectorizedBeam, top_k_indices
+from .assignment import ranked_assignments
+from .montecarlo import BatchMonteCarlo, mean_and_se
+from .parallel import ParallelExpander
+from .checkpoint import Checkpoint, cache_counters, restore_cache_counters
 import numpy as np
-import copy
 import pandas as pd
 from collections import defaultdict
+import heapq
 import sys
 
 
@@ -17,15 +26,36 @@ else:
     from tqdm import tqdm
 
 
+def stream_paths(beams, batch_size=None):
+    """
+    The paths of beams (iterables of path dicts) without their prior_weeks
+    records, one at a time or, with batch_size, in lists of up to
+    batch_size paths.
+    """
+    batch = []
+    for beam in beams:
+        for path in beam:
+            path = {key: value for key, value in path.items() if key != "prior_weeks"}
+            if batch_size is None:
+                yield path
+                continue
+            batch.append(path)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
 class Season(object):
     def __init__(self, year, models, schedule_df, feature_df):
         self.year = year
         self.models = models  # dict: {'full': model, 'no_spread': model}
         self.schedule_df = schedule_df.copy()
         self.feature_df = feature_df.copy()
-        self.team_records = (
-            {}
-        )  # {team: {'wins': int, 'losses': int, 'games_played': int}}
+        self.index = SeasonIndex(year, self.schedule_df, self.feature_df)
+        self.registry = TeamRegistry(self.index.teams)
+        self.team_records = RecordState(self.registry)
         self.weeks = []
 
     def pick_team(self, available_teams, picks) -> str:
@@ -37,6 +67,57 @@ class Season(object):
     def end_of_week_checkin(self, pick, pick_won: bool) -> bool:
         return not pick_won
 
+    def static_game_features(self, wk, home, away, week, spread=None, rank=None):
+        """
+        Features of the wk game between home and away that do not depend on
+        the simulated records, for a simulation that started at week.
+        """
+        features = self.index.static_features(wk, home, away)
+
+        # Use dict lookups for spread and rank
+        if spread is not None and wk == week:
+            features["Spread"] = spread.get((home, away))
+
+        if rank is not None:
+            features["Home_Rank"] = rank.get(home)
+            features["Away_Rank"] = rank.get(away)
+            features["Rank_Age"] = wk - week
+
+        return features
+
+    def table_game_features(self, wk, home, away, week, spread=None, rank=None):
+        """Static features used when precomputing a ProbabilityTable."""
+        return self.static_game_features(wk, home, away, week, spread, rank)
+
+    def week_games(self, wk, week, spread, rank, records):
+        """
+        CacheEnabledGame objects of week wk with record features taken from
+        records, for a simulation that started at week.
+        """
+        week_games = []
+        for home, away in self.index.week_games(wk):
+            features = self.static_game_features(wk, home, away, week, spread, rank)
+
+            for prefix, team in [("Home", home), ("Away", away)]:
+                wins, losses, games_played = records.record(team)
+                features[f"{prefix}_Games_Played"] = games_played
+                features[f"{prefix}_Wins"] = wins
+                features[f"{prefix}_Losses"] = losses
+
+            game = CacheEnabledGame(
+                features,
+                home,
+                away,
+                self.models,
+                external_game_cache=(
+                    getattr(self, "external_game_cache")
+                    if hasattr(self, "external_game_cache")
+                    else None
+                ),
+            )
+            week_games.append(game)
+        return week_games
+
     def simulate(
         self,
         week=1,
@@ -46,69 +127,19 @@ class Season(object):
         end_week=18,
         survivor_picks=None,
     ):
-        self.team_records = {}
+        self.team_records = RecordState.from_records(self.registry, prior_weeks)
         self.weeks = []
         results = {}
 
-        if prior_weeks:
-            self.team_records = {
-                team: record.copy() for team, record in prior_weeks.items()
-            }
-
-        all_teams = set(self.schedule_df["Home_Team"]).union(
-            set(self.schedule_df["Away_Team"])
-        )
-        available_teams = set(all_teams)
+        available_teams = set(self.index.teams)
         picks = [] if survivor_picks is None else list(survivor_picks)
         if picks:
             available_teams = available_teams - set(picks)
 
         for wk in range(week, end_week + 1):
-            week_games = []
-            week_schedule = self.schedule_df[self.schedule_df["Week"] == wk]
-            for _, row in week_schedule.iterrows():
-                features = self.feature_df[
-                    (self.feature_df["Year"] == self.year)
-                    & (self.feature_df["Week"] == wk)
-                    & (self.feature_df["Home_Team"] == row["Home_Team"])
-                    & (self.feature_df["Away_Team"] == row["Away_Team"])
-                ]
-                features = features.iloc[0].to_dict() if not features.empty else {}
-
-                # Use dict lookups for spread and rank
-                if spread is not None and wk == week:
-                    features["Spread"] = spread.get(
-                        (row["Home_Team"], row["Away_Team"])
-                    )
-
-                if rank is not None:
-                    features["Home_Rank"] = rank.get(row["Home_Team"])
-                    features["Away_Rank"] = rank.get(row["Away_Team"])
-                    features["Rank_Age"] = wk - week
-
-                for prefix, team in [
-                    ("Home", row["Home_Team"]),
-                    ("Away", row["Away_Team"]),
-                ]:
-                    rec = self.team_records.get(
-                        team, {"wins": 0, "losses": 0, "games_played": 0}
-                    )
-                    features[f"{prefix}_Games_Played"] = rec["games_played"]
-                    features[f"{prefix}_Wins"] = rec["wins"]
-                    features[f"{prefix}_Losses"] = rec["losses"]
-
-                game = CacheEnabledGame(
-                    features,
-                    row["Home_Team"],
-                    row["Away_Team"],
-                    self.models,
-                    external_game_cache=(
-                        getattr(self, "external_game_cache")
-                        if hasattr(self, "external_game_cache")
-                        else None
-                    ),
-                )
-                week_games.append(game)
+            week_games = self.week_games(
+                wk, week, spread, rank, self.team_records
+            )
 
             week_obj = Week(week_games)
             self.weeks.append(week_obj)
@@ -119,33 +150,39 @@ class Season(object):
             picks.append(pick)
             available_teams.discard(pick)
 
-            pick_won = False
-            for game_result in week_result:
-                winner = game_result["winner"]
-                home, away = game_result["home_team"], game_result["away_team"]
-                loser = away if winner == home else home
-                if self.flip_winner_loser() and pick in [home, away] and pick != winner:
-                    loser, winner = winner, pick
-
-                for team in [home, away]:
-                    if team not in self.team_records:
-                        self.team_records[team] = {
-                            "wins": 0,
-                            "losses": 0,
-                            "games_played": 0,
-                        }
-                    self.team_records[team]["games_played"] += 1
-
-                self.team_records[winner]["wins"] += 1
-                self.team_records[loser]["losses"] += 1
-                if winner == pick:
-                    pick_won = True
+            pick_won = week_obj.record_results(
+                week_result, self.team_records, pick, self.flip_winner_loser()
+            )
 
             if self.end_of_week_checkin(pick, pick_won):
                 break
 
         return {"results": results, "picks": picks}
 
+    def _filter_teams_by_rank(self, all_teams, wk, rank_dict):
+        """
+        Eliminate any team who is playing against a team with at least 10 higher rank.
+        Returns a set of eligible teams.
+        """
+        if not rank_dict:
+            return all_teams
+
+        filtered_teams = set()
+        for t in all_teams:
+            game = self.index.game_of(wk, t)
+            if game is None:
+                continue
+            _, opponent, _ = game
+
+            t_rank = rank_dict.get(t)
+            opp_rank = rank_dict.get(opponent)
+
+            if t_rank is not None and opp_rank is not None and (t_rank > opp_rank + 10):
+                continue
+            filtered_teams.add(t)
+
+        return filtered_teams
+
     def resolve(**kwargs):
         raise NotImplementedError()
 
@@ -173,6 +210,7 @@ class MonteCarloSeason(Season):
         **kwargs,
     ):
         n = kwargs["n"]
+        engine = kwargs.get("engine", "loop")
 
         rank_dict = rank.set_index("Team")["Rank"].to_dict() if rank is not None else {}
         spread_dict = (
@@ -181,6 +219,79 @@ class MonteCarloSeason(Season):
             else {}
         )
 
+        # "vectorized" simulates all n seasons at once with a seeded Generator.
+        # Its variance reduction options: stratify splits n evenly across the
+        # first new picks (reported as Team even after prior survivor picks),
+        # crn reuses the same random numbers in every stratum and antithetic
+        # draws (u, 1 - u) pairs
+        stratify = kwargs.get("stratify", False)
+        crn = kwargs.get("crn", False)
+        antithetic = kwargs.get("antithetic", False)
+        if engine == "vectorized":
+            if crn and not (stratify or kwargs.get("adaptive", False)):
+                raise ValueError("Common random numbers require stratified sampling")
+            batch = BatchMonteCarlo(
+                self, week, spread_dict, rank_dict, prior_weeks, end_week
+            )
+            rng = np.random.default_rng(kwargs.get("seed"))
+            # Sequential mode: n is the maximum budget, spent in rounds of
+            # batch_size seasons per first pick until the leader separates
+            if kwargs.get("adaptive", False):
+                summary, used = batch.race(
+                    n,
+                    kwargs.get("batch_size", 1000),
+                    survivor_picks,
+                    rng,
+                    confidence=kwargs.get("confidence", 0.95),
+                    target_se=kwargs.get("target_se"),
+                    common=crn,
+                    antithetic=antithetic,
+                )
+                df = pd.DataFrame(
+                    {
+                        "Team": [self.registry.name(t) for t in summary],
+                        "Average_Path_Length": [s[0] for s in summary.values()],
+                        "Standard_Error": [s[1] for s in summary.values()],
+                        "Simulations": [s[2] for s in summary.values()],
+                    }
+                )
+                df = df.sort_values(
+                    by="Average_Path_Length", ascending=False
+                ).reset_index(drop=True)
+                df.attrs["simulations"] = used
+                return df
+            if stratify:
+                strata, lengths = batch.run_stratified(
+                    max(1, n // (len(self.registry) - len(survivor_picks or []))),
+                    survivor_picks,
+                    rng,
+                    common=crn,
+                    antithetic=antithetic,
+                )
+                summary = {
+                    self.registry.name(t): mean_and_se(row, antithetic)
+                    for t, row in zip(strata, lengths)
+                }
+            else:
+                first, lengths = batch.run(n, survivor_picks, rng, antithetic)
+                summary = batch.summarize(first, lengths)
+            df = pd.DataFrame(
+                {
+                    "Team": list(summary),
+                    "Average_Path_Length": [m for m, _ in summary.values()],
+                    "Standard_Error": [se for _, se in summary.values()],
+                }
+            )
+            return df.sort_values(
+                by="Average_Path_Length", ascending=False
+            ).reset_index(drop=True)
+        elif engine != "loop":
+            raise ValueError(f"Unknown Monte Carlo engine: {engine}")
+        elif stratify or crn or antithetic or kwargs.get("adaptive", False):
+            raise ValueError(
+                "Variance reduction and adaptive sampling require the vectorized engine"
+            )
+
         first_pick_lengths = defaultdict(list)
         for _ in range(n):
             r = self.simulate(
@@ -193,10 +304,13 @@ class MonteCarloSeason(Season):
         data = {
             "Team": [],
             "Average_Path_Length": [],
+            "Standard_Error": [],
         }
         for team, lengths in first_pick_lengths.items():
+            mean, se = mean_and_se(lengths)
             data["Team"].append(team)
-            data["Average_Path_Length"].append(sum(lengths) / len(lengths))
+            data["Average_Path_Length"].append(mean)
+            data["Standard_Error"].append(se)
 
         df = pd.DataFrame(data)
         df = df.sort_values(by="Average_Path_Length", ascending=False).reset_index(
@@ -208,9 +322,11 @@ class MonteCarloSeason(Season):
 
 class BeamExploreSeason(Season):
 
-    def __init__(self, year, models, schedule_df, feature_df):
+    def __init__(self, year, models, schedule_df, feature_df, game_cache=None):
         super().__init__(year, models, schedule_df, feature_df)
-        self.game_cache = {}
+        # Shared across resolve calls; pass a PersistentGameCache to also share
+        # game probabilities across processes
+        self.external_game_cache = game_cache
 
     def pick_team(self, available_teams, picks):
         return self.team_to_pick
@@ -221,32 +337,73 @@ class BeamExploreSeason(Season):
     def end_of_week_checkin(self, pick, pick_won):
         return False
 
-    def _filter_teams_by_rank(self, all_teams, week_schedule, rank_dict):
+    def table_game_features(self, wk, home, away, week, spread=None, rank=None):
+        # Beam expansion simulates one week at a time, so the rank is always
+        # fresh (Rank_Age 0) and the spread only applies to the starting week
+        return self.static_game_features(
+            wk, home, away, wk, spread if wk == week else None, rank
+        )
+
+    def week_outcome(self, wk, records, spread=None, rank=None, table=None):
         """
-        Eliminate any team who is playing against a team with at least 10 higher rank.
-        Returns a set of eligible teams.
+        Score week wk's games once for records: returns the home-win
+        probabilities, the winners and the records after those results.
         """
-        if not rank_dict:
-            return all_teams
-
-        filtered_teams = set()
-        for t in all_teams:
-            game_row = week_schedule[
-                (week_schedule["Home_Team"] == t) | (week_schedule["Away_Team"] == t)
+        games = self.index.week_games(wk)
+        if table is not None:
+            probs = [
+                table.prob(wk, g, records.wins(home), records.wins(away))
+                for g, (home, away) in enumerate(games)
             ]
-            if game_row.empty:
-                continue
-            row = game_row.iloc[0]
-            opponent = row["Away_Team"] if row["Home_Team"] == t else row["Home_Team"]
-
-            t_rank = rank_dict.get(t)
-            opp_rank = rank_dict.get(opponent)
-
-            if t_rank is not None and opp_rank is not None and (t_rank > opp_rank + 10):
-                continue
-            filtered_teams.add(t)
-
-        return filtered_teams
+            winners = [
+                home if prob >= 0.5 else away
+                for (home, away), prob in zip(games, probs)
+            ]
+        else:
+            week_result = Week(
+                self.week_games(wk, wk, spread, rank, records)
+            ).simulate()
+            probs = [r["prob"] for r in week_result]
+            winners = [r["winner"] for r in week_result]
+
+        base = records.copy()
+        for (home, away), winner in zip(games, winners):
+            base.add_result(winner, away if winner == home else home)
+        return probs, winners, base
+
+    def pick_prob(self, wk, team, probs):
+        """Win probability of picking team given week wk's home-win probs."""
+        g, _, is_home = self.index.game_of(wk, team)
+        return probs[g] if is_home else 1 - probs[g]
+
+    def pick_children(self, wk, teams, probs, winners, base):
+        """
+        Each candidate pick's win probability and resulting records, derived
+        from a week_outcome by forcing only that pick's game. Children whose
+        pick was already the favourite share base, which must not be mutated.
+        """
+        children = []
+        for team in teams:
+            g, opponent, is_home = self.index.game_of(wk, team)
+            p = probs[g] if is_home else 1 - probs[g]
+            if winners[g] == team:
+                child = base
+            else:
+                child = base.copy()
+                child.reverse_result(team, opponent)
+            children.append((team, p, child))
+        return children
+
+    def expand_week(self, wk, records, teams, spread=None, rank=None, table=None):
+        """
+        Expand one beam path by a week: score the week's games once for the
+        parent's records, then derive each candidate pick's win probability
+        and resulting records by forcing only that pick's game. Returns a
+        list of (team, p, records); children whose pick was already the
+        favourite share one RecordState, which must not be mutated.
+        """
+        probs, winners, base = self.week_outcome(wk, records, spread, rank, table)
+        return self.pick_children(wk, teams, probs, winners, base)
 
     def resolve(
         self,
@@ -260,7 +417,27 @@ class BeamExploreSeason(Season):
     ):
         k = kwargs.get("k", 100)
         n = kwargs.get("n", 1000)
-        self.external_game_cache = {}
+        engine = kwargs.get("engine", "simulate")
+        merge = kwargs.get("merge", False)
+        if merge and engine != "vectorized":
+            raise ValueError("State merging requires the vectorized engine")
+        # Branch-and-bound: "exact" skips expanding parents none of whose
+        # children, and building children none of which, can reach this
+        # week's top k (same paths as no pruning)
+        prune = kwargs.get("prune")
+        if prune not in (None, "exact"):
+            raise ValueError(f"Unknown pruning mode: {prune}")
+        if kwargs.get("seed_paths") and engine != "vectorized":
+            raise ValueError("Seed paths require the vectorized engine")
+        # Stream: return a generator of the final paths without their records
+        # (in lists of batch_size paths if given) instead of a list
+        batch_size = kwargs.get("batch_size")
+        stream = kwargs.get("stream", False) or batch_size is not None
+        workers = kwargs.get("workers") or 1
+        if workers > 1 and merge:
+            raise ValueError("State merging needs every child, not worker top-k shards")
+        if self.external_game_cache is None:
+            self.external_game_cache = GameCache(maxsize=kwargs.get("cache_size"))
 
         # Convert dataframes to dictionaries for faster lookups
         rank_dict = rank.set_index("Team")["Rank"].to_dict() if rank is not None else {}
@@ -270,70 +447,504 @@ class BeamExploreSeason(Season):
             else {}
         )
 
-        best_paths = []
-        for _ in tqdm(range(n), desc="Simulations", total=n, leave=False):
-            beam_paths = [
+        # The "table" engine scores every reachable game state up front and
+        # runs the search on lookups only; "vectorized" runs the same search on
+        # arrays, expanding all candidates of a week at once. The rows of
+        # previous_table (an earlier week's table) are reused where they still
+        # apply, and the table is kept in self.table for the next solve
+        table = None
+        if engine in ("table", "vectorized"):
+            table = ProbabilityTable.build(
+                self,
+                week,
+                end_week,
+                spread_dict,
+                rank_dict,
+                prior_weeks,
+                previous=kwargs.get("previous_table"),
+            )
+        elif engine != "simulate":
+            raise ValueError(f"Unknown beam engine: {engine}")
+        self.table = table
+
+        bounds = None
+        if prune:
+            bounds = PathBounds(
+                self,
+                table
+                or ProbabilityTable.build(
+                    self, week, end_week, spread_dict, rank_dict, prior_weeks
+                ),
+                rank_dict,
+            )
+        # skipped: candidates never expanded
+        self.search_stats = {"candidates": 0, "skipped": 0}
+
+        # Per-week checkpoint of the beam; with resume the search continues
+        # after the last week it holds
+        checkpoint = None
+        if kwargs.get("checkpoint"):
+            checkpoint = Checkpoint(
+                kwargs["checkpoint"],
                 {
-                    "picks": [] if not survivor_picks else survivor_picks,
-                    "p": np.log(1.0),
-                    "prior_weeks": copy.deepcopy(prior_weeks) if prior_weeks else {},
-                }
-            ]
-
-            for wk in tqdm(
-                range(week, end_week + 1), desc="Week progress", leave=False
-            ):
-                candidate_paths = []
-                week_schedule = self.schedule_df[self.schedule_df["Week"] == wk]
+                    "year": self.year,
+                    "week": week,
+                    "end_week": end_week,
+                    "survivor_picks": list(survivor_picks or []),
+                    "k": k,
+                    "n": n,
+                    "engine": engine,
+                    "merge": merge,
+                    "prune": prune,
+                },
+            )
+        saved = checkpoint.load() if checkpoint and kwargs.get("resume") else None
+        # Checkpoints hold the counters of this search only, as the cache may
+        # be shared with other searches
+        self._cache_start = cache_counters(self.external_game_cache)
+        if saved is not None:
+            restore_cache_counters(self.external_game_cache, saved[2]["cache"])
+
+        if engine == "vectorized":
+            # All candidates of a week are scored at once (split into shards
+            # across worker processes with workers > 1)
+            beam = VectorizedBeam(
+                self,
+                table,
+                rank_dict,
+                survivor_picks,
+                prior_weeks,
+                merge=merge,
+                bounds=bounds,
+                prune=prune,
+            )
+            state, start = None, week
+            if saved is not None:
+                done, arrays, meta = saved
+                state = BeamState(
+                    **{name: arrays[name] for name in BeamState.FIELDS}
+                )
+                start = done + 1
+                beam.stats.update(meta["stats"])
+
+            def save(wk, state):
+                checkpoint.save(
+                    wk,
+                    {
+                        "used": state.used,
+                        "picks": state.picks,
+                        "logp": state.logp,
+                        "wins": state.wins,
+                        "mass": state.mass,
+                    },
+                    {
+                        "stats": beam.stats,
+                        "cache": cache_counters(
+                            self.external_game_cache, self._cache_start
+                        ),
+                    },
+                )
 
-                # Pre-filter teams for the week
-                all_teams_in_week = set(week_schedule["Home_Team"]).union(
-                    set(week_schedule["Away_Team"])
+            pool = None
+            if workers > 1:
+                pool = ParallelExpander(self, table, spread_dict, rank_dict, workers, beam)
+            try:
+                state = beam.run(
+                    k,
+                    week=start,
+                    state=state,
+                    progress=lambda weeks: tqdm(weeks, desc="Week progress", leave=False),
+                    on_week=save if checkpoint else None,
+                    pool=pool,
+                )
+            finally:
+                if pool is not None:
+                    pool.close()
+            self.search_stats = dict(beam.stats)
+
+            # Warm start: complete pick sequences carried over from an earlier
+            # solve are re-scored on this table and compete with the searched
+            # paths for the beam_size best
+            seed_paths = kwargs.get("seed_paths")
+            if seed_paths:
+                prefix = list(survivor_picks or [])
+                n_weeks = end_week - week + 1
+                sequences = [
+                    [self.registry.id(t) for t in p[len(prefix) :]]
+                    for p in seed_paths
+                    if list(p[: len(prefix)]) == prefix
+                    and len(p) == len(prefix) + n_weeks
+                    and all(t in self.registry for t in p[len(prefix) :])
+                ]
+                seeded = beam.score_paths(sequences) if sequences else None
+                if seeded is not None:
+                    state = beam.combine(state, seeded, kwargs.get("beam_size") or k)
+                self.search_stats["seeded"] = len(seeded) if seeded is not None else 0
+            # The search is deterministic, so every outer run yields the same beam
+            if stream:
+                return stream_paths(
+                    (beam.paths(state, records=False) for _ in range(n)), batch_size
                 )
+            best_paths = []
+            for _ in range(n):
+                best_paths.extend(beam.to_paths(state))
+            return best_paths
+
+        runs = self._beam_search(
+            week,
+            end_week,
+            k,
+            n,
+            survivor_picks,
+            prior_weeks,
+            spread_dict,
+            rank_dict,
+            table,
+            bounds,
+            prune,
+            workers,
+            checkpoint,
+            saved,
+        )
+        if stream:
+            return stream_paths(runs, batch_size)
+        return [path for beam_paths in runs for path in beam_paths]
+
+    def _beam_search(
+        self,
+        week,
+        end_week,
+        k,
+        n,
+        survivor_picks,
+        prior_weeks,
+        spread_dict,
+        rank_dict,
+        table,
+        bounds,
+        prune,
+        workers=1,
+        checkpoint=None,
+        saved=None,
+    ):
+        """
+        Generator of the final beam (list of path dicts) of every outer run.
+        With workers > 1 the parents are expanded in shards on a process pool
+        that stays open until the last run is produced.
+        """
+        pool = None
+        if workers > 1:
+            pool = ParallelExpander(self, table, spread_dict, rank_dict, workers)
+        try:
+            yield from self._beam_runs(
+                week,
+                end_week,
+                k,
+                n,
+                survivor_picks,
+                prior_weeks,
+                spread_dict,
+                rank_dict,
+                table,
+                bounds,
+                prune,
+                pool,
+                checkpoint,
+                saved,
+            )
+        finally:
+            if pool is not None:
+                pool.close()
 
+    def _beam_runs(
+        self,
+        week,
+        end_week,
+        k,
+        n,
+        survivor_picks,
+        prior_weeks,
+        spread_dict,
+        rank_dict,
+        table,
+        bounds,
+        prune,
+        pool,
+        checkpoint,
+        saved,
+    ):
+        first_run, start = 0, week
+        if saved is not None:
+            done, arrays, meta = saved
+            self.search_stats.update(meta["stats"])
+            first_run, start = meta["run"], done + 1
+        for run in tqdm(range(first_run, n), desc="Simulations", total=n, leave=False):
+            if saved is not None and run == first_run:
+                beam_paths = self._paths_from_arrays(arrays, survivor_picks)
+            else:
+                start = week
+                beam_paths = [
+                    {
+                        "picks": [] if not survivor_picks else survivor_picks,
+                        "p": np.log(1.0),
+                        "prior_weeks": RecordState.from_records(
+                            self.registry, prior_weeks
+                        ),
+                    }
+                ]
+
+            for wk in tqdm(
+                range(start, end_week + 1), desc="Week progress", leave=False
+            ):
                 # Filter teams by rank once per week
                 eligible_teams = self._filter_teams_by_rank(
-                    all_teams_in_week, week_schedule, rank_dict
+                    self.index.week_teams(wk), wk, rank_dict
                 )
+                if pool is not None:
+                    selected, stats = pool.best_children(
+                        wk,
+                        week,
+                        beam_paths,
+                        eligible_teams,
+                        k,
+                        week_best=bounds.week_best[wk - week] if prune else None,
+                    )
+                    for key, value in stats.items():
+                        self.search_stats[key] += value
+                else:
+                    selected = self._best_children(
+                        wk,
+                        week,
+                        beam_paths,
+                        eligible_teams,
+                        k,
+                        spread_dict,
+                        rank_dict,
+                        table,
+                        bounds,
+                        prune,
+                    )
+
+                beam_paths = [
+                    {
+                        "picks": path["picks"] + [team_to_pick],
+                        "p": logp,
+                        "prior_weeks": records,
+                    }
+                    for logp, path, team_to_pick, records in selected
+                ]
+
+                if checkpoint is not None:
+                    checkpoint.save(
+                        wk,
+                        {
+                            **self._paths_to_arrays(
+                                beam_paths, survivor_picks, wk - week + 1
+                            ),
+                        },
+                        {
+                            "run": run,
+                            "stats": self.search_stats,
+                            "cache": cache_counters(
+                                self.external_game_cache, self._cache_start
+                            ),
+                        },
+                    )
+
+            yield beam_paths
+
+        # The search is deterministic: the runs finished before a resume
+        # yielded the same beam as the last one
+        for _ in range(first_run):
+            yield [dict(path) for path in beam_paths]
+
+    def _best_children(
+        self,
+        wk,
+        week,
+        beam_paths,
+        eligible_teams,
+        k,
+        spread_dict,
+        rank_dict,
+        table,
+        bounds,
+        prune,
+    ):
+        """
+        The k best children of week wk of the beam, best first, as (logp,
+        parent path, team, records). Candidates are kept as (parent, team,
+        records) plus a log-prob list; only the k selected become paths.
+        """
+        candidates = []
+        candidate_logp = []
+        top = []  # min-heap of the k best candidate log-probs so far
+        for i, path in enumerate(tqdm(beam_paths, desc="Explore paths", leave=False)):
+            # Sorted so ties are broken the same way on every run
+            available_teams = sorted(eligible_teams - set(path["picks"]))
+
+            # Parents are in descending log-prob order, so once the best
+            # possible child misses the top k every later one does
+            if (
+                prune
+                and len(top) == k
+                and path["p"] + bounds.week_best[wk - week] < top[0]
+            ):
+                self.search_stats["skipped"] += sum(
+                    len(eligible_teams - set(p["picks"])) for p in beam_paths[i:]
+                )
+                break
+
+            outcome = self.week_outcome(
+                wk,
+                path["prior_weeks"],
+                spread_dict if wk == week else None,
+                rank_dict,
+                table,
+            )
+            self.search_stats["candidates"] += len(available_teams)
+            if prune and len(top) == k > 0:
+                # Children below the k-th best so far are never selected:
+                # their records are not built
+                kth = top[0]
+                available_teams = [
+                    team
+                    for team in available_teams
+                    if path["p"] + np.log(self.pick_prob(wk, team, outcome[0])) >= kth
+                ]
+            for team_to_pick, p, records in self.pick_children(
+                wk, available_teams, *outcome
+            ):
+                logp = path["p"] + np.log(p)
+                candidates.append((path, team_to_pick, records))
+                candidate_logp.append(logp)
+                if prune and k > 0:
+                    if len(top) < k:
+                        heapq.heappush(top, logp)
+                    else:
+                        heapq.heappushpop(top, logp)
+
+        return [
+            (candidate_logp[i], *candidates[i])
+            for i in top_k_indices(candidate_logp, k)
+        ]
+
+    def _paths_to_arrays(self, beam_paths, survivor_picks, n_weeks):
+        """Beam path dicts as checkpoint arrays of new picks (team ids), log-probs and records."""
+        prefix = len(survivor_picks or [])
+        ids = self.registry.ids
+        return {
+            "picks": np.array(
+                [[ids[t] for t in path["picks"][prefix:]] for path in beam_paths],
+                dtype=np.int16,
+            ).reshape(len(beam_paths), n_weeks),
+            "logp": np.array([path["p"] for path in beam_paths], dtype=np.float64),
+            "records": np.array(
+                [path["prior_weeks"].data for path in beam_paths], dtype=np.int16
+            ).reshape(len(beam_paths), len(self.registry), 3),
+        }
 
-                for path in tqdm(beam_paths, desc="Explore paths", leave=False):
-                    available_teams = eligible_teams - set(path["picks"])
-
-                    for team_to_pick in available_teams:
-                        self.team_to_pick = team_to_pick
-
-                        # Pass dictionaries instead of dataframes
-                        r = self.simulate(
-                            week=wk,
-                            spread=spread_dict if wk == week else None,
-                            rank=rank_dict,
-                            prior_weeks=path.get("prior_weeks", None),
-                            end_week=wk,
-                            survivor_picks=path["picks"],
-                        )
-
-                        game = [
-                            g
-                            for g in r["results"][wk]
-                            if team_to_pick in [g["home_team"], g["away_team"]]
-                        ][0]
-
-                        p = (
-                            game["prob"]
-                            if game["home_team"] == team_to_pick
-                            else 1 - game["prob"]
-                        )
-
-                        new_path = {
-                            "picks": path["picks"] + [team_to_pick],
-                            "p": path["p"] + np.log(p),
-                            "prior_weeks": self.team_records,
-                        }
-                        candidate_paths.append(new_path)
-
-                candidate_paths.sort(key=lambda x: x["p"], reverse=True)
-                beam_paths = candidate_paths[:k]
-
-            best_paths.extend(beam_paths)
+    def _paths_from_arrays(self, arrays, survivor_picks):
+        names = self.registry.names
+        return [
+            {
+                "picks": list(survivor_picks or []) + [names[t] for t in picks],
+                "p": logp,
+                "prior_weeks": RecordState(self.registry, records.copy()),
+            }
+            for picks, logp, records in zip(
+                arrays["picks"], arrays["logp"], arrays["records"]
+            )
+        ]
+
+
+class AssignmentSeason(Season):
+    """
+    Exact survivor paths when every team's record is frozen at its
+    start-week value. Each week's win probabilities then no longer depend on
+    earlier picks, so choosing one distinct team per week to maximize the
+    summed log-probability is a weeks x teams assignment problem, solved
+    exactly (and ranked with Murty's algorithm for the next-best paths).
+    """
+
+    def __init__(self, year, models, schedule_df, feature_df, game_cache=None):
+        super().__init__(year, models, schedule_df, feature_df)
+        self.external_game_cache = game_cache
+
+    def log_prob_matrix(
+        self,
+        week=1,
+        spread=None,
+        rank=None,
+        prior_weeks=None,
+        end_week=18,
+        survivor_picks=None,
+    ):
+        """
+        (n_weeks, n_teams) log-probability of each registered team winning
+        each week with records frozen at prior_weeks; -inf where the team
+        cannot be picked (bye, rank filter or already used). spread and rank
+        are dicts.
+        """
+        records = RecordState.from_records(self.registry, prior_weeks)
+        used = set(survivor_picks or [])
+        weights = np.full((end_week - week + 1, len(self.registry)), -np.inf)
+        for wi, wk in enumerate(range(week, end_week + 1)):
+            results = Week(self.week_games(wk, week, spread, rank, records)).simulate()
+            home_probs = {r["home_team"]: r["prob"] for r in results}
+            eligible = self._filter_teams_by_rank(self.index.week_teams(wk), wk, rank)
+            for team in eligible - used:
+                g, opponent, is_home = self.index.game_of(wk, team)
+                p = home_probs[team] if is_home else 1 - home_probs[opponent]
+                with np.errstate(divide="ignore"):
+                    weights[wi, self.registry.id(team)] = np.log(p)
+        return weights
 
+    def resolve(
+        self,
+        week=1,
+        spread=None,
+        rank=None,
+        prior_weeks=None,
+        end_week=18,
+        survivor_picks=None,
+        **kwargs,
+    ):
+        """
+        The k best frozen-record paths, best first, in BeamExploreSeason's
+        best_paths format (repeated n times like the vectorized engine).
+        prior_weeks of each path holds the frozen start records.
+        """
+        k = kwargs.get("k", 100)
+        n = kwargs.get("n", 1)
+        if self.external_game_cache is None:
+            self.external_game_cache = GameCache(maxsize=kwargs.get("cache_size"))
+
+        rank_dict = rank.set_index("Team")["Rank"].to_dict() if rank is not None else {}
+        spread_dict = (
+            spread.set_index(["Home_Team", "Away_Team"])["Spread"].to_dict()
+            if spread is not None
+            else {}
+        )
+
+        weights = self.log_prob_matrix(
+            week, spread_dict, rank_dict, prior_weeks, end_week, survivor_picks
+        )
+        records = RecordState.from_records(self.registry, prior_weeks)
+        picks = list(survivor_picks or [])
+        paths = [
+            {
+                "picks": picks + [self.registry.name(c) for c in cols],
+                "p": score,
+                "prior_weeks": records,
+            }
+            for score, cols in ranked_assignments(weights, k)
+        ]
+        batch_size = kwargs.get("batch_size")
+        if kwargs.get("stream", False) or batch_size is not None:
+            return stream_paths([paths] * n, batch_size)
+
+        best_paths = []
+        for _ in range(n):
+            best_paths.extend(paths)
         return best_paths
@@ -0,0 +1,211 @@
+from collections import defaultdict
+
+import numpy as np
+
+from .game import Game, cache_key, predict_home_probs
+
+EMPTY_RECORD = {"wins": 0, "losses": 0, "games_played": 0}
+
+
+def same_features(a, b):
+    """Feature dicts with equal values, missing (NaN) values included."""
+    return a.keys() == b.keys() and all(
+        a[f] == b[f] or (a[f] != a[f] and b[f] != b[f]) for f in a
+    )
+
+
+class ProbabilityTable(object):
+    """
+    Home-win probability of every game from start_week to end_week for every
+    reachable pair of team records, scored up front so a search can run on
+    table lookups alone.
+
+    Along any path a team's games played at a given week is fixed by the
+    schedule, so a record is fully described by the wins gained since
+    start_week (losses are the remaining games). probs is indexed by
+    [week - start_week, game, home wins gained, away wins gained] and is NaN
+    for unreachable combinations.
+    """
+
+    def __init__(
+        self, start_week, end_week, games, base_records, played, probs, static=None
+    ):
+        self.start_week = start_week
+        self.end_week = end_week
+        self.games = games  # {wk: [(home, away), ...]} in schedule order
+        self.base_records = base_records  # {team: record at start_week}
+        self.played = played  # {wk: {team: games played since start_week}}
+        self.probs = probs
+        self.static = static or {}  # {(wk, game idx): static features}
+        self.reused = 0  # rows taken from a previous table
+
+    @classmethod
+    def build(
+        cls,
+        season,
+        week,
+        end_week,
+        spread=None,
+        rank=None,
+        prior_weeks=None,
+        previous=None,
+    ):
+        """
+        Score every reachable record combination of every game with one
+        model call per model. Static features come from
+        season.table_game_features so the table matches how that season
+        simulates. Rows found in the season's game cache are not scored
+        again, and newly scored rows are stored in it (so a persistent cache
+        serves the table engines too). With previous, a table built from an
+        earlier week, the games whose static features did not change take
+        their rows from it (see shifted_rows).
+        """
+        cache = getattr(season, "external_game_cache", None)
+        base_records = {t: dict(r) for t, r in (prior_weeks or {}).items()}
+        weeks = list(range(week, end_week + 1))
+
+        games, played = {}, {}
+        counts = defaultdict(int)
+        for wk in weeks:
+            games[wk] = list(season.index.week_games(wk))
+            played[wk] = dict(counts)
+            for home, away in games[wk]:
+                counts[home] += 1
+                counts[away] += 1
+
+        max_games = max((len(g) for g in games.values()), default=0)
+        max_played = max((max(p.values(), default=0) for p in played.values()), default=0)
+        probs = np.full(
+            (len(weeks), max_games, max_played + 1, max_played + 1), np.nan
+        )
+
+        pending = defaultdict(lambda: ([], [], []))  # model name -> (rows, indices, keys)
+        statics = {}
+        reused = 0
+        for wi, wk in enumerate(weeks):
+            for g, (home, away) in enumerate(games[wk]):
+                static = season.table_game_features(wk, home, away, week, spread, rank)
+                statics[wk, g] = static
+                home_played = played[wk].get(home, 0)
+                away_played = played[wk].get(away, 0)
+                if previous is not None:
+                    rows = previous.shifted_rows(
+                        wk, g, (home, away), static, base_records, played[wk]
+                    )
+                    if rows is not None:
+                        probs[wi, g, : home_played + 1, : away_played + 1] = rows
+                        reused += rows.size
+                        continue
+                # The model and every column but the wins and losses are the
+                # same for all the game's rows: each row patches a base row
+                features = dict(static)
+                for prefix, team, n in [
+                    ("Home", home, home_played),
+                    ("Away", away, away_played),
+                ]:
+                    rec = base_records.get(team, EMPTY_RECORD)
+                    features[f"{prefix}_Games_Played"] = rec["games_played"] + n
+                    features[f"{prefix}_Wins"] = rec["wins"]
+                    features[f"{prefix}_Losses"] = rec["losses"] + n
+                game = Game(features, home, away, season.models)
+                model_name = game.model_name()
+                base = game.feature_row(model_name)
+                columns = list(season.models[model_name].feature_names_in_)
+                positions = [
+                    columns.index(f) if f in columns else None
+                    for f in ("Home_Wins", "Home_Losses", "Away_Wins", "Away_Losses")
+                ]
+                for dh in range(home_played + 1):
+                    for da in range(away_played + 1):
+                        row = base.copy()
+                        for i, delta in zip(positions, (dh, -dh, da, -da)):
+                            if i is not None:
+                                row[i] += delta
+                        if cache is not None:
+                            key = cache_key(model_name, home, away, row)
+                            hit = cache.get(key)
+                            if hit is not None:
+                                probs[wi, g, dh, da] = hit[1]
+                                continue
+                        rows, idx, keys = pending[model_name]
+                        rows.append(row)
+                        idx.append((wi, g, dh, da))
+                        keys.append(key if cache is not None else None)
+
+        for model_name, (rows, idx, keys) in pending.items():
+            p = predict_home_probs(season.models[model_name], rows)
+            probs[tuple(np.asarray(idx).T)] = p
+            if cache is not None:
+                for key, (wi, g, _, _), prob in zip(keys, idx, p):
+                    home, away = games[weeks[wi]][g]
+                    cache[key] = (home if prob >= 0.5 else away, prob)
+
+        table = cls(week, end_week, games, base_records, played, probs, statics)
+        table.reused = reused
+        return table
+
+    def shifted_rows(self, wk, game_idx, game, static, base_records, played):
+        """
+        This table's rows of game (home, away) of week wk for a table that
+        starts later from base_records, where the teams have played played
+        games since that start: the rows of the matching records, or None if
+        the game or its static features changed or the new start records are
+        not a state this table reaches.
+        """
+        if (
+            self.games.get(wk, [])[game_idx : game_idx + 1] != [game]
+            or not same_features(self.static[wk, game_idx], static)
+        ):
+            return None
+        shifts = []
+        for team in game:
+            old = self.base_records.get(team, EMPTY_RECORD)
+            new = base_records.get(team, EMPTY_RECORD)
+            wins = new["wins"] - old["wins"]
+            losses = new["losses"] - old["losses"]
+            played_games = new["games_played"] - old["games_played"]
+            if (
+                wins < 0
+                or losses < 0
+                or wins + losses != played_games
+                or played_games != self.played[wk].get(team, 0) - played.get(team, 0)
+            ):
+                return None
+            shifts.append(wins)
+        home, away = game
+        return self.probs[
+            wk - self.start_week,
+            game_idx,
+            shifts[0] : shifts[0] + played.get(home, 0) + 1,
+            shifts[1] : shifts[1] + played.get(away, 0) + 1,
+        ]
+
+    def wins_gained(self, team, wins):
+        return wins - self.base_records.get(team, EMPTY_RECORD)["wins"]
+
+    def prob(self, wk, game_idx, home_wins, away_wins):
+        """Home-win probability of a game given both teams' current wins."""
+        home, away = self.games[wk][game_idx]
+        return self.probs[
+            wk - self.start_week,
+            game_idx,
+            self.wins_gained(home, home_wins),
+            self.wins_gained(away, away_wins),
+        ]
+
+    def lookup(self, wk, game_idx, home_wins, home_losses, away_wins, away_losses):
+        """
+        Probability for an explicit W-L pair of both teams; the losses must be
+        consistent with the games played at that week.
+        """
+        home, away = self.games[wk][game_idx]
+        for team, wins, losses in [
+            (home, home_wins, home_losses),
+            (away, away_wins, away_losses),
+        ]:
+            rec = self.base_records.get(team, EMPTY_RECORD)
+            if (wins - rec["wins"]) + (losses - rec["losses"]) != self.played[wk].get(
+                team, 0
+            ):
+                raise ValueError(f"Record {wins}-{losses} of {team} is not reachable at week {wk}")
+        return self.prob(wk, game_idx, home_wins, away_wins)
@@ -1,12 +1,60 @@
-from .game import Game
+from collections import defaultdict
+
+from .game import Game, predict_home_probs
+
 
 class Week(object):
     def __init__(self, games):
         self.games = games  # List of Game objects
 
     def simulate(self):
+        """
+        Score all games of the week with one predict_proba call per model
+        instead of one call per game. Games that are not model-backed (or
+        that hit the game cache) are resolved individually.
+        """
+        outcomes = [None] * len(self.games)
+        pending = defaultdict(list)  # (id(model), model_name) -> game indices
+        for i, game in enumerate(self.games):
+            if not isinstance(game, Game):
+                outcomes[i] = game.simulate()
+                continue
+            if hasattr(game, "cached_result"):
+                cached = game.cached_result()
+                if cached is not None:
+                    outcomes[i] = cached
+                    continue
+            model_name = game.model_name()
+            pending[(id(game.models[model_name]), model_name)].append(i)
+
+        for (_, model_name), idx in pending.items():
+            model = self.games[idx[0]].models[model_name]
+            rows = [self.games[i].feature_row(model_name) for i in idx]
+            for i, prob in zip(idx, predict_home_probs(model, rows)):
+                game = self.games[i]
+                outcomes[i] = game.outcome(prob)
+                if hasattr(game, "store_result"):
+                    game.store_result(outcomes[i])
+
         results = []
-        for game in self.games:
-            winner, prob = game.simulate()
+        for game, (winner, prob) in zip(self.games, outcomes):
             results.append({'home_team': game.home_team, 'away_team': game.away_team, 'winner': winner, 'prob': prob})
         return results
+
+    @staticmethod
+    def record_results(results, records, pick=None, force_pick_win=False):
+        """
+        Apply a week's results to a RecordState. With force_pick_win the
+        picked team is recorded as the winner of its game. Returns whether the
+        pick won.
+        """
+        pick_won = False
+        for game_result in results:
+            winner = game_result['winner']
+            home, away = game_result['home_team'], game_result['away_team']
+            if force_pick_win and pick in (home, away):
+                winner = pick
+            records.add_result(winner, away if winner == home else home)
+            if winner == pick:
+                pick_won = True
+        return pick_won
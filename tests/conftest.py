@@ -0,0 +1,99 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+from simulation.season import BeamExploreSeason
+
+
+class RecordModel:
+    """Home-win probability driven by the teams' records and rank."""
+
+    def __init__(self, with_spread=True):
+        self.feature_names_in_ = [
+            "Home_Rank",
+            "Away_Rank",
+            "Home_Games_Played",
+            "Away_Games_Played",
+            "Home_Wins",
+            "Away_Wins",
+            "Home_Losses",
+            "Away_Losses",
+        ]
+        if with_spread:
+            self.feature_names_in_.append("Spread")
+        self.calls = 0
+
+    def predict_proba(self, X):
+        self.calls += 1
+        X = X.astype(float)
+        logit = 0.3 * (X["Home_Wins"] - X["Away_Wins"]) + 0.05 * (
+            X["Away_Rank"] - X["Home_Rank"]
+        )
+        if "Spread" in X:
+            logit = logit - 0.1 * X["Spread"]
+        p = 1 / (1 + np.exp(-logit))
+        return np.column_stack([1 - p, p])
+
+
+def make_season():
+    teams = ["A", "B", "C", "D", "E", "F"]
+    matchups = [
+        [("A", "B"), ("C", "D"), ("E", "F")],
+        [("A", "C"), ("B", "E"), ("D", "F")],
+        [("F", "A"), ("D", "B"), ("C", "E")],
+        [("B", "C"), ("E", "A"), ("F", "D")],
+        [("A", "D"), ("C", "F"), ("E", "B")],
+    ]
+    rows = []
+    for week, games in enumerate(matchups, 1):
+        for home, away in games:
+            rows.append({"Year": 2024, "Week": week, "Home_Team": home, "Away_Team": away})
+    schedule_df = pd.DataFrame(rows)
+    spread = schedule_df[schedule_df["Week"] == 1][["Home_Team", "Away_Team"]].copy()
+    spread["Spread"] = [-3.0, 2.5, 7.0]
+    rank = pd.DataFrame({"Team": teams, "Rank": [3, 1, 6, 2, 5, 4]})
+    models = {"full": RecordModel(), "no_spread": RecordModel(with_spread=False)}
+    return BeamExploreSeason(2024, models, schedule_df, schedule_df.copy()), spread, rank
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "data.db")
+    games = pd.DataFrame(
+        {
+            "Year": [2024] * 6 + [2023],
+            "Week": [1, 1, 2, 2, 3, 3, 1],
+            "Home_Team": ["A", "C", "B", "D", "A", "B", "A"],
+            "Away_Team": ["B", "D", "C", "A", "D", "C", "B"],
+            "Is_Neutral": [0] * 7,
+            "Home_Days_Since_Last_Game": [7] * 7,
+            "Away_Days_Since_Last_Game": [7] * 7,
+            "Spread": [-3.0, 1.5, 2.0, -7.0, None, None, 4.0],
+            "Home_Won": [1, 0, 1, 0, None, None, 1],
+        }
+    )
+    rankings = pd.DataFrame(
+        {
+            "Year": [2024] * 4 + [2024] * 4,
+            "Week": [1] * 4 + [2] * 4,
+            "Team": ["A", "B", "C", "D"] * 2,
+            "Rating": [3.0, 1.0, 2.0, 1.0, 0.5, 4.0, 2.0, 1.0],
+        }
+    )
+    with duckdb.connect(path) as db:
+        for name, df in [("game_features", games), ("nfl_rankings", rankings)]:
+            columns = ", ".join(
+                f"{c} {'VARCHAR' if df[c].dtype.kind not in 'if' else 'DOUBLE'}"
+                for c in df.columns
+            )
+            db.execute(f"CREATE TABLE {name} ({columns})")
+            db.executemany(
+                f"INSERT INTO {name} VALUES ({', '.join('?' * len(df.columns))})",
+                df.astype(object).where(df.notna(), None).values.tolist(),
+            )
+    return path
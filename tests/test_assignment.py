@@ -0,0 +1,57 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
+
+import itertools
+
+import numpy as np
+import pytest
+from conftest import make_season
+from simulation.assignment import ranked_assignments
+from simulation.season import AssignmentSeason
+
+
+def brute_force(weights):
+    n_rows, n_cols = weights.shape
+    scores = []
+    for cols in itertools.permutations(range(n_cols), n_rows):
+        score = weights[np.arange(n_rows), cols].sum()
+        if np.isfinite(score):
+            scores.append(score)
+    return sorted(scores, reverse=True)
+
+
+def test_ranked_assignments_match_brute_force():
+    rng = np.random.default_rng(1)
+    weights = np.log(rng.uniform(0.1, 0.9, (4, 6)))
+    weights[0, 2] = weights[3, 5] = -np.inf
+    expected = brute_force(weights)
+    actual = [score for score, _ in ranked_assignments(weights, 50)]
+    np.testing.assert_allclose(actual, expected[:50])
+    assert len({tuple(cols) for _, cols in ranked_assignments(weights, 50)}) == 50
+
+
+def test_ranked_assignments_infeasible():
+    weights = np.full((2, 2), -np.inf)
+    weights[:, 0] = 0.0
+    assert list(ranked_assignments(weights, 5)) == []
+
+
+def test_assignment_season_resolve():
+    beam_season, spread, rank = make_season()
+    season = AssignmentSeason(
+        2024, beam_season.models, beam_season.schedule_df, beam_season.feature_df
+    )
+    paths = season.resolve(
+        week=1, end_week=5, spread=spread, rank=rank, survivor_picks=["C"], k=10, n=2
+    )
+    assert len(paths) == 20
+    assert all(p["picks"][0] == "C" and len(set(p["picks"])) == 6 for p in paths)
+    assert np.all(np.diff([p["p"] for p in paths[:10]]) <= 0)
+
+    rank_dict = rank.set_index("Team")["Rank"].to_dict()
+    spread_dict = spread.set_index(["Home_Team", "Away_Team"])["Spread"].to_dict()
+    weights = season.log_prob_matrix(1, spread_dict, rank_dict, None, 5, ["C"])
+    assert paths[0]["p"] == pytest.approx(brute_force(weights)[0])
+
@@ -0,0 +1,310 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
+
+import numpy as np
+import pytest
+from conftest import make_season
+from simulation.beam import PathBounds, top_k_indices
+from simulation.cache import GameCache
+from simulation.checkpoint import Checkpoint, cache_counters
+from simulation.table import ProbabilityTable
+
+
+def resolve(engine, **kwargs):
+    season, spread, rank = make_season()
+    return season.resolve(
+        week=1, end_week=5, spread=spread, rank=rank, n=1, engine=engine, **kwargs
+    )
+
+
+def path_keys(paths):
+    return sorted((round(float(p["p"]), 12), tuple(p["picks"])) for p in paths)
+
+
+@pytest.mark.parametrize("k", [1, 5, 50])
+def test_vectorized_engine_matches_table_engine(k):
+    expected = resolve("table", k=k)
+    actual = resolve("vectorized", k=k)
+    # Same paths in the same order, with the same records as the dict engine
+    assert [p["picks"] for p in actual] == [p["picks"] for p in expected]
+    assert path_keys(actual) == path_keys(expected)
+    assert actual[0]["prior_weeks"] == expected[0]["prior_weeks"]
+    assert np.all(np.diff([p["p"] for p in actual]) <= 0)
+
+
+def test_vectorized_engine_with_prior_picks_and_records():
+    season, spread, rank = make_season()
+    prior = {"A": {"wins": 1, "losses": 0, "games_played": 1}}
+    kwargs = dict(
+        week=2,
+        end_week=5,
+        rank=rank,
+        prior_weeks=prior,
+        survivor_picks=["B"],
+        k=20,
+        n=2,
+    )
+    expected = season.resolve(engine="table", **kwargs)
+    season, spread, rank = make_season()
+    actual = season.resolve(engine="vectorized", **kwargs)
+    assert len(actual) == 40
+    assert path_keys(actual) == path_keys(expected)
+    assert all(p["picks"][0] == "B" and "B" not in p["picks"][1:] for p in actual)
+
+
+def test_top_k_indices_equals_stable_sort():
+    rng = np.random.default_rng(0)
+    # Few distinct values so ties straddle the k-th place
+    logp = np.log(rng.integers(1, 6, 500) / 10)
+    for k in [0, 1, 7, 100, 499, 500, 600]:
+        expected = np.argsort(-logp, kind="stable")[:k]
+        np.testing.assert_array_equal(top_k_indices(logp, k), expected)
+
+
+def test_merge_mode_keeps_best_path_and_first_pick_mass():
+    # Wide enough to be exhaustive, so merging must not lose any mass
+    expected = resolve("vectorized", k=100000)
+    actual = resolve("vectorized", k=100000, merge=True)
+    assert len(actual) < len(expected)
+    assert actual[0]["picks"] == expected[0]["picks"]
+    assert actual[0]["p"] == pytest.approx(expected[0]["p"])
+
+    def first_pick_mass(paths, key):
+        totals = {}
+        for p in paths:
+            totals[p["picks"][0]] = totals.get(p["picks"][0], 0) + np.exp(p[key])
+        return totals
+
+    merged = first_pick_mass(actual, "log_mass")
+    full = first_pick_mass(expected, "p")
+    assert merged.keys() == full.keys()
+    for team in full:
+        assert merged[team] == pytest.approx(full[team])
+
+
+def test_merge_mode_requires_vectorized_engine():
+    with pytest.raises(ValueError):
+        resolve("table", k=5, merge=True)
+
+
+@pytest.mark.parametrize("engine", ["simulate", "table"])
+def test_exact_pruning_keeps_paths(engine):
+    season, spread, rank = make_season()
+    kwargs = dict(week=1, end_week=5, spread=spread, rank=rank, n=1, k=3)
+    expected = season.resolve(engine=engine, **kwargs)
+    actual = season.resolve(engine=engine, prune="exact", **kwargs)
+    assert season.search_stats["skipped"] > 0
+    assert [(p["picks"], p["p"]) for p in actual] == [
+        (p["picks"], p["p"]) for p in expected
+    ]
+
+
+def test_vectorized_exact_pruning_keeps_paths():
+    season, spread, rank = make_season()
+    kwargs = dict(week=1, end_week=5, spread=spread, rank=rank, n=1, k=3)
+    expected = season.resolve(engine="vectorized", **kwargs)
+    actual = season.resolve(engine="vectorized", prune="exact", **kwargs)
+    assert season.search_stats["skipped"] > 0
+    assert [p["picks"] for p in actual] == [p["picks"] for p in expected]
+    assert path_keys(actual) == path_keys(expected)
+
+
+def test_unknown_pruning_is_rejected():
+    season, spread, rank = make_season()
+    with pytest.raises(ValueError):
+        season.resolve(week=1, end_week=5, engine="table", prune="approx")
+
+
+def test_path_bounds_are_admissible():
+    season, spread, rank = make_season()
+    rank_dict = rank.set_index("Team")["Rank"].to_dict()
+    table = ProbabilityTable.build(season, 1, 5, None, rank_dict)
+    bounds = PathBounds(season, table, rank_dict)
+    heads = [
+        {
+            tuple(p["picks"]): p["p"]
+            for p in season.resolve(
+                week=1, end_week=wk, rank=rank, n=1, k=100000, engine="table"
+            )
+        }
+        for wk in range(1, 6)
+    ]
+
+    # No child gains more than its team's (or the week's) best log-probability
+    for wi in range(1, 5):
+        for picks, p in heads[wi].items():
+            gain = p - heads[wi - 1][picks[:-1]]
+            assert gain <= bounds.best[wi, season.registry.id(picks[-1])] + 1e-9
+            assert gain <= bounds.week_best[wi] + 1e-9
+
+
+@pytest.mark.parametrize("engine", ["simulate", "table", "vectorized"])
+@pytest.mark.parametrize("prune", [None, "exact"])
+def test_workers_match_serial_engine(engine, prune):
+    season, spread, rank = make_season()
+    kwargs = dict(week=1, end_week=5, spread=spread, rank=rank, n=1, k=7, prune=prune)
+    expected = season.resolve(engine=engine, **kwargs)
+    serial_stats = dict(season.search_stats)
+    actual = season.resolve(engine=engine, workers=3, **kwargs)
+    assert [(p["picks"], p["p"]) for p in actual] == [
+        (p["picks"], p["p"]) for p in expected
+    ]
+    assert [p["prior_weeks"] for p in actual] == [p["prior_weeks"] for p in expected]
+    # Workers score every candidate the serial engine scores: the shards
+    # only skip what a serial search would have skipped too
+    assert season.search_stats["candidates"] >= serial_stats["candidates"]
+    if prune == "exact" and engine != "vectorized":
+        assert season.search_stats["skipped"] > 0
+
+
+def test_workers_fill_the_parent_cache():
+    kwargs = dict(week=1, end_week=5, n=1, k=7, engine="simulate")
+    sizes = []
+    for workers in (1, 3):
+        season, spread, rank = make_season()
+        season.external_game_cache = GameCache()
+        season.resolve(spread=spread, rank=rank, workers=workers, **kwargs)
+        sizes.append(len(season.external_game_cache))
+    assert sizes[0] == sizes[1] > 0
+
+
+def test_workers_reject_merge_mode():
+    with pytest.raises(ValueError):
+        resolve("vectorized", k=5, merge=True, workers=2)
+
+
+def test_seed_paths_are_rescored_and_combined():
+    cold = resolve("vectorized", k=50)
+    season, spread, rank = make_season()
+    warm = season.resolve(
+        week=1,
+        end_week=5,
+        spread=spread,
+        rank=rank,
+        n=1,
+        engine="vectorized",
+        k=5,
+        beam_size=50,
+        seed_paths=[p["picks"] for p in cold] + [["A", "A", "B", "C", "D"]],
+    )
+    # The repeated pick is dropped; every cold path is re-scored identically
+    assert season.search_stats["seeded"] == 50
+    assert len(warm) == 50
+    warm_p = {tuple(p["picks"]): p["p"] for p in warm}
+    for p in cold:
+        if tuple(p["picks"]) in warm_p:
+            assert warm_p[tuple(p["picks"])] == pytest.approx(p["p"])
+    # The k best of a superset of the cold beam
+    assert np.all(np.array([p["p"] for p in warm]) >= np.array([p["p"] for p in cold]) - 1e-12)
+    with pytest.raises(ValueError):
+        season.resolve(week=1, end_week=5, engine="table", seed_paths=[["A"] * 5])
+
+
+@pytest.mark.parametrize(
+    "engine, kwargs",
+    [
+        ("simulate", {}),
+        ("table", {"prune": "exact", "n": 2}),
+        ("vectorized", {}),
+        ("vectorized", {"merge": True}),
+    ],
+)
+def test_resume_from_checkpoint_is_identical(tmp_path, monkeypatch, engine, kwargs):
+    season, spread, rank = make_season()
+    prior = {"A": {"wins": 1, "losses": 0, "games_played": 1}}
+    args = dict(
+        week=2, end_week=5, spread=spread, rank=rank, prior_weeks=prior,
+        survivor_picks=["A"], k=4, engine=engine, n=kwargs.pop("n", 1), **kwargs,
+    )
+    expected = season.resolve(**args)
+    expected_stats = dict(season.search_stats)
+
+    path = str(tmp_path / "beam.ckpt")
+    save = Checkpoint.save
+    saved = []
+
+    def recording_save(stop=None):
+        def wrapped(self, step, arrays, meta=None):
+            save(self, step, arrays, meta)
+            saved.append(step)
+            if step == stop:
+                raise KeyboardInterrupt
+
+        return wrapped
+
+    monkeypatch.setattr(Checkpoint, "save", recording_save(stop=3))
+    with pytest.raises(KeyboardInterrupt):
+        make_season()[0].resolve(checkpoint=path, **args)
+    assert saved == [2, 3]
+
+    saved.clear()
+    monkeypatch.setattr(Checkpoint, "save", recording_save())
+    season = make_season()[0]
+    actual = season.resolve(checkpoint=path, resume=True, **args)
+    # Only the weeks after the checkpoint were searched
+    assert saved[:2] == [4, 5]
+    assert [p["picks"] for p in actual] == [p["picks"] for p in expected]
+    assert [p["p"] for p in actual] == [p["p"] for p in expected]
+    assert [p.get("log_mass") for p in actual] == [p.get("log_mass") for p in expected]
+    assert [dict(p["prior_weeks"]) for p in actual] == [
+        dict(p["prior_weeks"]) for p in expected
+    ]
+    assert season.search_stats == expected_stats
+
+    # A checkpoint is only resumed by the search that wrote it
+    with pytest.raises(ValueError):
+        season.resolve(checkpoint=path, resume=True, **{**args, "k": 5})
+
+
+def test_resume_keeps_counters_of_a_shared_cache(tmp_path, monkeypatch):
+    season, spread, rank = make_season()
+    args = dict(week=1, end_week=5, spread=spread, rank=rank, k=4, n=1)
+    path = str(tmp_path / "beam.ckpt")
+    save = Checkpoint.save
+    metas = []
+
+    def interrupting_save(self, step, arrays, meta=None):
+        save(self, step, arrays, meta)
+        metas.append(meta["cache"])
+        if step == 3:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(Checkpoint, "save", interrupting_save)
+    with pytest.raises(KeyboardInterrupt):
+        make_season()[0].resolve(checkpoint=path, **args)
+    interrupted = metas[-1]
+    assert interrupted["misses"] > 0
+
+    # The resuming process already counted other searches on its cache
+    cache = GameCache()
+    cache.hits, cache.misses = 100, 50
+    season = make_season()[0]
+    season.external_game_cache = cache
+    monkeypatch.setattr(Checkpoint, "save", save)
+    season.resolve(checkpoint=path, resume=True, **args)
+    own = cache_counters(cache, {"hits": 100, "misses": 50})
+    assert own["misses"] >= interrupted["misses"]
+    assert own["hits"] >= interrupted["hits"]
+    assert cache.hits >= 100 + interrupted["hits"]
+
+
+
+@pytest.mark.parametrize("engine", ["simulate", "table", "vectorized"])
+def test_streamed_paths_match_resolve(engine):
+    expected = resolve(engine, k=7, merge=engine == "vectorized")
+    season, spread, rank = make_season()
+    kwargs = dict(week=1, end_week=5, spread=spread, rank=rank, engine=engine, k=7)
+    if engine == "vectorized":
+        kwargs["merge"] = True
+
+    batches = list(season.resolve(n=2, batch_size=4, **kwargs))
+    assert [len(b) for b in batches] == [4, 4, 4, 2]
+    streamed = [path for batch in batches for path in batch]
+    assert streamed == [
+        {key: value for key, value in path.items() if key != "prior_weeks"}
+        for path in expected * 2
+    ]
+    # One path at a time without a batch size
+    assert list(season.resolve(n=1, stream=True, **kwargs)) == streamed[:7]
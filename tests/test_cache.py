@@ -0,0 +1,98 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
+
+from simulation.cache import GameCache, PersistentGameCache, model_fingerprint
+from simulation.game import CacheEnabledGame
+
+
+class DummyModel:
+    def __init__(self, prob=0.7):
+        self.feature_names_in_ = ["Home_Wins", "Away_Wins"]
+        self.prob = prob
+        self.calls = 0
+
+    def predict_proba(self, X):
+        self.calls += 1
+        return [[1 - self.prob, self.prob]] * len(X)
+
+
+def test_game_cache_lru_eviction_and_stats():
+    cache = GameCache(maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache.get("a") == 1  # "a" becomes most recently used
+    cache["c"] = 3  # evicts "b"
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+    assert stats["size"] == 2
+    assert "evictions=1" in cache.summary()
+
+    # A size of 0 means unbounded, like None
+    unbounded = GameCache(maxsize=0)
+    for i in range(5):
+        unbounded[i] = i
+    assert len(unbounded) == 5 and unbounded.evictions == 0
+
+
+def test_cache_enabled_game_uses_tuple_key():
+    model = DummyModel(0.7)
+    models = {"full": model, "no_spread": model}
+    cache = GameCache(maxsize=10)
+    features = {"Home_Wins": 2, "Away_Wins": 1, "Year": 2024}
+
+    game = CacheEnabledGame(features, "A", "B", models, cache)
+    assert game.ckey == ("no_spread", "A", "B", 2, 1)
+    assert game.simulate() == game.simulate()
+    assert model.calls == 1
+
+    # Features the model does not use do not split the cache
+    other = CacheEnabledGame(dict(features, Year=2023), "A", "B", models, cache)
+    other.simulate()
+    assert model.calls == 1
+    assert cache.stats()["hits"] == 2
+
+
+class StatelessModel:
+    """Counts calls outside the instance so its fingerprint stays fixed."""
+
+    calls = []
+
+    def __init__(self, prob=0.7):
+        self.feature_names_in_ = ["Home_Wins", "Away_Wins"]
+        self.prob = prob
+
+    def predict_proba(self, X):
+        StatelessModel.calls.append(len(X))
+        return [[1 - self.prob, self.prob]] * len(X)
+
+
+def test_persistent_game_cache_round_trip(tmp_path):
+    path = str(tmp_path / "probs.sqlite")
+    model = StatelessModel(0.7)
+    models = {"full": model, "no_spread": model}
+    features = {"Home_Wins": 2, "Away_Wins": 1}
+    StatelessModel.calls.clear()
+
+    with PersistentGameCache(path, models) as cache:
+        first = CacheEnabledGame(features, "A", "B", models, cache).simulate()
+    assert len(StatelessModel.calls) == 1
+
+    # A new process-level cache warm-loads the stored probability
+    with PersistentGameCache(path, models) as cache:
+        assert cache.loaded == 1
+        again = CacheEnabledGame(features, "A", "B", models, cache).simulate()
+    assert len(StatelessModel.calls) == 1
+    assert again == first
+
+    # A different model gets a different fingerprint and misses the store
+    other = {"full": StatelessModel(0.6), "no_spread": StatelessModel(0.6)}
+    assert model_fingerprint(other["full"]) != model_fingerprint(model)
+    with PersistentGameCache(path, other) as cache:
+        assert cache.loaded == 0
@@ -0,0 +1,78 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
+
+import pytest
+import numpy as np
+from simulation.compiled import CompiledModel, compile_model, compile_models
+from simulation.game import Game
+
+ROOT = os.path.abspath(os.path.dirname(__file__) + "/../")
+
+
+def load_models():
+    pickle = pytest.importorskip("cloudpickle")
+    pytest.importorskip("sklearn")
+    models = {}
+    for name, fname in [("full", "lr_full.pkl"), ("no_spread", "lr_no_spread.pkl")]:
+        with open(os.path.join(ROOT, "models", fname), "rb") as f:
+            models[name] = pickle.load(f)
+    return models
+
+
+def load_game_features():
+    duckdb = pytest.importorskip("duckdb")
+    with duckdb.connect(os.path.join(ROOT, "data", "data.db"), read_only=True) as db:
+        df = db.sql("SELECT * FROM game_features ORDER BY Year, Week").df()
+    # Rank_Age is only set during simulation; give it a spread of values
+    df["Rank_Age"] = df["Week"] % 7
+    return df
+
+
+@pytest.mark.parametrize("name", ["full", "no_spread"])
+def test_compiled_parity_with_predict_proba(name):
+    model = load_models()[name]
+    df = load_game_features()
+    X = df[list(model.feature_names_in_)].astype(float)
+
+    compiled = compile_model(model)
+    assert isinstance(compiled, CompiledModel)
+    np.testing.assert_allclose(
+        compiled.predict_proba(X), model.predict_proba(X), rtol=0, atol=1e-12
+    )
+
+
+def test_game_runs_on_compiled_kernel():
+    models = load_models()
+    compiled = compile_models(models)
+    row = load_game_features().iloc[100].to_dict()
+    for features in [row, {k: v for k, v in row.items() if k != "Spread"}]:
+        expected = Game(features, row["Home_Team"], row["Away_Team"], models).simulate()
+        actual = Game(features, row["Home_Team"], row["Away_Team"], compiled).simulate()
+        assert actual[0] == expected[0]
+        assert actual[1] == pytest.approx(expected[1], abs=1e-12)
+
+
+def test_uncompilable_model_falls_back():
+    class DummyModel:
+        feature_names_in_ = ["Spread"]
+
+        def predict_proba(self, X):
+            return np.array([[0.3, 0.7]] * len(X))
+
+    dummy = DummyModel()
+    assert compile_model(dummy) is None
+    assert compile_models({"full": dummy})["full"] is dummy
+
+
+def test_transforms_are_matched_by_function():
+    model = load_models()["full"]
+    transformer = model.named_steps["preprocessor"].named_transformers_["Win_Rate_Diff"]
+    assert compile_model(model) is not None
+
+    # The same transform as a lambda is not recognised
+    func = transformer.func
+    transformer.func = lambda X: func(X, **transformer.kw_args)
+    transformer.kw_args = None
+    assert compile_model(model) is None
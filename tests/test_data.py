@@ -0,0 +1,31 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
+
+from simulation.data import SeasonData
+
+
+def test_season_data_serves_weeks_from_memory(db_path):
+    data = SeasonData(2024, db_path)
+    assert data.max_week == 3
+    assert len(data.schedule()) == 6
+    assert data.spreads(2).values.tolist() == [["B", "C", 2.0], ["D", "A", -7.0]]
+
+    assert data.records(1) == {}
+    assert data.records(2) == {
+        "A": {"wins": 1, "losses": 0, "games_played": 1},
+        "B": {"wins": 0, "losses": 1, "games_played": 1},
+        "C": {"wins": 0, "losses": 1, "games_played": 1},
+        "D": {"wins": 1, "losses": 0, "games_played": 1},
+    }
+    # Unplayed week 3 games do not count
+    assert data.records(4) == data.records(3)
+    assert data.records(3)["A"] == {"wins": 2, "losses": 0, "games_played": 2}
+
+    # Rating ties are broken by team name
+    ranks = data.ranks(1)
+    assert dict(zip(ranks["Team"], ranks["Rank"])) == {"A": 1, "C": 2, "B": 3, "D": 4}
+    spreads, ranks, records = data.week(2)
+    assert ranks["Team"].tolist() == ["A", "B", "C", "D"]
+    assert records == data.records(2)
@@ -0,0 +1,86 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
+
+import json
+
+import numpy as np
+import pandas as pd
+from simulation.evaluate import cutoff_scores, evaluate, load_winners, score_paths
+from simulation.output import paths_frame, write_paths
+
+# 2024 in the test database: week 1 winners A and D, week 2 winners B and A,
+# week 3 not played yet
+PATHS = [
+    {"picks": ["A", "B", "C"], "p": -0.5},  # never loses
+    {"picks": ["B", "A", "D"], "p": -1.0},  # loses week 1
+    {"picks": ["D", "C", "A"], "p": -2.0},  # loses week 2
+    {"picks": ["C", "D"], "p": -3.0},  # loses weeks 1 and 2
+]
+
+
+def test_winners_matrix(db_path):
+    winners = load_winners([2023, 2024], db_path)
+    season = winners[2024]
+    won = {
+        (wk, season.registry.name(t)) for wk, t in zip(*np.nonzero(season.won))
+    }
+    assert won == {(1, "A"), (1, "D"), (2, "B"), (2, "A")}
+    assert season.played.tolist() == [False, True, True, False]
+    assert np.nonzero(winners[2023].won[1])[0].tolist() == [
+        winners[2023].registry.id("A")
+    ]
+
+
+def test_score_paths(db_path):
+    winners = load_winners([2024], db_path)[2024]
+    scores = score_paths(paths_frame(PATHS, 1, 3), winners)
+    # Week 3 has no results and is not scored
+    assert scores["errors"].tolist() == [0, 1, 1, 2]
+    assert scores["first_loss"].tolist() == [0, 1, 2, 1]
+
+    # Teams outside the season and missing picks lose
+    df = paths_frame([{"picks": ["Z", "B"], "p": 0.0}, {"picks": ["A"], "p": 0.0}], 1, 3)
+    assert score_paths(df, winners)["errors"].tolist() == [1, 1]
+
+
+def test_cutoffs_take_best_of_top_paths(db_path):
+    winners = load_winners([2024], db_path)[2024]
+    df = paths_frame(PATHS[::-1], 1, 3)  # ranked by log_prob, not file order
+    assert cutoff_scores(df, winners, [1, 2, 3, 10]) == {
+        1: (0, 0),
+        2: (0, 0),
+        3: (0, 0),
+        10: (0, 0),
+    }
+    worse = paths_frame(PATHS[1:], 1, 3)
+    assert cutoff_scores(worse, winners, [1, 2, 3]) == {1: (1, 1), 2: (1, 2), 3: (1, 2)}
+
+
+def test_evaluate_years(tmp_path, db_path):
+    write_paths(paths_frame(PATHS[1:], 1, 3), str(tmp_path / "beam_2024_k5.csv"))
+    with open(tmp_path / "greedy_2024_k5.json", "w") as f:
+        json.dump(["A", "B", "C"], f)
+
+    df = evaluate(
+        [2023, 2024],
+        str(tmp_path / "beam_{year}_k{k}.csv"),
+        str(tmp_path / "greedy_{year}_k{k}.json"),
+        cutoffs=[1, 3],
+        db_path=db_path,
+        k=5,
+    )
+    # 2023 has no paths file
+    assert df.to_dict("records") == [
+        {
+            "year": 2024,
+            "best_path": 1,
+            "best_path_first_loss": 1,
+            "best_3_paths": 1,
+            "best_3_paths_first_loss": 2,
+            "greedy_path": 0,
+            "greedy_path_first_loss": 0,
+        }
+    ]
+    assert isinstance(df, pd.DataFrame)
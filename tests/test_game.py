@@ -5,7 +5,7 @@ sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
 
 import pytest
 import numpy as np
-from simulation.game import Game, CacheEnabledGame
+from simulation.game import Game, CacheEnabledGame, predict_home_probs
 
 
 class DummyModel:
@@ -65,3 +65,15 @@ def test_game_simulate_full_and_no_spread_cached():
     winner, prob = game.simulate()
     assert winner in ["TeamA", "TeamB"]
     assert 0 <= prob <= 1
+
+
+def test_flat_predict_proba_keeps_first_element():
+    # A model returning one flat array instead of one row per game: the
+    # first element is the probability, as the per-game code always read it
+    models = {"full": DummyModel(0.7), "no_spread": DummyModel(0.7, with_spread=False)}
+    features = {k: 1 for k in models["full"].feature_names_in_}
+    winner, prob = Game(features, "TeamA", "TeamB", models).simulate()
+    assert prob == pytest.approx(0.3)
+    assert winner == "TeamB"
+    rows = [Game(features, "TeamA", "TeamB", models).feature_row()] * 3
+    assert np.allclose(predict_home_probs(models["full"], rows), 0.3)
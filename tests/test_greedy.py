@@ -0,0 +1,116 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
+
+import numpy as np
+from conftest import make_season
+from simulation.greedy import changed_teams, consistent_paths, run_greedy_beam_path
+from simulation.season import BeamExploreSeason
+from simulation.table import ProbabilityTable
+
+RESOLVE = BeamExploreSeason.resolve
+
+
+class FavouritesData:
+    """
+    SeasonData of make_season's schedule without spreads, where every game
+    went to the favourite given the records so far (upsets swaps the winner
+    of the listed (week, home) games).
+    """
+
+    max_week = 5
+
+    def __init__(self, upsets=()):
+        season, _, self.rank = make_season()
+        self.models = season.models
+        self.games = season.schedule_df
+        rank_dict = self.rank.set_index("Team")["Rank"].to_dict()
+        table = ProbabilityTable.build(season, 1, 5, None, rank_dict)
+        self._records = [{}]
+        for wk in range(1, 6):
+            records = {t: dict(r) for t, r in self._records[-1].items()}
+            for g, (home, away) in enumerate(table.games[wk]):
+                wins = [records.get(t, {}).get("wins", 0) for t in (home, away)]
+                home_won = (table.prob(wk, g, *wins) >= 0.5) != ((wk, home) in upsets)
+                for team, won in [(home, home_won), (away, not home_won)]:
+                    r = records.setdefault(team, {"wins": 0, "losses": 0, "games_played": 0})
+                    r["wins"] += won
+                    r["losses"] += not won
+                    r["games_played"] += 1
+            self._records.append(records)
+
+    def schedule(self):
+        return self.games
+
+    def records(self, week):
+        return self._records[week - 1]
+
+    def week(self, week):
+        return None, self.rank, self.records(week)
+
+
+def greedy_work(monkeypatch, data, **kwargs):
+    """The greedy path and the candidates and table rows of its searches."""
+    work = {"candidates": 0, "table_rows": 0, "reused_rows": 0, "seeded": 0}
+
+    def counting_resolve(self, **kw):
+        paths = RESOLVE(self, **kw)
+        work["candidates"] += self.search_stats["candidates"]
+        work["seeded"] += self.search_stats.get("seeded", 0)
+        work["table_rows"] += int((~np.isnan(self.table.probs)).sum())
+        work["reused_rows"] += self.table.reused
+        return paths
+
+    monkeypatch.setattr(BeamExploreSeason, "resolve", counting_resolve)
+    path = run_greedy_beam_path(2024, data.models, data, engine="vectorized", **kwargs)
+    return path, work
+
+
+def test_warm_start_does_less_work(monkeypatch):
+    data = FavouritesData()
+    cold_path, cold = greedy_work(monkeypatch, data, k=20)
+    warm_path, warm = greedy_work(monkeypatch, data, k=20, warm_start=True, warm_k=2)
+    assert len(warm_path) == len(cold_path) == 5
+    assert warm["seeded"] > 0
+    assert warm["candidates"] < cold["candidates"]
+    # Ranks do not change, so every week after the first takes its table
+    # from the previous week's, but for the start week's games (which gain
+    # a Spread feature) and the 165 rows of the week 1 table
+    assert cold["reused_rows"] == warm["reused_rows"] > 0
+    assert cold["table_rows"] - cold["reused_rows"] == 165 + 4 * 3
+
+
+def test_carried_paths_follow_realized_results():
+    season, _, rank = make_season()
+    rank_dict = rank.set_index("Team")["Rank"].to_dict()
+    table = ProbabilityTable.build(season, 1, 5, None, rank_dict)
+    data = FavouritesData()
+    # Week 1 is A-B, C-D, E-F, and a favourite was picked
+    winner = next(t for t in "ABCDEF" if data.records(2)[t]["wins"] == 1)
+    assert changed_teams(table, winner, data.records(2)) == set()
+
+    upset = FavouritesData(upsets=[(1, "C")])
+    changed = changed_teams(table, winner, upset.records(2))
+    assert changed == {"C", "D"}
+    # Week 2 is A-C, B-E, D-F: paths picking A, C, D or F there are dropped
+    paths = [[winner, t, "X", "X", "X"] for t in "ABCDEF"]
+    assert [p[1] for p in consistent_paths(paths, table, changed)] == ["B", "E"]
+
+
+def test_table_reuse_matches_a_fresh_table():
+    season, _, rank = make_season()
+    rank_dict = rank.set_index("Team")["Rank"].to_dict()
+    first = ProbabilityTable.build(season, 1, 5, None, rank_dict)
+    records = FavouritesData(upsets=[(1, "C")]).records(2)
+    expected = ProbabilityTable.build(season, 2, 5, None, rank_dict, records)
+    actual = ProbabilityTable.build(season, 2, 5, None, rank_dict, records, previous=first)
+    np.testing.assert_array_equal(actual.probs, expected.probs)
+    assert actual.reused > 0 and expected.reused == 0
+
+    # A changed rank changes the rows of that team's games
+    moved = dict(rank_dict, A=6)
+    fresh = ProbabilityTable.build(season, 2, 5, None, moved, records)
+    reused = ProbabilityTable.build(season, 2, 5, None, moved, records, previous=first)
+    np.testing.assert_array_equal(reused.probs, fresh.probs)
+    assert 0 < reused.reused < actual.reused
@@ -0,0 +1,38 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
+
+import pandas as pd
+from simulation.index import SeasonIndex
+
+
+def test_season_index_lookups():
+    schedule_df = pd.DataFrame(
+        {
+            "Year": [2024, 2024, 2024],
+            "Week": [1, 1, 2],
+            "Home_Team": ["A", "C", "B"],
+            "Away_Team": ["B", "D", "C"],
+        }
+    )
+    feature_df = schedule_df.assign(Is_Neutral=[0, 1, 0])
+    # Rows of other seasons are ignored
+    feature_df = pd.concat(
+        [feature_df, feature_df.assign(Year=2023, Is_Neutral=5)], ignore_index=True
+    )
+    index = SeasonIndex(2024, schedule_df, feature_df)
+
+    assert index.teams == {"A", "B", "C", "D"}
+    assert index.weeks == [1, 2]
+    assert index.week_games(1) == [("A", "B"), ("C", "D")]
+    assert index.week_teams(2) == {"B", "C"}
+    assert index.game_of(1, "D") == (1, "C", False)
+    assert index.game_of(2, "B") == (0, "C", True)
+    assert index.game_of(2, "A") is None  # bye week
+
+    features = index.static_features(1, "C", "D")
+    assert features["Is_Neutral"] == 1
+    features["Spread"] = 3  # callers get a copy
+    assert "Spread" not in index.static_features(1, "C", "D")
+    assert index.static_features(3, "A", "B") == {}
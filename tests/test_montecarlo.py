@@ -0,0 +1,161 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
+
+import numpy as np
+import pytest
+from conftest import make_season
+from simulation.montecarlo import BatchMonteCarlo, mean_and_se
+from simulation.season import MonteCarloSeason
+
+
+def make_mc_season():
+    beam_season, spread, rank = make_season()
+    season = MonteCarloSeason(
+        2024, beam_season.models, beam_season.schedule_df, beam_season.feature_df
+    )
+    return season, spread, rank
+
+
+def expected_lengths(winners, teams):
+    """Exact average path length per first pick for uniform random picks."""
+
+    def remaining(wi, used):
+        if wi == len(winners):
+            return 0.0
+        available = [t for t in teams if t not in used] or [None]
+        total = 0.0
+        for t in available:
+            total += 1 + (remaining(wi + 1, used | {t}) if winners[wi][t] else 0.0)
+        return total / len(available)
+
+    return {
+        t: 1 + (remaining(1, {t}) if winners[0][t] else 0.0) for t in teams
+    }
+
+
+def test_batch_monte_carlo_matches_loop_outcomes_and_expectation():
+    season, spread, rank = make_mc_season()
+    rank_dict = rank.set_index("Team")["Rank"].to_dict()
+    spread_dict = spread.set_index(["Home_Team", "Away_Team"])["Spread"].to_dict()
+    batch = BatchMonteCarlo(season, 1, spread_dict, rank_dict, None, 5)
+
+    # Same game results as the per-season simulation
+    results = season.simulate(1, spread_dict, rank_dict, None, 5)["results"]
+    for wi, wk in enumerate(range(1, 6)):
+        for r in results.get(wk, []):
+            assert batch.winners[wi, season.registry.id(r["winner"])]
+
+    winners = [
+        {t: bool(batch.winners[wi, season.registry.id(t)]) for t in season.registry}
+        for wi in range(5)
+    ]
+    expected = expected_lengths(winners, list(season.registry))
+    df = season.resolve(
+        week=1, spread=spread, rank=rank, end_week=5, n=200000, engine="vectorized", seed=0
+    )
+    assert set(df["Team"]) == set(expected)
+    for team, avg in zip(df["Team"], df["Average_Path_Length"]):
+        assert avg == pytest.approx(expected[team], abs=0.02)
+    assert list(df["Average_Path_Length"]) == sorted(df["Average_Path_Length"], reverse=True)
+
+
+def test_batch_monte_carlo_is_seeded_and_respects_prior_picks():
+    season, spread, rank = make_mc_season()
+    kwargs = dict(week=2, end_week=5, rank=rank, survivor_picks=["B"], n=5000)
+    a = season.resolve(engine="vectorized", seed=7, **kwargs)
+    b = season.resolve(engine="vectorized", seed=7, **kwargs)
+    assert a.equals(b)
+    assert list(a["Team"]) == ["B"]
+    assert (a["Average_Path_Length"] >= 2).all()
+
+    rank_dict = rank.set_index("Team")["Rank"].to_dict()
+    batch = BatchMonteCarlo(season, 2, None, rank_dict, None, 5)
+    first, lengths = batch.run(1000, ["B"], np.random.default_rng(1))
+    assert (first == season.registry.id("B")).all()
+    assert lengths.max() <= 5
+    with pytest.raises(ValueError):
+        season.resolve(engine="fast", **kwargs)
+
+
+def test_variance_reduced_sampling_is_unbiased_and_reports_errors():
+    season, spread, rank = make_mc_season()
+    rank_dict = rank.set_index("Team")["Rank"].to_dict()
+    batch = BatchMonteCarlo(season, 1, None, rank_dict, None, 5)
+    winners = [
+        {t: bool(batch.winners[wi, season.registry.id(t)]) for t in season.registry}
+        for wi in range(5)
+    ]
+    expected = expected_lengths(winners, list(season.registry))
+
+    strata, lengths = batch.run_stratified(
+        20000, rng=np.random.default_rng(3), common=True, antithetic=True
+    )
+    assert lengths.shape == (6, 20000)
+    for t, row in zip(strata, lengths):
+        mean, se = mean_and_se(row, antithetic=True)
+        assert mean == pytest.approx(expected[season.registry.name(t)], abs=5 * se + 1e-9)
+
+    df = season.resolve(
+        week=1,
+        rank=rank,
+        end_week=5,
+        n=6000,
+        engine="vectorized",
+        seed=0,
+        stratify=True,
+        crn=True,
+    )
+    assert list(df.columns) == ["Team", "Average_Path_Length", "Standard_Error"]
+    assert len(df) == 6 and (df["Standard_Error"] >= 0).all()
+    with pytest.raises(ValueError):
+        season.resolve(week=1, rank=rank, end_week=5, n=10, engine="vectorized", crn=True)
+    with pytest.raises(ValueError):
+        season.resolve(week=1, rank=rank, end_week=5, n=10, stratify=True)
+
+
+def test_mean_and_se_pairs_antithetic_samples():
+    mean, se = mean_and_se([1, 3, 2, 2])
+    assert mean == 2 and se == pytest.approx(np.std([1, 3, 2, 2], ddof=1) / 2)
+    mean, se = mean_and_se([1, 3, 2, 2], antithetic=True)
+    assert mean == 2 and se == 0
+
+
+@pytest.mark.parametrize("crn", [True, False])
+def test_adaptive_resolve_stops_once_leader_is_separated(crn):
+    season, spread, rank = make_mc_season()
+    rank_dict = rank.set_index("Team")["Rank"].to_dict()
+    batch = BatchMonteCarlo(season, 1, None, rank_dict, None, 5)
+    winners = [
+        {t: bool(batch.winners[wi, season.registry.id(t)]) for t in season.registry}
+        for wi in range(5)
+    ]
+    expected = expected_lengths(winners, list(season.registry))
+
+    budget = 600000
+    df = season.resolve(
+        week=1,
+        rank=rank,
+        end_week=5,
+        n=budget,
+        engine="vectorized",
+        seed=1,
+        adaptive=True,
+        crn=crn,
+        batch_size=10,
+    )
+    assert df.attrs["simulations"] == df["Simulations"].sum()
+    assert df.attrs["simulations"] < budget
+    assert df["Team"][0] == max(expected, key=expected.get)
+    # Dominated picks stopped being sampled early
+    assert df["Simulations"].min() < df["Simulations"].max()
+
+
+def test_adaptive_resolve_respects_budget_and_target_se():
+    season, spread, rank = make_mc_season()
+    kwargs = dict(week=1, rank=rank, end_week=5, engine="vectorized", seed=2, adaptive=True)
+    df = season.resolve(n=3000, batch_size=200, **kwargs)
+    assert df.attrs["simulations"] <= 3000
+    df = season.resolve(n=10**7, batch_size=200, target_se=0.05, **kwargs)
+    assert df.attrs["simulations"] < 10**7
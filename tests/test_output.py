@@ -0,0 +1,68 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
+
+import numpy as np
+import pytest
+from simulation.output import PathWriter, paths_frame, read_paths, write_paths
+
+PATHS = [
+    {"picks": ["A", "B", "C", "D"], "p": -0.5},
+    {"picks": ["A", "C", "B"], "p": -1.25},
+    {"picks": ["A", "D", "C", "B"], "p": -2.0},
+]
+
+
+def test_paths_frame_keeps_weeks_from_start_week():
+    df = paths_frame(PATHS, 2, 4)
+    assert list(df.columns) == ["week_2", "week_3", "week_4", "log_prob"]
+    assert df.values.tolist() == [
+        ["B", "C", "D", -0.5],
+        ["C", "B", None, -1.25],
+        ["D", "C", "B", -2.0],
+    ]
+    # Paths without prior picks enter at their start week
+    df = paths_frame([{"picks": ["B", "C"], "p": -1.0}], 3, 4, first_week=3)
+    assert df.values.tolist() == [["B", "C", -1.0]]
+
+
+@pytest.mark.parametrize("format", ["csv", "parquet", "arrow"])
+def test_paths_round_trip(tmp_path, format):
+    df = paths_frame(PATHS, 2, 4)
+    path = str(tmp_path / f"paths.{format}")
+    write_paths(df, path, metadata={"year": 2024, "k": 3})
+    loaded = read_paths(path)
+
+    assert list(loaded.columns) == list(df.columns)
+    assert loaded["log_prob"].dtype == np.float64
+    assert loaded["log_prob"].tolist() == df["log_prob"].tolist()
+    assert loaded["week_4"].isna().tolist() == [False, True, False]
+    if format == "csv":
+        assert loaded.attrs["metadata"] == {}
+    else:
+        # One team dictionary shared by every week column
+        for c in ["week_2", "week_3", "week_4"]:
+            assert list(loaded[c].cat.categories) == ["B", "C", "D"]
+        assert loaded.attrs["metadata"] == {"year": 2024, "k": 3}
+    assert loaded[["week_2", "week_3"]].astype(str).values.tolist() == [
+        ["B", "C"], ["C", "B"], ["D", "C"],
+    ]
+
+
+@pytest.mark.parametrize("format", ["csv", "parquet", "arrow"])
+def test_path_writer_appends_batches(tmp_path, format):
+    path = str(tmp_path / f"paths.{format}")
+    with PathWriter(path, teams=["A", "B", "C", "D", "E"]) as writer:
+        for batch in [PATHS[:2], PATHS[2:], []]:
+            writer.write(paths_frame(batch, 2, 4))
+    assert writer.rows == 3
+
+    loaded = read_paths(path)
+    assert loaded["log_prob"].tolist() == [-0.5, -1.25, -2.0]
+    assert loaded["week_2"].astype(str).tolist() == ["B", "C", "D"]
+    if format != "csv":
+        assert list(loaded["week_2"].cat.categories) == ["A", "B", "C", "D", "E"]
+        with PathWriter(str(tmp_path / f"other.{format}"), teams=["A", "B"]) as writer:
+            with pytest.raises(ValueError):
+                writer.write(paths_frame(PATHS, 2, 4))
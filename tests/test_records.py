@@ -0,0 +1,49 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
+
+from simulation.records import RecordState, TeamRegistry
+from simulation.week import Week
+
+
+def test_team_registry_ids():
+    registry = TeamRegistry(["C", "A", "B", "A"])
+    assert registry.names == ("A", "B", "C")
+    assert registry.id("C") == 2
+    assert registry.name(1) == "B"
+    assert "B" in registry and "D" not in registry
+
+
+def test_record_state_reads_like_dict_records():
+    registry = TeamRegistry(["A", "B", "C"])
+    prior = {"A": {"wins": 2, "losses": 1, "games_played": 3}}
+    state = RecordState.from_records(registry, prior)
+    assert state["A"] == prior["A"]
+    assert state["B"] == {"wins": 0, "losses": 0, "games_played": 0}
+    assert set(state.keys()) == {"A", "B", "C"}
+
+    child = state.copy()
+    child.add_result("B", "A")
+    assert child.record("A") == (2, 2, 4)
+    assert child.wins("B") == 1
+    # The parent path is untouched
+    assert state.record("A") == (2, 1, 3)
+    assert RecordState.from_records(registry, child) == child
+    assert child.key() != state.key()
+
+
+def test_week_record_results_forces_pick():
+    registry = TeamRegistry(["A", "B", "C", "D"])
+    results = [
+        {"home_team": "A", "away_team": "B", "winner": "A", "prob": 0.7},
+        {"home_team": "C", "away_team": "D", "winner": "C", "prob": 0.6},
+    ]
+    records = RecordState(registry)
+    assert Week.record_results(results, records, pick="D") is False
+    assert records.record("D") == (0, 1, 1)
+
+    records = RecordState(registry)
+    assert Week.record_results(results, records, pick="D", force_pick_win=True)
+    assert records.record("D") == (1, 0, 1)
+    assert records.record("C") == (0, 1, 1)
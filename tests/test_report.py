@@ -0,0 +1,116 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
+
+import numpy as np
+import pandas as pd
+import pytest
+from simulation.output import paths_frame, write_paths
+from report_card import report_card
+from simulation.report import (
+    load_paths,
+    melt_paths,
+    most_probable_paths,
+    pick_shares,
+    source_names,
+)
+
+PATHS = [
+    {"picks": ["A", "B", "C"], "p": -0.5},
+    {"picks": ["A", "C", "B"], "p": -1.0},
+    {"picks": ["B", "A"], "p": -1.5},
+    {"picks": ["C", "A", "B"], "p": -3.0},
+]
+
+
+def naive_shares(df):
+    # report_card's original loop over every team and week column
+    total = np.exp(df["log_prob"]).sum()
+    shares = {}
+    for week in [c for c in df.columns if c.startswith("week_")]:
+        for team in df[week].dropna().unique():
+            mask = df[week] == team
+            shares[(int(week[5:]), team)] = np.exp(df.loc[mask, "log_prob"]).sum() / total
+    return shares
+
+
+def test_pick_shares_match_naive_sums():
+    df = paths_frame(PATHS, 1, 3)
+    shares = pick_shares(df)
+    expected = naive_shares(df)
+    assert len(shares) == len(expected)
+    for row in shares.itertuples():
+        assert row.share == pytest.approx(expected[(row.week, row.team)])
+    # Sorted by week, then share
+    assert shares[shares["week"] == 1]["team"].tolist() == ["A", "B", "C"]
+
+    long = melt_paths(df)
+    assert len(long) == 11  # the path without a week-3 pick has two rows
+    assert long.loc[long["path"] == 2, "team"].tolist() == ["B", "A"]
+
+
+def test_pick_shares_do_not_underflow():
+    # Long-path log-probs far below exp's range
+    df = paths_frame([dict(p, p=p["p"] - 1000) for p in PATHS], 1, 3)
+    assert np.exp(df["log_prob"]).sum() == 0
+    shifted = pick_shares(df)
+    base = pick_shares(paths_frame(PATHS, 1, 3))
+    assert np.allclose(shifted["share"], base["share"])
+    assert np.allclose(shifted["log_prob"], base["log_prob"] - 1000)
+
+
+def test_merged_paths_are_weighted_by_mass():
+    df = paths_frame(PATHS[:2], 1, 3)
+    df["log_mass"] = [np.log(3.0), np.log(1.0)]
+    shares = pick_shares(df).set_index(["week", "team"])["share"]
+    assert shares[(2, "B")] == pytest.approx(0.75)
+    assert shares[(1, "A")] == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("format", ["csv", "parquet"])
+def test_many_files_are_reported_per_source(tmp_path, format):
+    files = []
+    for year, paths in [(2023, PATHS), (2024, PATHS[::-1])]:
+        path = str(tmp_path / f"beam_{year}.{format}")
+        write_paths(paths_frame(paths, 1, 3), path)
+        files.append(path)
+
+    df = load_paths(files)
+    shares = pick_shares(df)
+    assert shares["source"].unique().tolist() == ["beam_2023", "beam_2024"]
+    totals = shares.groupby(["source", "week"])["share"].sum()
+    assert np.allclose(totals.loc[(slice(None), [1, 2])], 1.0)
+    single = pick_shares(df[df["source"] == "beam_2024"])
+    pd.testing.assert_frame_equal(
+        shares[shares["source"] == "beam_2024"].reset_index(drop=True),
+        single,
+        check_dtype=False,
+    )
+    best = most_probable_paths(df)
+    assert best["source"].tolist() == ["beam_2023", "beam_2024"]
+    assert (best["log_prob"] == -0.5).all()
+
+
+def test_sources_with_the_same_file_name_stay_apart(tmp_path):
+    files = []
+    for year, paths in [(2023, PATHS), (2024, PATHS[::-1])]:
+        os.makedirs(tmp_path / str(year))
+        path = str(tmp_path / str(year) / "beam.csv")
+        write_paths(paths_frame(paths, 1, 3), path)
+        files.append(path)
+
+    assert source_names(files + [files[0]]) == ["2023/beam#1", "2024/beam", "2023/beam#2"]
+    df = load_paths(files)
+    assert df.groupby("source").size().to_dict() == {"2023/beam": 4, "2024/beam": 4}
+
+
+def test_report_lists_unpicked_weeks_at_zero(tmp_path, capsys):
+    path = str(tmp_path / "beam.csv")
+    write_paths(paths_frame(PATHS, 1, 3), path)
+    report_card(path)
+    out = capsys.readouterr().out
+    # A is never picked in week 3, which is still one of its three weeks
+    team_a = out.split("\nA:\n", 1)[1].splitlines()[:3]
+    assert [line.split(":")[0].strip() for line in team_a] == ["week_1", "week_2", "week_3"]
+    assert team_a[2] == "  week_3: 0.00%"
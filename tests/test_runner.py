@@ -0,0 +1,97 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
+
+import json
+
+import cloudpickle as pickle
+import pandas as pd
+import pytest
+from conftest import RecordModel
+from simulation.runner import Manifest, job_grid, run_backtest, run_job
+
+
+def write_output(job, options):
+    if job["year"] == options.get("fail_year"):
+        raise RuntimeError("bad season")
+    with open(job["output"], "w") as f:
+        f.write(str(job["year"]))
+
+
+def grid(tmp_path, years=(2022, 2023, 2024)):
+    return job_grid(
+        years, weeks=[1, 2], ks=[10], output=str(tmp_path / "beam_{year}_wk-{week}_k{k}.csv")
+    )
+
+
+def test_job_grid_covers_every_combination():
+    jobs = job_grid([2023, 2024], weeks=[1, 2], ks=[10, 100], models=["lr", "xgb"],
+                    output="{model}/beam_{year}_wk-{week}_k{k}.csv")
+    assert len(jobs) == 16
+    assert jobs[0] == {
+        "kind": "beam", "year": 2023, "week": 1, "k": 10, "model": "lr",
+        "output": "lr/beam_2023_wk-1_k10.csv",
+    }
+    assert job_grid([2024], weeks=[1, 2], kind="greedy")[0]["output"] == (
+        "./results/greedy_path_2024_k10000.json"
+    )
+    # Two models writing the same file
+    with pytest.raises(ValueError):
+        job_grid([2024], models=["lr", "xgb"])
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_failed_jobs_do_not_stop_the_others(tmp_path, workers):
+    manifest = Manifest(str(tmp_path / "manifest.json"))
+    counts = run_backtest(
+        grid(tmp_path), manifest, workers=workers, options={"fail_year": 2023},
+        execute=write_output, log=lambda msg: None,
+    )
+    assert counts == {"done": 4, "failed": 2}
+
+    saved = json.load(open(manifest.path))
+    failed = saved[str(tmp_path / "beam_2023_wk-2_k10.csv")]
+    assert failed["status"] == "failed" and "bad season" in failed["error"]
+    done = saved[str(tmp_path / "beam_2024_wk-1_k10.csv")]
+    assert done["status"] == "done" and done["seconds"] >= 0 and done["started"]
+    assert not os.path.exists(tmp_path / "beam_2023_wk-1_k10.csv")
+
+
+def test_rerun_only_runs_missing_jobs(tmp_path):
+    path = str(tmp_path / "manifest.json")
+    run_backtest(grid(tmp_path), Manifest(path), workers=1, options={"fail_year": 2023},
+                 execute=write_output, log=lambda msg: None)
+
+    ran = []
+
+    def record(job, options):
+        ran.append(job["output"])
+        write_output(job, options)
+
+    # A larger sweep: the failed jobs and the new year run, the rest is skipped
+    counts = run_backtest(grid(tmp_path, (2022, 2023, 2024, 2025)), Manifest(path),
+                          workers=1, execute=record, log=lambda msg: None)
+    assert counts == {"done": 8}
+    assert sorted(os.path.basename(p) for p in ran) == [
+        "beam_2023_wk-1_k10.csv", "beam_2023_wk-2_k10.csv",
+        "beam_2025_wk-1_k10.csv", "beam_2025_wk-2_k10.csv",
+    ]
+
+
+def test_run_job_writes_beam_paths(tmp_path, db_path):
+    model_dir = tmp_path / "models"
+    model_dir.mkdir()
+    for name, model in [("full", RecordModel()), ("no_spread", RecordModel(False))]:
+        with open(model_dir / f"rm_{name}.pkl", "wb") as f:
+            pickle.dump(model, f)
+    options = {"db": db_path, "model_dir": str(model_dir), "end_week": 2, "no_compile": True}
+
+    for week in [1, 2]:
+        job = job_grid([2024], weeks=[week], ks=[3], models=["rm"],
+                       output=str(tmp_path / "beam_{year}_wk-{week}_k{k}.csv"))[0]
+        run_job(job, options)
+        df = pd.read_csv(job["output"])
+        assert list(df.columns) == [f"week_{wk}" for wk in range(week, 3)] + ["log_prob"]
+        assert len(df) == 3 and df.notna().all().all()
+        assert (df["log_prob"].diff().dropna() <= 0).all()
@@ -178,3 +178,27 @@ def test_season_simulate_many():
     assert most_frequent_count > 0
     # Optionally print the top 5 most frequent paths for debugging
     print(freq.head())
+
+
+def test_beam_expand_week_matches_per_pick_simulation():
+    from conftest import make_season
+    from simulation.records import RecordState
+
+    season, spread, rank = make_season()
+    rank_dict = rank.set_index("Team")["Rank"].to_dict()
+    records = RecordState(season.registry)
+    records.add_result("A", "B")
+    teams = sorted(season.index.week_teams(2))
+
+    calls_before = season.models["no_spread"].calls
+    children = season.expand_week(2, records, teams, None, rank_dict)
+    # The week is scored once for all candidate picks
+    assert season.models["no_spread"].calls == calls_before + 1
+
+    for team, p, child in children:
+        season.team_to_pick = team
+        r = season.simulate(week=2, rank=rank_dict, prior_weeks=records, end_week=2)
+        game = [g for g in r["results"][2] if team in (g["home_team"], g["away_team"])][0]
+        expected_p = game["prob"] if game["home_team"] == team else 1 - game["prob"]
+        assert p == pytest.approx(expected_p)
+        assert child == season.team_records
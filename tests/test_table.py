@@ -0,0 +1,72 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + "/../"))
+
+import numpy as np
+import pandas as pd
+import pytest
+from simulation.cache import PersistentGameCache
+from conftest import make_season
+from simulation.table import ProbabilityTable
+
+
+def test_table_matches_model_for_reachable_records():
+    season, spread, rank = make_season()
+    rank_dict = rank.set_index("Team")["Rank"].to_dict()
+    prior = {"A": {"wins": 1, "losses": 0, "games_played": 1}}
+    table = ProbabilityTable.build(season, 1, 5, None, rank_dict, prior)
+    # One call per model, no matter how many states are scored
+    assert season.models["no_spread"].calls == 1
+
+    # A at week 3 has played two games since week 1; F has played two as well
+    assert table.games[3][0] == ("F", "A")
+    p = table.lookup(3, 0, home_wins=1, home_losses=1, away_wins=3, away_losses=0)
+    X = pd.DataFrame(
+        [[4, 3, 2, 3, 1, 3, 1, 0]], columns=season.models["no_spread"].feature_names_in_
+    )
+    expected = season.models["no_spread"].predict_proba(X)[0, 1]
+    assert p == pytest.approx(expected)
+
+    with pytest.raises(ValueError):
+        table.lookup(3, 0, home_wins=1, home_losses=0, away_wins=3, away_losses=0)
+
+
+def test_beam_table_engine_matches_simulate_engine():
+    season, spread, rank = make_season()
+    expected = season.resolve(week=1, end_week=5, spread=spread, rank=rank, k=10, n=1)
+
+    season, spread, rank = make_season()
+    actual = season.resolve(
+        week=1, end_week=5, spread=spread, rank=rank, k=10, n=1, engine="table"
+    )
+    # The search itself makes no model calls beyond building the table
+    assert season.models["full"].calls == 1
+    assert season.models["no_spread"].calls == 1
+
+    assert [p["picks"] for p in actual] == [p["picks"] for p in expected]
+    np.testing.assert_allclose([p["p"] for p in actual], [p["p"] for p in expected])
+    assert actual[0]["prior_weeks"] == expected[0]["prior_weeks"]
+
+
+def test_table_engine_reads_and_fills_persistent_cache(tmp_path):
+    path = str(tmp_path / "games.sqlite")
+    season, spread, rank = make_season()
+    with PersistentGameCache(path, season.models) as cache:
+        season.external_game_cache = cache
+        expected = season.resolve(
+            week=1, end_week=5, spread=spread, rank=rank, k=10, n=1, engine="table"
+        )
+        assert cache.misses > 0 and len(cache) == cache.misses
+
+    # A later run scores the whole table from the stored rows
+    season, spread, rank = make_season()
+    with PersistentGameCache(path, season.models) as cache:
+        season.external_game_cache = cache
+        actual = season.resolve(
+            week=1, end_week=5, spread=spread, rank=rank, k=10, n=1, engine="table"
+        )
+        assert cache.misses == 0 and cache.hits == len(cache)
+    assert season.models["full"].calls == season.models["no_spread"].calls == 0
+    assert [p["picks"] for p in actual] == [p["picks"] for p in expected]
+    np.testing.assert_allclose([p["p"] for p in actual], [p["p"] for p in expected])
@@ -3,7 +3,8 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../'))
 
 from simulation.week import Week
-from simulation.game import Game
+from simulation.game import Game, CacheEnabledGame
+import numpy as np
 import pytest
 
 class DummyGame:
@@ -24,3 +25,40 @@ def test_week_simulate_results_structure():
         assert 'winner' in r and 'prob' in r and 'home_team' in r and 'away_team' in r
         assert r['winner'] in [r['home_team'], r['away_team']]
         assert 0 <= r['prob'] <= 1
+
+class CountingModel:
+    def __init__(self, feature_names):
+        self.feature_names_in_ = feature_names
+        self.calls = 0
+    def predict_proba(self, X):
+        self.calls += 1
+        p = (X['Home_Wins'] + 1) / (X['Home_Wins'] + X['Away_Wins'] + 2)
+        return np.column_stack([1 - p, p])
+
+def test_week_simulate_batches_per_model():
+    full = CountingModel(['Home_Wins', 'Away_Wins', 'Spread'])
+    no_spread = CountingModel(['Home_Wins', 'Away_Wins'])
+    models = {'full': full, 'no_spread': no_spread}
+    games = [
+        Game({'Home_Wins': 3, 'Away_Wins': 1, 'Spread': -3}, 'A', 'B', models),
+        Game({'Home_Wins': 0, 'Away_Wins': 2, 'Spread': 4}, 'C', 'D', models),
+        Game({'Home_Wins': 1, 'Away_Wins': 1}, 'E', 'F', models),
+        Game({'Home_Wins': 2, 'Away_Wins': 5}, 'G', 'H', models),
+    ]
+    results = Week(games).simulate()
+    assert full.calls == 1 and no_spread.calls == 1
+    # Batched results match scoring each game on its own
+    for game, r in zip(games, results):
+        winner, prob = game.simulate()
+        assert r['winner'] == winner
+        assert r['prob'] == pytest.approx(prob)
+
+def test_week_simulate_uses_game_cache():
+    model = CountingModel(['Home_Wins', 'Away_Wins'])
+    models = {'full': model, 'no_spread': model}
+    cache = {}
+    features = {'Home_Wins': 3, 'Away_Wins': 1}
+    Week([CacheEnabledGame(features, 'A', 'B', models, cache)]).simulate()
+    results = Week([CacheEnabledGame(features, 'A', 'B', models, cache)]).simulate()
+    assert model.calls == 1
+    assert results[0]['winner'] == 'A'